@@ -1,235 +1,137 @@
-import pygame
 import time
-import random
-from collections import deque
-import heapq
 import sys
 import json
-import threading
 import subprocess
-
-# ---------- Lógica del Puzzle ----------
-# Estado meta del puzzle 8
-goal_state = [[1, 2, 3],
-              [8, 0, 4],
-              [7, 6, 5]]
-
-# Movimientos posibles: arriba, abajo, izquierda, derecha
-moves = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-
-# Convierte una matriz (lista de listas) en una tupla de tuplas. Útil para usar como clave en sets o diccionarios.
-def to_tuple(matrix):
-    return tuple(tuple(row) for row in matrix)
-
-# Busca la posición (i, j) del cero (espacio vacío) en el estado del puzzle
-def find_zero(state):
-    for i in range(3):
-        for j in range(3):
-            if state[i][j] == 0:
-                return i, j
-
-# Genera todos los estados vecinos posibles moviendo el cero en las 4 direcciones
-def get_neighbors(state):
-    x, y = find_zero(state)
-    neighbors = []
-    for dx, dy in moves:
-        nx, ny = x + dx, y + dy
-        if 0 <= nx < 3 and 0 <= ny < 3:
-            new_state = [row[:] for row in state]
-            new_state[x][y], new_state[nx][ny] = new_state[nx][ny], new_state[x][y]
-            neighbors.append(new_state)
-    return neighbors
-
-# ---------- Agente No Informado: BFS ----------
-# Algoritmo de búsqueda en anchura (BFS) para resolver el puzzle 8
-# Retorna la solución (lista de estados), nodos expandidos y tiempo de ejecución
-def bfs(start_state):
-    visited = set()
-    queue = deque([(start_state, [])])
-    visited.add(to_tuple(start_state))
-    nodos_expandidos = 0
-    start = time.time()
-    while queue:
-        current, path = queue.popleft()
-        nodos_expandidos += 1
-        if current == goal_state:
-            end = time.time()
-            return path + [current], nodos_expandidos, end - start
-        for neighbor in get_neighbors(current):
-            neighbor_tuple = to_tuple(neighbor)
-            if neighbor_tuple not in visited:
-                visited.add(neighbor_tuple)
-                queue.append((neighbor, path + [current]))
-    end = time.time()
-    return None, nodos_expandidos, end - start
-
-# ---------- Agente Informado: A* ----------
-# Calcula la suma de las distancias de Manhattan de cada ficha a su posición objetivo
-# Heurística para el algoritmo A*
-def manhattan_distance(state):
-    # Crea un diccionario con la posición objetivo de cada valor
-    goal_positions = {}
-    for i in range(3):
-        for j in range(3):
-            goal_positions[goal_state[i][j]] = (i, j)
-    distance = 0
-    for i in range(3):
-        for j in range(3):
-            value = state[i][j]
-            if value != 0:
-                goal_i, goal_j = goal_positions[value]
-                distance += abs(i - goal_i) + abs(j - goal_j)
-    return distance
-
-# Algoritmo A* para resolver el puzzle 8 usando la heurística de Manhattan
-# Retorna la solución (lista de estados), nodos expandidos y tiempo de ejecución
-def a_star(start_state):
-    visited = {}
-    heap = []
-    start_tuple = to_tuple(start_state)
-    h = manhattan_distance(start_state)
-    heapq.heappush(heap, (h, 0, start_state, []))
-    visited[start_tuple] = 0
-    nodos_expandidos = 0
-    start = time.time()
-    while heap:
-        f, g, current, path = heapq.heappop(heap)
-        nodos_expandidos += 1
-        current_tuple = to_tuple(current)
-        if current == goal_state:
-            end = time.time()
-            return path + [current], nodos_expandidos, end - start
-        for neighbor in get_neighbors(current):
-            neighbor_tuple = to_tuple(neighbor)
-            new_g = g + 1
-            if neighbor_tuple not in visited or new_g < visited[neighbor_tuple]:
-                visited[neighbor_tuple] = new_g
-                h = manhattan_distance(neighbor)
-                heapq.heappush(heap, (new_g + h, new_g, neighbor, path + [current]))
-    end = time.time()
-    return None, nodos_expandidos, end - start
-
-# Verifica si un estado del puzzle es resoluble contando las inversiones
-def is_solvable(state):
-    """
-    Verifica si un estado del puzzle 8 es resoluble.
-    Retorna True si es resoluble, False si no lo es.
-    Lanza ValueError si la matriz no es válida.
-    """
-    # Validación básica de la matriz
-    flat_list = [num for row in state for num in row]
-    if sorted(flat_list) != list(range(9)):
-        raise ValueError("La matriz debe contener todos los números del 0 al 8 sin repetir.")
-
-    # Calcula las inversiones (sin contar el 0)
-    flat_list_no_zero = [num for num in flat_list if num != 0]
-    inversions = 0
-    for i in range(len(flat_list_no_zero)):
-        for j in range(i + 1, len(flat_list_no_zero)):
-            if flat_list_no_zero[i] > flat_list_no_zero[j]:
-                inversions += 1
-    return inversions % 2 == 0
+import threading
+from solucionador import (GOAL_CODE, to_tuple, AGENTES, INFORMADOS, resolver, resolver_con_servicio,
+                          medir_pico_memoria, is_solvable)
+from heuristicas import REGISTRO, nombre_por_defecto
+from tabla_distancias import abrir_tabla
+from cache_soluciones import CacheSoluciones, RUTA_POR_DEFECTO
+from metricas import Metricas, BusquedaCancelada
+import render
+from resolubilidad import estado_resoluble_aleatorio
+
+# ---------- Visualización y partida interactiva ----------
+# Los agentes están en solucionador.py (sin pygame); este módulo sólo agrega la
+# interfaz. pygame se importa dentro de las funciones que dibujan o abren una
+# ventana, así importar Agente no inicia SDL.
+
+# Título de la ventana de cada agente
+TITULOS = {
+    'bfs': "Agente BFS",
+    'bfs2': "Agente BFS bidireccional",
+    'a*': "Agente A*",
+    'ida*': "Agente IDA*",
+    'sma*': "Agente SMA*",
+    'ara*': "Agente ARA*",
+    'hda*': "Agente HDA*",
+    'tabla': "Agente por tabla",
+    'bfsv': "Agente BFS vectorizada",
+    'bfsd': "Agente BFS en disco",
+}
 
 # mostrar estado sin resolucion
+# La ventana no cambia: se dibuja una vez y se esperan eventos sin consumir CPU
 def mostrar_estado_no_resoluble(state):
     import pygame
     pygame.init()
-    tile_size = 100
+    n = len(state)
+    tile_size = min(100, 400 // n)
     offset_y = 60
-    screen_width = tile_size * 3 + 60
-    screen_height = tile_size * 3 + offset_y + 60
+    screen_width = tile_size * n + 60
+    screen_height = tile_size * n + offset_y + 60
     screen = pygame.display.set_mode((screen_width, screen_height))
     pygame.display.set_caption("¡Estado sin solución!")
     font = pygame.font.SysFont(None, 48)
     small_font = pygame.font.SysFont(None, 28)
-    running = True
-    while running:
-        screen.fill((250, 220, 220))
-        # Dibuja la matriz
-        for i in range(3):
-            for j in range(3):
-                value = state[i][j]
-                rect = pygame.Rect(j * tile_size + 30, i * tile_size + offset_y, tile_size, tile_size)
-                pygame.draw.rect(screen, (255, 255, 255), rect, border_radius=10)
-                pygame.draw.rect(screen, (200, 100, 100), rect, 2, border_radius=10)
-                if value != 0:
-                    text = font.render(str(value), True, (180, 0, 0))
-                    text_rect = text.get_rect(center=rect.center)
-                    screen.blit(text, text_rect)
-        # Mensaje
-        msg = small_font.render("¡Este estado NO tiene solución!", True, (180, 0, 0))
-        screen.blit(msg, (30, 20))
-        msg2 = small_font.render("Cierra esta ventana para continuar...", True, (80, 0, 0))
-        screen.blit(msg2, (30, screen_height - 40))
-        pygame.display.flip()
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-
-# Genera un estado aleatorio resoluble para el puzzle 8
-def generar_estado_resoluble():
-    nums = list(range(9))
-    while True:
-        random.shuffle(nums)
-        state = [nums[i:i + 3] for i in range(0, 9, 3)]
-        if is_solvable(state):
-            return state
-        else:
-            mostrar_estado_no_resoluble(state)
+    screen.fill((250, 220, 220))
+    # Dibuja la matriz
+    for i in range(n):
+        for j in range(n):
+            value = state[i][j]
+            tile = render.casilla(font, value or None, tile_size, (180, 0, 0), borde=(200, 100, 100), radio=10)
+            screen.blit(tile, (j * tile_size + 30, i * tile_size + offset_y))
+    # Mensaje
+    screen.blit(render.texto(small_font, "¡Este estado NO tiene solución!", (180, 0, 0)), (30, 20))
+    screen.blit(render.texto(small_font, "Cierra esta ventana para continuar...", (80, 0, 0)),
+                (30, screen_height - 40))
+    pygame.display.flip()
+    while pygame.event.wait().type != pygame.QUIT:
+        pass
+
+# Genera un estado aleatorio resoluble para el puzzle de n x n (por defecto el puzzle 8)
+# Es uniforme entre los estados resolubles y no necesita reintentos (ver resolubilidad.py)
+def generar_estado_resoluble(n=3):
+    return estado_resoluble_aleatorio(n)
 
 # ---------- Visualización Pygame ----------
 # Dibuja el tablero del puzzle 8 en la pantalla usando Pygame
-def draw_board(screen, state, font, tile_size, offset_y):
+# Las casillas (con su número ya renderizado) salen de la caché de render.py
+def draw_board(screen, state, font, tile_size, offset_y, offset_x=50):
+    import pygame
     apple_green = (140, 220, 100)
-    border_rect = pygame.Rect(45, offset_y - 5, tile_size * 3 + 10, tile_size * 3 + 10)
+    n = len(state)
+    border_rect = pygame.Rect(offset_x - 5, offset_y - 5, tile_size * n + 10, tile_size * n + 10)
     pygame.draw.rect(screen, apple_green, border_rect, border_radius=15)
-    for i in range(3):
-        for j in range(3):
+    for i in range(n):
+        for j in range(n):
             value = state[i][j]
-            rect = pygame.Rect(j * tile_size + 50, i * tile_size + offset_y, tile_size, tile_size)
-            pygame.draw.rect(screen, (255, 255, 255), rect, border_radius=12)
-            pygame.draw.rect(screen, (200, 200, 200), rect, 2, border_radius=12)
-            if value != 0:
-                color = (200, 0, 0) if value % 2 == 0 else (0, 150, 0)
-                text = font.render(str(value), True, color)
-                text_rect = text.get_rect(center=rect.center)
-                screen.blit(text, text_rect)
+            color = (200, 0, 0) if value % 2 == 0 else (0, 150, 0)
+            tile = render.casilla(font, value or None, tile_size, color)
+            screen.blit(tile, (j * tile_size + offset_x, i * tile_size + offset_y))
 
 # Dibuja un botón con texto en la pantalla
 def draw_button(screen, rect, text, font):
-    pygame.draw.rect(screen, (180, 180, 180), rect, border_radius=8)
-    pygame.draw.rect(screen, (100, 100, 100), rect, 2, border_radius=8)
-    label = font.render(text, True, (0, 0, 0))
-    label_rect = label.get_rect(center=rect.center)
-    screen.blit(label, label_rect)
+    screen.blit(render.boton(font, text, rect.size), rect)
 
-# Dibuja los botones de Pausar, Reanudar y Reiniciar
-# Retorna los rectángulos de los botones para detección de clics
-def draw_buttons(screen, font):
+# Rectángulos de los botones de Pausar, Reanudar y Reiniciar
+def botones_partida():
+    import pygame
     pause_btn = pygame.Rect(10, 20, 110, 40)
     resume_btn = pygame.Rect(150, 20, 110, 40)
     reset_btn = pygame.Rect(280, 20, 110, 40)
-    draw_button(screen, pause_btn, "Pausar", font)
+    return pause_btn, resume_btn, reset_btn
+
+# Dibuja los botones de Pausar, Reanudar y Reiniciar (mientras se busca, el primero es Cancelar)
+# Retorna los rectángulos de los botones para detección de clics
+def draw_buttons(screen, font, buscando=False):
+    pause_btn, resume_btn, reset_btn = botones_partida()
+    draw_button(screen, pause_btn, "Cancelar" if buscando else "Pausar", font)
     draw_button(screen, resume_btn, "Reanudar", font)
     draw_button(screen, reset_btn, "Reiniciar", font)
     return pause_btn, resume_btn, reset_btn
 
 # Dibuja la información de tiempo transcurrido y movimientos realizados
 def draw_info(screen, font, tiempo, movimientos, width, height):
-    tiempo_text = font.render(f"Tiempo: {int(tiempo)}s", True, (0, 0, 0))
-    movs_text = font.render(f"Movimientos: {movimientos}", True, (0, 0, 0))
+    tiempo_text = render.texto(font, f"Tiempo: {int(tiempo)}s", (0, 0, 0))
+    movs_text = render.texto(font, f"Movimientos: {movimientos}", (0, 0, 0))
     screen.blit(tiempo_text, (width - 180, height - 40))
     screen.blit(movs_text, (width - 350, height - 40))
 
 # Dibuja las estadísticas del agente: nodos expandidos y tiempo de ejecución
-def draw_stats(screen, font, nodos_expandidos, tiempo, height):
+# Con `metricas` (ver metricas.py) también los nodos generados, los duplicados,
+# la frontera y la tabla de visitados más grandes y, si los hubo, los pops
+# obsoletos y las reaperturas de A*. Las líneas crecen hacia arriba.
+def draw_stats(screen, font, nodos_expandidos, tiempo, height, metricas=None):
     stats_text = [
         f"Nodos expandidos: {nodos_expandidos}",
         f"Tiempo de ejecución: {tiempo:.4f} s"
     ]
+    if metricas is not None:
+        stats_text += [
+            f"Generados: {metricas.generados}",
+            f"Duplicados: {metricas.duplicados}",
+            f"Frontera máxima: {metricas.frontera_maxima}",
+            f"Visitados: {metricas.cerrados_maximo}",
+        ]
+        if metricas.consultas:
+            stats_text.append(f"Consultas a la tabla: {metricas.consultas}")
+        if metricas.obsoletos or metricas.reaperturas:
+            stats_text.append(f"Obsoletos: {metricas.obsoletos}  Reaperturas: {metricas.reaperturas}")
+    inicio = height - 60 - len(stats_text) * 25
     for idx, txt in enumerate(stats_text):
-        text = font.render(txt, True, (0, 0, 0))
-        screen.blit(text, (50, height - 110 + idx * 25))
+        screen.blit(render.texto(font, txt, (0, 0, 0)), (50, inicio + idx * 25))
 
 # Guarda el estado inicial en un archivo JSON
 def guardar_estado_inicial(estado):
@@ -246,32 +148,121 @@ def ejecutar_agente(nombre, usar_archivo=False):
         cmd.append("--archivo")
     subprocess.Popen(cmd)
 
+# ---------- Búsqueda en segundo plano ----------
+# Cada cuántas expansiones la búsqueda en segundo plano revisa si se canceló
+CADA_MUESTREO = 500
+
+# Resuelve en un hilo aparte para que la ventana siga dibujándose y atendiendo
+# eventos. El progreso (nodos expandidos y tamaño de la frontera) se lee de las
+# métricas, que el hilo actualiza en cada expansión. Para cancelar, la función
+# de muestreo de las métricas lanza BusquedaCancelada; con el servicio local se
+# abandona la espera y se cancela el pedido en el servicio.
+class BusquedaEnSegundoPlano:
+    def __init__(self, algoritmo, start_state, heuristica=None, cache=None, usar_servicio=False):
+        self.usar_servicio = usar_servicio
+        self.cancelado = threading.Event()
+        self.metricas = Metricas(muestreo=self._muestrear, cada=CADA_MUESTREO)
+        self.resultado = None
+        self.error = None
+        self.cancelada = False
+        self.inicio = time.time()
+        self.hilo = threading.Thread(target=self._ejecutar, args=(algoritmo, start_state, heuristica, cache),
+                                     daemon=True)
+        self.hilo.start()
+
+    def _muestrear(self, metricas):
+        if self.cancelado.is_set():
+            raise BusquedaCancelada
+
+    def _ejecutar(self, algoritmo, start_state, heuristica, cache):
+        try:
+            if self.usar_servicio:
+                self.resultado = resolver_con_servicio(algoritmo, start_state, heuristica, cache, self.metricas,
+                                                       self.cancelado)
+            else:
+                self.resultado = resolver(algoritmo, start_state, heuristica, cache, self.metricas)
+        except BusquedaCancelada:
+            self.cancelada = True
+        except (ValueError, OSError) as e:
+            self.error = str(e)
+        except Exception as e:
+            # Cualquier otra falla se muestra en la ventana en lugar de terminar el hilo sin resultado
+            self.error = f"{type(e).__name__}: {e}"
+
+    @property
+    def terminada(self):
+        return not self.hilo.is_alive()
+
+    # Pide detener la búsqueda sin esperarla: el hilo termina en su próximo muestreo
+    # (los agentes por capas, en disco o en varios procesos llaman a metricas.revisar)
+    def cancelar(self):
+        self.cancelado.set()
+
+# Dibuja el progreso de la búsqueda en curso
+def draw_progreso(screen, font, busqueda, height):
+    if busqueda.cancelado.is_set():
+        lineas = ["Cancelando..."]
+    else:
+        lineas = [f"Buscando... {time.time() - busqueda.inicio:.1f} s"]
+        if busqueda.usar_servicio and busqueda.metricas.expandidos == 0:
+            lineas.append("Resolviendo en el servicio local")
+        else:
+            lineas.append(f"Nodos expandidos: {busqueda.metricas.expandidos}")
+            lineas.append(f"Frontera: {busqueda.metricas.frontera}")
+    inicio = height - 60 - len(lineas) * 25
+    for idx, txt in enumerate(lineas):
+        # Los contadores cambian en cada cuadro: no vale la pena guardarlos en la caché
+        screen.blit(font.render(txt, True, (0, 0, 0)), (50, inicio + idx * 25))
+
+# Dibuja un mensaje (búsqueda cancelada, sin solución o error) donde van las estadísticas
+def draw_mensaje(screen, font, mensaje, height):
+    screen.blit(render.texto(font, mensaje, (180, 0, 0)), (50, height - 110))
+
 # ---------- Ejecución del juego ----------
 # Lógica principal de la interfaz interactiva del juego
-# Permite pausar, reanudar y reiniciar la partida, y muestra estadísticas al finalizar
-def ejecutar_interactivo(algoritmo='bfs', start_state=None):
+# Permite pausar, reanudar y reiniciar la partida, y muestra estadísticas al finalizar.
+# La búsqueda corre en segundo plano: mientras tanto se muestra el progreso y el
+# primer botón la cancela; "Reiniciar" cancela la búsqueda en curso y empieza otra.
+# Cada cuadro redibuja sólo las zonas que cambiaron (ver render.Regiones) y el
+# bucle se limita a render.FPS, o a render.FPS_REPOSO cuando nada se anima.
+# Con usar_servicio las soluciones se piden al servicio local (si está corriendo) y
+# con cerrar=False no se cierra pygame al salir (el menú sigue usando su ventana).
+def ejecutar_interactivo(algoritmo='bfs', start_state=None, heuristica=None, cache=None,
+                         usar_servicio=False, cerrar=True):
+    import pygame
     pygame.init()
-    tile_size = 100
+    n = len(start_state)
+    # Las casillas se achican en tableros grandes para que la ventana no crezca sin límite
+    tile_size = min(100, 400 // n)
     offset_y = 80
-    screen_width = tile_size * 3 + 100
-    # Aumenta el alto para dejar espacio a las estadísticas
-    screen_height = tile_size * 3 + offset_y + 160  # antes era +60
+    screen_width = tile_size * n + 100
+    # Aumenta el alto para dejar espacio a las estadísticas y métricas de la búsqueda
+    screen_height = tile_size * n + offset_y + 260  # antes era +60
     screen = pygame.display.set_mode((screen_width, screen_height))
-    titulo = "Puzzle 8 - Agente BFS"
-    if(algoritmo!='bfs'):
-        titulo = "Puzzle 8 - Agente A*"
+    titulo = f"Puzzle {n * n - 1} - {TITULOS[algoritmo]}"
+    if heuristica is not None and algoritmo in INFORMADOS:
+        titulo += f" ({REGISTRO[heuristica].descripcion})"
     pygame.display.set_caption(titulo)
     font = pygame.font.SysFont(None, 28)
     big_font = pygame.font.SysFont(None, 60)
+    clock = pygame.time.Clock()
+    # Zonas de la ventana: botones, tablero y panel de información/estadísticas
+    zona_botones = pygame.Rect(0, 0, screen_width, offset_y - 10)
+    zona_tablero = pygame.Rect(40, offset_y - 10, tile_size * n + 20, tile_size * n + 20)
+    zona_panel = pygame.Rect(0, zona_tablero.bottom, screen_width, screen_height - zona_tablero.bottom)
+    regiones = render.Regiones(screen, (240, 240, 240))
+    regiones.invalidar()
+    pause_btn, resume_btn, reset_btn = botones_partida()
 
     running = True
     paused = False
     step_index = 0
-    if algoritmo == 'bfs':
-        solution, nodos_expandidos, tiempo_ejecucion = bfs(start_state)
-    else:
-        solution, nodos_expandidos, tiempo_ejecucion = a_star(start_state)
-    # --- FIN VERIFICACIÓN ---
+    busqueda = BusquedaEnSegundoPlano(algoritmo, start_state, heuristica, cache, usar_servicio)
+    solution = None
+    nodos_expandidos = 0
+    tiempo_ejecucion = 0
+    metricas = None
+    mensaje = None
 
     start_time = time.time()
     pause_time = 0
@@ -281,42 +272,73 @@ def ejecutar_interactivo(algoritmo='bfs', start_state=None):
     tiempo_finalizado = None
 
     while running:
-        current_time = time.time()
-        screen.fill((240, 240, 240))
-
-        draw_board(screen, solution[step_index], big_font, tile_size, offset_y)
-        pause_btn, resume_btn, reset_btn = draw_buttons(screen, font)
+        # Recoge el resultado de la búsqueda en segundo plano apenas termina
+        if busqueda is not None and busqueda.terminada:
+            if busqueda.cancelada:
+                mensaje = "Búsqueda cancelada"
+            elif busqueda.error is not None:
+                mensaje = busqueda.error
+            elif busqueda.resultado is None or busqueda.resultado[0] is None:
+                mensaje = "No se encontró solución"
+            else:
+                solution, nodos_expandidos, tiempo_ejecucion = busqueda.resultado
+                metricas = busqueda.metricas
+                # El reloj de la partida empieza cuando hay solución que mostrar
+                start_time = time.time()
+            busqueda = None
 
-        if completado and tiempo_finalizado is not None:
-            tiempo_mostrar = tiempo_finalizado
-        elif paused and pause_start:
-            tiempo_mostrar = pause_start - start_time - pause_time
+        current_time = time.time()
+        buscando = busqueda is not None
+        estado_mostrado = start_state if solution is None else solution[step_index]
+
+        regiones.dibujar('botones', zona_botones, buscando, lambda: draw_buttons(screen, font, buscando))
+        regiones.dibujar('tablero', zona_tablero, to_tuple(estado_mostrado),
+                         lambda: draw_board(screen, estado_mostrado, big_font, tile_size, offset_y))
+
+        if busqueda is not None:
+            firma = ('progreso', busqueda.cancelado.is_set(), int((current_time - busqueda.inicio) * 10),
+                     busqueda.metricas.expandidos, busqueda.metricas.frontera)
+            regiones.dibujar('panel', zona_panel, firma, lambda: draw_progreso(screen, font, busqueda, screen_height))
+        elif solution is None:
+            regiones.dibujar('panel', zona_panel, ('mensaje', mensaje),
+                             lambda: draw_mensaje(screen, font, mensaje, screen_height))
         else:
-            tiempo_mostrar = current_time - start_time - pause_time
-
-        draw_info(screen, font, tiempo_mostrar, movimientos, screen_width, screen_height)
-
-        # Ahora las estadísticas se dibujan más abajo
-        if completado:
-            draw_stats(screen, font, nodos_expandidos, tiempo_ejecucion, screen_height)
-
-        # Avanza los pasos de la solución automáticamente
-        if not paused and not completado and step_index < len(solution) - 1:
-            if current_time - start_time - pause_time > step_index * 0.5:
-                step_index += 1
-                movimientos += 1
-                if step_index == len(solution) - 1:
-                    tiempo_finalizado = current_time - start_time - pause_time
-                    completado = True
-
-        pygame.display.flip()
+            if completado and tiempo_finalizado is not None:
+                tiempo_mostrar = tiempo_finalizado
+            elif paused and pause_start:
+                tiempo_mostrar = pause_start - start_time - pause_time
+            else:
+                tiempo_mostrar = current_time - start_time - pause_time
+
+            def dibujar_panel():
+                draw_info(screen, font, tiempo_mostrar, movimientos, screen_width, screen_height)
+                # Ahora las estadísticas se dibujan más abajo
+                if completado:
+                    draw_stats(screen, font, nodos_expandidos, tiempo_ejecucion, screen_height, metricas)
+            firma = ('partida', int(tiempo_mostrar), movimientos, completado, nodos_expandidos, tiempo_ejecucion)
+            regiones.dibujar('panel', zona_panel, firma, dibujar_panel)
+
+            # Avanza los pasos de la solución automáticamente
+            if not paused and not completado and step_index < len(solution) - 1:
+                if current_time - start_time - pause_time > step_index * 0.5:
+                    step_index += 1
+                    movimientos += 1
+                    if step_index == len(solution) - 1:
+                        tiempo_finalizado = current_time - start_time - pause_time
+                        completado = True
+
+        regiones.actualizar()
+        animando = busqueda is not None or (solution is not None and not paused and not completado)
+        clock.tick(render.FPS if animando else render.FPS_REPOSO)
 
         # Manejo de eventos de la ventana y botones
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
             elif event.type == pygame.MOUSEBUTTONDOWN:
-                if pause_btn.collidepoint(event.pos) and not paused and not completado:
+                if pause_btn.collidepoint(event.pos) and busqueda is not None:
+                    busqueda.cancelar()
+                elif pause_btn.collidepoint(event.pos) and solution is not None and not paused and not completado:
                     paused = True
                     pause_start = time.time()
                 elif resume_btn.collidepoint(event.pos) and paused and not completado:
@@ -324,11 +346,13 @@ def ejecutar_interactivo(algoritmo='bfs', start_state=None):
                     pause_time += time.time() - pause_start
                     pause_start = None
                 elif reset_btn.collidepoint(event.pos):
-                    start_state = generar_estado_resoluble()
-                    if algoritmo == 'bfs':
-                        solution, nodos_expandidos, tiempo_ejecucion = bfs(start_state)
-                    else:
-                        solution, nodos_expandidos, tiempo_ejecucion = a_star(start_state)
+                    # La búsqueda anterior termina sola en segundo plano; su resultado se descarta
+                    if busqueda is not None:
+                        busqueda.cancelar()
+                    start_state = generar_estado_resoluble(n)
+                    busqueda = BusquedaEnSegundoPlano(algoritmo, start_state, heuristica, cache, usar_servicio)
+                    solution = None
+                    mensaje = None
                     step_index = 0
                     start_time = time.time()
                     pause_time = 0
@@ -338,20 +362,68 @@ def ejecutar_interactivo(algoritmo='bfs', start_state=None):
                     completado = False
                     tiempo_finalizado = None
 
-    pygame.quit()
+    if busqueda is not None:
+        busqueda.cancelar()
+    if cerrar:
+        pygame.quit()
 
 # ---------- Punto de entrada ----------
+# Uso: python Agente.py [bfs|bfs2|bfsv|bfsd|a*|ida*|sma*|ara*|hda*|tabla] [--archivo] [--tamano N] [--heuristica NOMBRE] [--memoria] [--cache] [--servicio]
+# Con --tamano se genera un tablero aleatorio de N x N (por defecto 3).
+# Con --heuristica se elige la heurística de A*/IDA* (manhattan, conflicto, caminata, patrones).
+# Con --memoria se resuelve sin abrir la ventana y se imprime el pico de memoria.
+# Con --cache las soluciones óptimas se guardan y consultan en soluciones.sqlite.
+# Con --servicio se resuelve con el servicio local (servicio.py) si está corriendo.
 if __name__ == '__main__':
     algoritmo = 'bfs'
     usar_archivo = False
     if len(sys.argv) > 1:
-        if sys.argv[1].lower() == 'a*':
-            algoritmo = 'a*'
+        if sys.argv[1].lower() in AGENTES:
+            algoritmo = sys.argv[1].lower()
+        elif not sys.argv[1].startswith('--'):
+            print(f"Agente desconocido: {sys.argv[1]}. Opciones: {', '.join(AGENTES)}")
+            sys.exit(1)
         if len(sys.argv) > 2 and sys.argv[2] == '--archivo':
             usar_archivo = True
 
+    n = 3
+    if '--tamano' in sys.argv:
+        n = int(sys.argv[sys.argv.index('--tamano') + 1])
+    heuristica = None
+    if '--heuristica' in sys.argv:
+        heuristica = sys.argv[sys.argv.index('--heuristica') + 1].lower()
+        if heuristica not in REGISTRO:
+            print(f"Heurística desconocida: {heuristica}. Opciones: {', '.join(REGISTRO)}")
+            sys.exit(1)
+
     if usar_archivo:
         start_state = cargar_estado_inicial()
+        # Un estado sin solución se muestra y no se busca
+        if not is_solvable(start_state):
+            mostrar_estado_no_resoluble(start_state)
+            sys.exit(1)
+    else:
+        start_state = generar_estado_resoluble(n)
+    if algoritmo == 'tabla':
+        # La tabla se abre al arrancar para que la primera consulta no pague la apertura
+        abrir_tabla(GOAL_CODE)
+    if '--memoria' in sys.argv:
+        metricas = Metricas(fases=True)
+        solution, nodos_expandidos, tiempo, pico = medir_pico_memoria(algoritmo, start_state, heuristica, metricas)
+        movimientos = len(solution) - 1 if solution else None
+        print(f"Agente: {algoritmo}")
+        if algoritmo in INFORMADOS:
+            print(f"Heurística: {heuristica or nombre_por_defecto(len(start_state))}")
+        print(f"Movimientos: {movimientos}")
+        print(f"Nodos expandidos: {nodos_expandidos}")
+        print(f"Tiempo de ejecución: {tiempo:.4f} s")
+        print(f"Pico de memoria: {pico / 1024:.1f} KiB")
+        for clave, valor in metricas.como_dict().items():
+            print(f"{clave}: {valor:.4f} s" if clave.startswith('tiempo_') else f"{clave}: {valor}")
     else:
-        start_state = generar_estado_resoluble()
-    ejecutar_interactivo(algoritmo, start_state)
+        cache = CacheSoluciones(ruta=RUTA_POR_DEFECTO) if '--cache' in sys.argv else None
+        try:
+            ejecutar_interactivo(algoritmo, start_state, heuristica, cache, '--servicio' in sys.argv)
+        finally:
+            if cache is not None:
+                cache.cerrar()
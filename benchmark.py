@@ -0,0 +1,287 @@
+# ---------- Banco de pruebas reproducible de los agentes ----------
+# Arma un corpus fijo de tableros del puzzle 8 agrupados por distancia óptima a
+# la meta en espiral (0 a 30, la mayor que existe para esa meta) eligiendo, con
+# una semilla fija, estados de cada capa de la tabla de distancias. Luego
+# ejecuta cada agente (y cada heurística de los agentes informados) sobre el
+# corpus y registra por tablero:
+#   - tiempo de pared con time.perf_counter (el mejor de varias repeticiones)
+#   - las métricas de la búsqueda (metricas.py): nodos expandidos, generados y
+#     duplicados, pops obsoletos y reaperturas de A*, frontera y visitados máximos
+#     y, con --fases, el tiempo de la heurística, los sucesores y las consultas
+#     a la tabla de visitados (en otra ejecución, porque medirlos la hace más lenta)
+#   - pico de memoria de la búsqueda con tracemalloc (en una ejecución aparte,
+#     porque tracemalloc hace más lenta la búsqueda) y el RSS máximo del proceso
+# Los resultados se guardan en JSON y/o CSV. Con --comparar se comparan con una
+# ejecución guardada y se marcan las regresiones (exit code 1 si hay alguna).
+#
+# Uso: python benchmark.py [--por-profundidad K] [--semilla S] [--max-profundidad D]
+#                          [--agentes bfs,a*,...] [--heuristicas manhattan,...]
+#                          [--repeticiones R] [--sin-memoria] [--fases] [--json ARCHIVO] [--csv ARCHIVO]
+#                          [--comparar BASE.json] [--tolerancia 0.2]
+import csv
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # Windows: no hay getrusage y no se registra el RSS
+    resource = None
+
+import solucionador
+from metricas import FASES, Metricas
+from permutaciones import NUM_ESTADOS, paridad, unrank
+from tabla_distancias import DESCONOCIDA, abrir_tabla
+
+# Agentes que sólo se miden si se piden con --agentes: HDA* lanza un pool de
+# procesos por tablero y la BFS en disco escribe sus capas en disco por tablero,
+# así que sus tiempos no son comparables con los de las búsquedas en memoria
+SOLO_A_PEDIDO = {'hda*', 'bfsd'}
+
+# Parámetros por defecto del corpus
+SEMILLA = 8
+POR_PROFUNDIDAD = 3
+
+# Tolerancia relativa de tiempo antes de considerar una regresión, y diferencia
+# mínima absoluta (en segundos) para no marcar ruido en tableros triviales
+TOLERANCIA = 0.2
+MINIMO_TIEMPO = 0.005
+
+# Repeticiones por tablero (se registra el mejor tiempo)
+REPETICIONES = 3
+
+# Columnas de cada fila de resultados (en este orden en el CSV)
+COLUMNAS = ['agente', 'heuristica', 'tablero', 'profundidad', 'longitud', 'tiempo',
+            'expandidos', 'generados', 'duplicados', 'obsoletos', 'reaperturas',
+            'olvidados', 'regenerados', 'consultas', 'frontera_maxima',
+            'cerrados_maximo', 'desbalance_maximo'] + [f"tiempo_{fase}" for fase in FASES] + ['pico_memoria', 'rss_maximo']
+
+
+# ---------- Corpus ----------
+
+# Corpus reproducible: hasta `por_profundidad` tableros de cada distancia óptima,
+# elegidos con `semilla` entre todos los estados de esa capa. Retorna una lista
+# de diccionarios {"id", "profundidad", "estado"} ordenada por profundidad.
+def generar_corpus(por_profundidad=POR_PROFUNDIDAD, semilla=SEMILLA, max_profundidad=None):
+    tabla = abrir_tabla(solucionador.GOAL_CODE)
+    distancias = tabla[:]
+    capas = {}
+    for r in range(NUM_ESTADOS):
+        d = distancias[r]
+        if d != DESCONOCIDA and (max_profundidad is None or d <= max_profundidad):
+            capas.setdefault(d, []).append(r)
+    paridad_meta = paridad(solucionador.GOAL_CODE)
+    generador = random.Random(semilla)
+    corpus = []
+    for profundidad in sorted(capas):
+        elegidos = generador.sample(capas[profundidad], min(por_profundidad, len(capas[profundidad])))
+        for i, r in enumerate(sorted(elegidos)):
+            corpus.append({
+                'id': f"d{profundidad:02d}-{i}",
+                'profundidad': profundidad,
+                'estado': solucionador.decode_state(unrank(r, paridad_meta)),
+            })
+    return corpus
+
+
+# ---------- Ejecución ----------
+
+# Configuraciones (agente, heurística) a medir: cada agente no informado una
+# vez y cada agente informado con cada heurística indicada. Por defecto, todos
+# los agentes salvo los de SOLO_A_PEDIDO.
+def configuraciones(agentes=None, heuristicas=None):
+    agentes = agentes or [agente for agente in solucionador.AGENTES if agente not in SOLO_A_PEDIDO]
+    heuristicas = heuristicas or list(solucionador.REGISTRO)
+    result = []
+    for agente in agentes:
+        if agente in solucionador.INFORMADOS:
+            result.extend((agente, heuristica) for heuristica in heuristicas)
+        else:
+            result.append((agente, None))
+    return result
+
+# RSS máximo del proceso hasta ahora, en bytes (None si el sistema no lo informa)
+def rss_maximo():
+    if resource is None:
+        return None
+    maximo = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux lo informa en KiB y macOS en bytes
+    return maximo if sys.platform == 'darwin' else maximo * 1024
+
+# Mide un agente sobre un tablero. Retorna la fila de resultados.
+def medir(agente, heuristica, tablero, repeticiones=REPETICIONES, memoria=True, fases=False):
+    estado = tablero['estado']
+    mejor = None
+    for _ in range(repeticiones):
+        metricas = Metricas()
+        inicio = time.perf_counter()
+        solution, _, _ = solucionador.resolver(agente, estado, heuristica, metricas=metricas)
+        tiempo = time.perf_counter() - inicio
+        if mejor is None or tiempo < mejor:
+            mejor = tiempo
+    fila_fases = {}
+    if fases:
+        con_fases = Metricas(fases=True)
+        solucionador.resolver(agente, estado, heuristica, metricas=con_fases)
+        fila_fases = {f"tiempo_{fase}": con_fases.tiempos[fase] for fase in FASES}
+    pico = None
+    if memoria:
+        tracemalloc.start()
+        try:
+            solucionador.resolver(agente, estado, heuristica)
+            _, pico = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    fila = {
+        'agente': agente,
+        'heuristica': heuristica or '',
+        'tablero': tablero['id'],
+        'profundidad': tablero['profundidad'],
+        'longitud': len(solution) - 1 if solution else None,
+        'tiempo': mejor,
+    }
+    fila.update(metricas.como_dict())
+    fila.update(fila_fases)
+    fila['pico_memoria'] = pico
+    fila['rss_maximo'] = rss_maximo()
+    return fila
+
+# Ejecuta todas las configuraciones sobre el corpus. `progreso` recibe cada fila al terminarla.
+def ejecutar(corpus, agentes=None, heuristicas=None, repeticiones=REPETICIONES, memoria=True, fases=False,
+             progreso=None):
+    filas = []
+    for agente, heuristica in configuraciones(agentes, heuristicas):
+        # Calentamiento: la primera búsqueda abre tablas y bases de patrones
+        if corpus:
+            solucionador.resolver(agente, corpus[-1]['estado'], heuristica)
+        for tablero in corpus:
+            fila = medir(agente, heuristica, tablero, repeticiones, memoria, fases)
+            filas.append(fila)
+            if progreso is not None:
+                progreso(fila)
+    return filas
+
+
+# ---------- Resultados ----------
+
+def guardar_json(ruta, filas, parametros):
+    datos = {
+        'parametros': parametros,
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'fecha': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'resultados': filas,
+    }
+    with open(ruta, 'w') as f:
+        json.dump(datos, f, indent=1)
+
+def guardar_csv(ruta, filas):
+    with open(ruta, 'w', newline='') as f:
+        escritor = csv.DictWriter(f, fieldnames=COLUMNAS, restval='')
+        escritor.writeheader()
+        escritor.writerows(filas)
+
+# Resumen por (agente, heurística): tiempo total, nodos expandidos, generados y
+# duplicados totales y la mayor frontera
+def resumir(filas):
+    resumen = {}
+    for fila in filas:
+        clave = (fila['agente'], fila['heuristica'])
+        tiempo, expandidos, generados, duplicados, frontera = resumen.get(clave, (0.0, 0, 0, 0, 0))
+        resumen[clave] = (tiempo + fila['tiempo'], expandidos + fila['expandidos'],
+                          generados + fila['generados'], duplicados + fila['duplicados'],
+                          max(frontera, fila['frontera_maxima']))
+    return resumen
+
+# Compara con una ejecución base. Una fila es regresión si la solución es más
+# larga, si expande más nodos (la búsqueda es determinista) o si tarda más que
+# la base en más de `tolerancia` (relativa) y de MINIMO_TIEMPO (absoluta).
+# Retorna la lista de (fila, fila base, motivos).
+def comparar(filas, base, tolerancia=TOLERANCIA):
+    indice = {(f['agente'], f['heuristica'], f['tablero']): f for f in base}
+    regresiones = []
+    for fila in filas:
+        anterior = indice.get((fila['agente'], fila['heuristica'], fila['tablero']))
+        if anterior is None:
+            continue
+        motivos = []
+        if anterior['longitud'] is not None and (fila['longitud'] is None or fila['longitud'] > anterior['longitud']):
+            motivos.append(f"longitud {anterior['longitud']} -> {fila['longitud']}")
+        if fila['expandidos'] > anterior['expandidos']:
+            motivos.append(f"expandidos {anterior['expandidos']} -> {fila['expandidos']}")
+        if (fila['tiempo'] > anterior['tiempo'] * (1 + tolerancia)
+                and fila['tiempo'] - anterior['tiempo'] > MINIMO_TIEMPO):
+            motivos.append(f"tiempo {anterior['tiempo']:.4f} s -> {fila['tiempo']:.4f} s")
+        if motivos:
+            regresiones.append((fila, anterior, motivos))
+    return regresiones
+
+if __name__ == '__main__':
+    argumentos = sys.argv[1:]
+
+    def opcion(nombre, defecto=None):
+        if nombre in argumentos:
+            return argumentos[argumentos.index(nombre) + 1]
+        return defecto
+
+    def lista(nombre):
+        valor = opcion(nombre)
+        return [x.strip().lower() for x in valor.split(',')] if valor else None
+
+    por_profundidad = int(opcion('--por-profundidad', POR_PROFUNDIDAD))
+    semilla = int(opcion('--semilla', SEMILLA))
+    max_profundidad = opcion('--max-profundidad')
+    max_profundidad = int(max_profundidad) if max_profundidad is not None else None
+    agentes = lista('--agentes')
+    heuristicas = lista('--heuristicas')
+    repeticiones = int(opcion('--repeticiones', REPETICIONES))
+    memoria = '--sin-memoria' not in argumentos
+    fases = '--fases' in argumentos
+    ruta_json = opcion('--json')
+    ruta_csv = opcion('--csv')
+    ruta_base = opcion('--comparar')
+    tolerancia = float(opcion('--tolerancia', TOLERANCIA))
+    for agente in agentes or []:
+        if agente not in solucionador.AGENTES:
+            print(f"Agente desconocido: {agente}. Opciones: {', '.join(solucionador.AGENTES)}")
+            sys.exit(1)
+    for heuristica in heuristicas or []:
+        if heuristica not in solucionador.REGISTRO:
+            print(f"Heurística desconocida: {heuristica}. Opciones: {', '.join(solucionador.REGISTRO)}")
+            sys.exit(1)
+
+    corpus = generar_corpus(por_profundidad, semilla, max_profundidad)
+    print(f"Corpus: {len(corpus)} tableros (semilla {semilla}, hasta {por_profundidad} por profundidad)")
+
+    def progreso(fila):
+        print(f"{fila['agente']:5s} {fila['heuristica']:10s} {fila['tablero']:7s} "
+              f"{fila['tiempo']:9.4f} s {fila['expandidos']:8d} expandidos", file=sys.stderr)
+
+    filas = ejecutar(corpus, agentes, heuristicas, repeticiones, memoria, fases, progreso)
+    parametros = {'semilla': semilla, 'por_profundidad': por_profundidad, 'max_profundidad': max_profundidad,
+                  'repeticiones': repeticiones, 'memoria': memoria, 'fases': fases}
+    if ruta_json:
+        guardar_json(ruta_json, filas, parametros)
+    if ruta_csv:
+        guardar_csv(ruta_csv, filas)
+
+    print(f"{'Agente':6s} {'Heurística':10s} {'Tiempo total':>13s} {'Expandidos':>11s} "
+          f"{'Generados':>11s} {'Duplicados':>11s} {'Frontera':>9s}")
+    for (agente, heuristica), (tiempo, expandidos, generados, duplicados, frontera) in resumir(filas).items():
+        print(f"{agente:6s} {heuristica:10s} {tiempo:11.4f} s {expandidos:11d} "
+              f"{generados:11d} {duplicados:11d} {frontera:9d}")
+
+    if ruta_base:
+        with open(ruta_base) as f:
+            base = json.load(f)
+        if base.get('parametros', {}).get('semilla') != semilla:
+            print("Aviso: la base se generó con otra semilla; sólo se comparan los tableros con el mismo id.")
+        regresiones = comparar(filas, base['resultados'], tolerancia)
+        for fila, _, motivos in regresiones:
+            print(f"REGRESIÓN {fila['agente']} {fila['heuristica']} {fila['tablero']}: {', '.join(motivos)}")
+        print(f"{len(regresiones)} regresiones respecto de {ruta_base}")
+        if regresiones:
+            sys.exit(1)
@@ -0,0 +1,396 @@
+# ---------- BFS en memoria externa (capas en disco) ----------
+# bfs guarda la cola y los visitados en RAM: alcanza para los 181.440 estados
+# del puzzle 8, pero no para el espacio del puzzle 15. Aquí cada capa de la BFS
+# es un archivo en disco con sus estados ordenados, en bloques comprimidos con
+# zlib (cada estado con el mismo ancho en bytes, big-endian, así el orden de los
+# bytes es el orden numérico). Para generar la capa d + 1:
+#   - se lee la capa d de forma secuencial y sus vecinos se juntan en memoria;
+#     al llegar a `memoria` estados se ordenan y se vuelcan a una corrida en disco
+#   - las corridas se mezclan (heapq.merge) descartando los repetidos
+#   - a la vez se restan las capas d y d - 1, también leídas en orden: en un
+#     grafo no dirigido los vecinos de la capa d sólo están en d - 1, d o d + 1,
+#     así que no hace falta recordar las capas anteriores
+# La RAM queda acotada por `memoria` estados más un bloque por archivo abierto.
+#
+# El directorio de trabajo tiene un manifiesto (progreso.json) con la cantidad
+# de estados de cada capa terminada. Cada capa se escribe en un archivo temporal
+# que se renombra al terminar, y recién entonces se actualiza el manifiesto: si
+# el proceso se interrumpe, la próxima ejecución borra lo que quedó a medias y
+# sigue desde la última capa completa.
+#
+# Cada capa tiene además un índice (.idx) con el primer estado y la posición de
+# cada bloque: consultar si un estado está en una capa lee un solo bloque. Así
+# las capas del barrido desde la meta son una tabla de distancias en disco para
+# cualquier tamaño de tablero (TablaExterna); en el puzzle 8 también se puede
+# volcar al formato de tabla_distancias.py.
+#
+# Uso (conteos por profundidad): python bfs_externa.py [--tamano N] [--directorio DIR] [--memoria ESTADOS] [--tabla]
+import bisect
+import heapq
+import json
+import os
+import struct
+import time
+import zlib
+
+from codificacion import tablero, meta_espiral
+
+# Estados por bloque comprimido (la unidad de lectura y escritura)
+BLOQUE = 1 << 16
+
+# Estados que se juntan en memoria antes de volcar una corrida ordenada
+MEMORIA = 1 << 20
+
+# Nivel de compresión de zlib (1 = más rápido, 9 = más chico)
+COMPRESION = 6
+
+# Estados entre llamadas a `revisar` (con métricas, para poder cancelar el barrido)
+REVISION = 4096
+
+# Bytes de lectura y escritura de cada archivo abierto
+BUFFER = 1 << 20
+
+# Nombre del manifiesto dentro del directorio de trabajo
+MANIFIESTO = 'progreso.json'
+
+# Directorio por defecto de los barridos (junto a este archivo)
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+
+# Cabecera de cada bloque: longitud de los datos comprimidos
+_CABECERA = struct.Struct('>I')
+
+# Posición de un bloque dentro de la capa, en el índice
+_POSICION = struct.Struct('>Q')
+
+
+# Bytes por estado: fichas más el índice del vacío (ver codificacion.Tablero)
+def ancho_estado(tab):
+    return (tab.bits * (tab.celdas + 1) + 7) // 8
+
+# Directorio de trabajo por defecto de un barrido desde `raiz`
+def directorio_por_defecto(n, raiz):
+    return os.path.join(DIRECTORIO, f"capas_{n}x{n}_{raiz:x}")
+
+# Ruta del archivo de la capa `profundidad`
+def ruta_capa(directorio, profundidad):
+    return os.path.join(directorio, f"capa_{profundidad:03d}.bin")
+
+# ---------- Archivos de estados ordenados ----------
+
+class Escritor:
+    # Escribe estados (ya ordenados y sin repetir) en `ruta`. Con indice=True
+    # también guarda el índice de bloques en ruta + '.idx'.
+    def __init__(self, ruta, ancho, bloque=BLOQUE, indice=True):
+        self.ruta = ruta
+        self.ancho = ancho
+        self.bloque = bloque
+        self.archivo = open(ruta + '.tmp', 'wb', buffering=BUFFER)
+        self.indice = open(ruta + '.idx.tmp', 'wb', buffering=BUFFER) if indice else None
+        self.pendientes = []
+        self.total = 0
+
+    def agregar(self, code):
+        self.pendientes.append(code)
+        if len(self.pendientes) >= self.bloque:
+            self._volcar()
+
+    def _volcar(self):
+        if not self.pendientes:
+            return
+        ancho = self.ancho
+        datos = zlib.compress(b''.join([code.to_bytes(ancho, 'big') for code in self.pendientes]), COMPRESION)
+        if self.indice is not None:
+            self.indice.write(self.pendientes[0].to_bytes(ancho, 'big') + _POSICION.pack(self.archivo.tell()))
+        self.archivo.write(_CABECERA.pack(len(datos)))
+        self.archivo.write(datos)
+        self.total += len(self.pendientes)
+        self.pendientes = []
+
+    # Termina de escribir y renombra los temporales. Retorna la cantidad de estados.
+    def cerrar(self):
+        self._volcar()
+        self.archivo.close()
+        if self.indice is not None:
+            self.indice.close()
+            os.replace(self.ruta + '.idx.tmp', self.ruta + '.idx')
+        os.replace(self.ruta + '.tmp', self.ruta)
+        return self.total
+
+# Decodifica un bloque comprimido en la lista de sus estados
+def _decodificar(datos, ancho):
+    datos = zlib.decompress(datos)
+    return [int.from_bytes(datos[i:i + ancho], 'big') for i in range(0, len(datos), ancho)]
+
+# Lee un bloque desde la posición actual de `archivo`. Retorna None al final del archivo.
+def _leer_bloque(archivo, ancho):
+    cabecera = archivo.read(_CABECERA.size)
+    if not cabecera:
+        return None
+    return _decodificar(archivo.read(_CABECERA.unpack(cabecera)[0]), ancho)
+
+# Recorre en orden los estados de un archivo, un bloque a la vez
+def leer(ruta, ancho):
+    with open(ruta, 'rb', buffering=BUFFER) as archivo:
+        while True:
+            bloque = _leer_bloque(archivo, ancho)
+            if bloque is None:
+                return
+            yield from bloque
+
+# Primer estado y posición de cada bloque de una capa
+def leer_indice(ruta, ancho):
+    with open(ruta + '.idx', 'rb') as archivo:
+        datos = archivo.read()
+    paso = ancho + _POSICION.size
+    primeros = [int.from_bytes(datos[i:i + ancho], 'big') for i in range(0, len(datos), paso)]
+    posiciones = [_POSICION.unpack_from(datos, i + ancho)[0] for i in range(0, len(datos), paso)]
+    return primeros, posiciones
+
+# Descarta los repetidos consecutivos de una secuencia ordenada
+def _unicos(estados):
+    anterior = -1
+    for code in estados:
+        if code != anterior:
+            yield code
+            anterior = code
+
+# Estados de `estados` que no están en `excluidos` (ambos ordenados)
+def _restar(estados, excluidos):
+    excluidos = iter(excluidos)
+    siguiente = next(excluidos, None)
+    for code in estados:
+        while siguiente is not None and siguiente < code:
+            siguiente = next(excluidos, None)
+        if code != siguiente:
+            yield code
+
+# ---------- Manifiesto ----------
+
+def leer_manifiesto(directorio):
+    try:
+        with open(os.path.join(directorio, MANIFIESTO)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+# Se escribe en un temporal y se renombra: el manifiesto nunca queda a medio escribir
+def _guardar_manifiesto(directorio, manifiesto):
+    ruta = os.path.join(directorio, MANIFIESTO)
+    with open(ruta + '.tmp', 'w') as f:
+        json.dump(manifiesto, f, indent=1)
+    os.replace(ruta + '.tmp', ruta)
+
+# Borra los temporales, las corridas y las capas posteriores a la última completa
+def _limpiar(directorio, completas):
+    for nombre in os.listdir(directorio):
+        if nombre.endswith('.tmp') or nombre.startswith('corrida_'):
+            os.remove(os.path.join(directorio, nombre))
+        elif nombre.startswith('capa_') and int(nombre[5:8]) >= completas:
+            os.remove(os.path.join(directorio, nombre))
+
+# ---------- Barrido por capas ----------
+
+# Genera en disco la capa profundidad + 1 a partir de las dos anteriores.
+# `revisar` (opcional) se llama cada REVISION estados leídos o escritos.
+# Retorna (estados de la capa nueva, sucesores generados, True si contiene a `meta`).
+def _expandir_capa(tab, directorio, profundidad, ancho, memoria, bloque, meta, revisar=None):
+    vecinos = tab.vecinos
+    corridas = []
+    pendientes = []
+    generados = 0
+    for i, code in enumerate(leer(ruta_capa(directorio, profundidad), ancho)):
+        if revisar is not None and i % REVISION == 0:
+            revisar()
+        pendientes.extend(vecinos(code))
+        if len(pendientes) >= memoria:
+            generados += len(pendientes)
+            ruta = os.path.join(directorio, f"corrida_{len(corridas):04d}.bin")
+            escritor = Escritor(ruta, ancho, bloque, indice=False)
+            for vecino in _unicos(sorted(pendientes)):
+                escritor.agregar(vecino)
+            escritor.cerrar()
+            corridas.append(ruta)
+            pendientes = []
+    generados += len(pendientes)
+    # La última corrida no hace falta volcarla: se mezcla directo desde memoria
+    pendientes.sort()
+    fuentes = [leer(ruta, ancho) for ruta in corridas] + [iter(pendientes)]
+    anteriores = [leer(ruta_capa(directorio, d), ancho) for d in (profundidad - 1, profundidad) if d >= 0]
+    escritor = Escritor(ruta_capa(directorio, profundidad + 1), ancho, bloque)
+    encontrada = False
+    for i, code in enumerate(_restar(_unicos(heapq.merge(*fuentes)), heapq.merge(*anteriores))):
+        if revisar is not None and i % REVISION == 0:
+            revisar()
+        escritor.agregar(code)
+        if code == meta:
+            encontrada = True
+    total = escritor.cerrar()
+    for ruta in corridas:
+        os.remove(ruta)
+    return total, generados, encontrada
+
+# BFS por capas en disco desde `raiz` en el tablero de n x n (por defecto desde la
+# meta en espiral, es decir, el barrido de distancias a la meta). Con `meta` se
+# detiene al terminar la capa que la contiene. Si `directorio` ya tiene un barrido
+# desde la misma raíz, continúa desde la última capa completa. `al_terminar_capa`
+# se llama con (profundidad, estados) por cada capa nueva. Con `metricas` se
+# cuentan expandidos, generados y duplicados; la frontera es la capa más grande.
+# Retorna la lista de estados por profundidad.
+def barrido_externo(n, directorio=None, raiz=None, meta=None, memoria=MEMORIA, bloque=BLOQUE,
+                    metricas=None, al_terminar_capa=None):
+    if memoria < 1 or bloque < 1:
+        raise ValueError("La memoria y el bloque deben ser de al menos un estado.")
+    tab = tablero(n)
+    if raiz is None:
+        raiz = tab.encode_state(meta_espiral(n))
+    if directorio is None:
+        directorio = directorio_por_defecto(n, raiz)
+    ancho = ancho_estado(tab)
+    os.makedirs(directorio, exist_ok=True)
+    manifiesto = leer_manifiesto(directorio)
+    if manifiesto is None:
+        manifiesto = {'n': n, 'raiz': f"{raiz:x}", 'ancho': ancho, 'capas': [], 'completo': False}
+    elif manifiesto['n'] != n or int(manifiesto['raiz'], 16) != raiz:
+        raise ValueError(f"{directorio} tiene un barrido de otro tablero o desde otra raíz.")
+    capas = manifiesto['capas']
+    _limpiar(directorio, len(capas))
+    if not capas:
+        escritor = Escritor(ruta_capa(directorio, 0), ancho, bloque)
+        escritor.agregar(raiz)
+        capas.append(escritor.cerrar())
+        _guardar_manifiesto(directorio, manifiesto)
+        if al_terminar_capa is not None:
+            al_terminar_capa(0, 1)
+
+    # Al continuar un barrido, la meta puede estar en una capa ya terminada
+    if meta is not None:
+        tabla = TablaExterna(directorio)
+        if tabla.distancia(meta) is not None:
+            return capas
+    while not manifiesto['completo']:
+        profundidad = len(capas) - 1
+        total, generados, encontrada = _expandir_capa(tab, directorio, profundidad, ancho, memoria, bloque, meta,
+                                                      metricas.revisar if metricas is not None else None)
+        if metricas is not None:
+            metricas.expandidos += capas[profundidad]
+            metricas.generados += generados
+            metricas.duplicados += generados - total
+            metricas.frontera_maxima = max(metricas.frontera_maxima, capas[profundidad], total)
+            metricas.cerrados(sum(capas) + total)
+        if total == 0:
+            # La capa vacía no se guarda: el barrido terminó
+            os.remove(ruta_capa(directorio, profundidad + 1))
+            os.remove(ruta_capa(directorio, profundidad + 1) + '.idx')
+            manifiesto['completo'] = True
+        else:
+            capas.append(total)
+        _guardar_manifiesto(directorio, manifiesto)
+        if total and al_terminar_capa is not None:
+            al_terminar_capa(profundidad + 1, total)
+        if encontrada:
+            break
+    return capas
+
+# ---------- Consultas sobre las capas ----------
+
+class TablaExterna:
+    # Capas terminadas de un barrido en `directorio`. Los índices de bloques se
+    # cargan al consultar cada capa por primera vez.
+    def __init__(self, directorio):
+        self.directorio = directorio
+        manifiesto = leer_manifiesto(directorio)
+        if manifiesto is None:
+            raise FileNotFoundError(f"{directorio} no tiene un barrido ({MANIFIESTO}).")
+        self.n = manifiesto['n']
+        self.raiz = int(manifiesto['raiz'], 16)
+        self.ancho = manifiesto['ancho']
+        self.conteos = manifiesto['capas']
+        self.completo = manifiesto['completo']
+        self._indices = {}
+
+    # True si `code` está en la capa `profundidad` (lee a lo sumo un bloque)
+    def contiene(self, profundidad, code):
+        ruta = ruta_capa(self.directorio, profundidad)
+        indice = self._indices.get(profundidad)
+        if indice is None:
+            indice = self._indices[profundidad] = leer_indice(ruta, self.ancho)
+        primeros, posiciones = indice
+        i = bisect.bisect_right(primeros, code) - 1
+        if i < 0:
+            return False
+        with open(ruta, 'rb') as archivo:
+            archivo.seek(posiciones[i])
+            bloque = _leer_bloque(archivo, self.ancho)
+        j = bisect.bisect_left(bloque, code)
+        return j < len(bloque) and bloque[j] == code
+
+    # Distancia de `code` a la raíz, o None si no está en las capas terminadas
+    def distancia(self, code):
+        for profundidad in range(len(self.conteos)):
+            if self.contiene(profundidad, code):
+                return profundidad
+        return None
+
+    # Camino (estados codificados) desde la raíz hasta `code`: desde su capa se
+    # baja a un vecino de la capa anterior. Retorna None si no está en las capas.
+    def camino(self, code):
+        profundidad = self.distancia(code)
+        if profundidad is None:
+            return None
+        vecinos = tablero(self.n).vecinos
+        path = [code]
+        for d in range(profundidad - 1, -1, -1):
+            code = next(vecino for vecino in vecinos(code) if self.contiene(d, vecino))
+            path.append(code)
+        path.reverse()
+        return path
+
+    # Recorre en orden los estados de la capa `profundidad`
+    def estados(self, profundidad):
+        return leer(ruta_capa(self.directorio, profundidad), self.ancho)
+
+# Tabla de distancias del puzzle 8 en el formato de tabla_distancias.py (un byte
+# por número de estado), a partir de un barrido completo desde la meta
+def tabla_puzzle8(directorio):
+    from permutaciones import rank, NUM_ESTADOS
+    from tabla_distancias import DESCONOCIDA
+    tabla = TablaExterna(directorio)
+    if tabla.n != 3 or not tabla.completo:
+        raise ValueError("Hace falta un barrido completo del puzzle 8.")
+    distancias = bytearray([DESCONOCIDA]) * NUM_ESTADOS
+    for profundidad in range(len(tabla.conteos)):
+        for code in tabla.estados(profundidad):
+            distancias[rank(code)] = profundidad
+    return distancias
+
+# ---------- Punto de entrada ----------
+# Barrido desde la meta en espiral. Interrumpido con Ctrl+C, la próxima ejecución
+# con el mismo directorio sigue desde la última capa completa. Con --tabla (sólo
+# 3x3) además guarda la tabla de distancias que usa el agente 'tabla'.
+if __name__ == '__main__':
+    import sys
+    args = sys.argv[1:]
+    n = int(args[args.index('--tamano') + 1]) if '--tamano' in args else 3
+    directorio = args[args.index('--directorio') + 1] if '--directorio' in args else None
+    memoria = int(args[args.index('--memoria') + 1]) if '--memoria' in args else MEMORIA
+    if '--tabla' in args and n != 3:
+        print("La tabla de distancias sólo está disponible para el puzzle 8 (3x3).")
+        sys.exit(1)
+    raiz = tablero(n).encode_state(meta_espiral(n))
+    directorio = directorio or directorio_por_defecto(n, raiz)
+    inicio = time.perf_counter()
+    try:
+        conteos = barrido_externo(n, directorio, memoria=memoria,
+                                  al_terminar_capa=lambda d, total: print(
+                                      f"Profundidad {d:2d}: {total} estados ({time.perf_counter() - inicio:.1f} s)"))
+    except KeyboardInterrupt:
+        print(f"\nInterrumpido: se continúa con el mismo comando (capas en {directorio})")
+        sys.exit(1)
+    print(f"{sum(conteos)} estados en {len(conteos)} capas, {time.perf_counter() - inicio:.3f} s")
+    if '--tabla' in args:
+        from tabla_distancias import ruta_tabla
+        ruta = ruta_tabla(raiz)
+        with open(ruta + '.tmp', 'wb') as f:
+            f.write(tabla_puzzle8(directorio))
+        os.replace(ruta + '.tmp', ruta)
+        print(f"Tabla de distancias guardada en {ruta}")
@@ -0,0 +1,139 @@
+# ---------- BFS vectorizada con NumPy (puzzle 8) ----------
+# En lugar de sacar los estados de una cola de a uno, cada capa de la búsqueda
+# es un arreglo de enteros empaquetados (uint64) y todos sus sucesores se
+# generan a la vez con las mismas sumas y restas de desplazamientos que
+# codificacion.aplicar_movimiento. Los repetidos se descartan con el número de
+# estado (permutaciones.py) vectorizado sobre un arreglo de visitados.
+#
+# Los sucesores de cada capa se ordenan por (padre, dirección), que es el orden
+# en que la BFS con cola los encolaría, y de cada estado repetido se conserva la
+# primera aparición. Así cada capa queda en el mismo orden que en la cola y la
+# solución y los nodos expandidos coinciden con los de solucionador.bfs.
+#
+# Uso (tamaños de capa y tabla de distancias): python bfs_vectorizada.py
+import time
+
+import numpy as np
+
+from codificacion import N, BITS, MASCARA, DESPLAZAMIENTOS, MOVIMIENTOS, encode_state
+from permutaciones import NUM_ESTADOS, TABLA_ALTA, TABLA_BAJA, BITS_MITAD, MASCARA_MITAD, _QUITAR_VACIO
+
+# Valor de las distancias de los estados que no alcanzan la meta (igual que en tabla_distancias.py)
+DESCONOCIDA = 255
+
+_DESPLAZAMIENTOS = np.array(DESPLAZAMIENTOS, dtype=np.uint64)
+_MASCARA = np.uint64(MASCARA)
+_BITS = np.uint64(BITS)
+
+# _DESTINOS[zero, direccion]: casilla a la que se mueve el vacío, o -1 si el movimiento no es válido
+_DESTINOS = np.full((N * N, 4), -1, dtype=np.int64)
+for _zero, _opciones in enumerate(MOVIMIENTOS):
+    for _direccion, _destino in _opciones:
+        _DESTINOS[_zero, _direccion] = _destino
+
+# Tablas de permutaciones.rank como arreglos
+_ALTA = np.frombuffer(TABLA_ALTA, dtype=np.uint32).astype(np.int64)
+_BAJA = np.frombuffer(TABLA_BAJA, dtype=np.uint32).astype(np.int64)
+_ANTES = np.array([t[0] for t in _QUITAR_VACIO], dtype=np.uint64)
+_UNION = np.array([t[1] for t in _QUITAR_VACIO], dtype=np.uint64)
+_DESPUES = np.array([t[2] for t in _QUITAR_VACIO], dtype=np.uint64)
+_BASE = np.array([t[3] for t in _QUITAR_VACIO], dtype=np.int64)
+
+
+# Número de estado de cada estado de un arreglo (igual que permutaciones.rank)
+def rank_vectorizado(codes):
+    zero = (codes & _MASCARA).astype(np.intp)
+    seq = ((codes >> _ANTES[zero]) << _UNION[zero]) | ((codes & _DESPUES[zero]) >> _BITS)
+    return _BASE[zero] + _ALTA[(seq >> np.uint64(BITS_MITAD)).astype(np.intp)] + _BAJA[(seq & np.uint64(MASCARA_MITAD)).astype(np.intp)]
+
+# Todos los sucesores de una capa, en orden (padre, dirección).
+# Retorna (estados, índice del padre en la capa, dirección del movimiento).
+def expandir(capa):
+    zero = (capa & _MASCARA).astype(np.intp)
+    destinos = _DESTINOS[zero]
+    validos = destinos >= 0
+    padres, direcciones = np.nonzero(validos)
+    zero = zero[padres]
+    destino = destinos[padres, direcciones]
+    code = capa[padres]
+    shift_zero = _DESPLAZAMIENTOS[zero]
+    shift = _DESPLAZAMIENTOS[destino]
+    value = (code >> shift) & _MASCARA
+    # Misma cuenta que aplicar_movimiento; en uint64 las restas se hacen al final
+    nuevos = (code + (value << shift_zero) + destino.astype(np.uint64)) - ((value << shift) + zero.astype(np.uint64))
+    return nuevos, padres, direcciones
+
+# BFS por capas desde start_code hasta goal_code.
+# Retorna (camino de estados codificados o None, nodos expandidos, tamaño de cada capa).
+# Los nodos expandidos cuentan los estados que la BFS con cola saca antes de llegar a la meta.
+# `revisar` (opcional) se llama antes de cada capa, por ejemplo para cancelar la búsqueda.
+def bfs_vectorizada(start_code, goal_code, revisar=None):
+    visitados = np.zeros(NUM_ESTADOS, dtype=bool)
+    capa = np.array([start_code], dtype=np.uint64)
+    visitados[rank_vectorizado(capa)] = True
+    # Por cada capa: (estados, índice del padre en la capa anterior, dirección)
+    capas = [(capa, None, None)]
+    tamanos = [1]
+    nodos_expandidos = 0
+    meta = np.uint64(goal_code)
+    while len(capa):
+        if revisar is not None:
+            revisar()
+        encontrados = np.flatnonzero(capa == meta)
+        if len(encontrados):
+            indice = int(encontrados[0])
+            nodos_expandidos += indice + 1
+            return _reconstruir(capas, indice), nodos_expandidos, tamanos
+        nodos_expandidos += len(capa)
+        nuevos, padres, direcciones = expandir(capa)
+        ranks = rank_vectorizado(nuevos)
+        # Primera aparición de cada estado, descartando los ya visitados
+        _, primeros = np.unique(ranks, return_index=True)
+        primeros = primeros[~visitados[ranks[primeros]]]
+        primeros.sort()
+        visitados[ranks[primeros]] = True
+        capa = nuevos[primeros]
+        capas.append((capa, padres[primeros], direcciones[primeros]))
+        tamanos.append(len(capa))
+    tamanos.pop()
+    return None, nodos_expandidos, tamanos
+
+# Camino desde la raíz hasta el estado `indice` de la última capa
+def _reconstruir(capas, indice):
+    path = []
+    for estados, padres, _ in reversed(capas):
+        path.append(int(estados[indice]))
+        if padres is not None:
+            indice = int(padres[indice])
+    path.reverse()
+    return path
+
+# Distancia a la meta de todos los estados alcanzables, indexada por número de
+# estado (mismo contenido que tabla_distancias.calcular_distancias)
+def calcular_distancias_vectorizada(goal_code):
+    distancias = np.full(NUM_ESTADOS, DESCONOCIDA, dtype=np.uint8)
+    capa = np.array([goal_code], dtype=np.uint64)
+    distancias[rank_vectorizado(capa)] = 0
+    profundidad = 0
+    while len(capa):
+        profundidad += 1
+        nuevos, _, _ = expandir(capa)
+        ranks, primeros = np.unique(rank_vectorizado(nuevos), return_index=True)
+        sin_ver = distancias[ranks] == DESCONOCIDA
+        distancias[ranks[sin_ver]] = profundidad
+        capa = nuevos[primeros[sin_ver]]
+    return bytearray(distancias.tobytes())
+
+if __name__ == '__main__':
+    # Estado meta del puzzle 8 (debe ser igual al de solucionador.py)
+    goal_state = [[1, 2, 3],
+                  [8, 0, 4],
+                  [7, 6, 5]]
+    goal_code = encode_state(goal_state)
+    inicio = time.perf_counter()
+    distancias = np.frombuffer(calcular_distancias_vectorizada(goal_code), dtype=np.uint8)
+    tiempo = time.perf_counter() - inicio
+    conteo = np.bincount(distancias[distancias != DESCONOCIDA])
+    for profundidad, cantidad in enumerate(conteo):
+        print(f"Profundidad {profundidad:2d}: {cantidad} estados")
+    print(f"{conteo.sum()} estados en {tiempo:.3f} s")
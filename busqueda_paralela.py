@@ -0,0 +1,355 @@
+# ---------- A* paralelo distribuido por hash (HDA*) ----------
+# Todos los agentes de solucionador.py usan un solo núcleo. HDA* (Kishimoto,
+# Fukunaga y Botea, 2009) reparte los estados entre procesos trabajadores según
+# un hash de su codificación: cada trabajador es dueño de sus estados, con su
+# propia lista de abiertos (cubetas por f, ver nodos.py) y su propia tabla de
+# costos g, y expande sin sincronizarse con los demás. Los sucesores que
+# pertenecen a otro trabajador se le envían en lotes por su cola.
+#
+# Terminación y optimalidad:
+#   - el dueño de la meta, al sacarla de su lista con un g menor al de la mejor
+#     solución conocida (la "incumbente", compartida), la actualiza; desde ahí
+#     todos descartan los nodos con f >= incumbente
+#   - antes de cada ronda de expansiones el trabajador vacía su buzón
+#   - cada trabajador publica el menor f entre su lista y los lotes que envió y
+#     su dueño todavía no procesó, y sólo expande nodos cuyo f no supera el menor
+#     publicado por todos: las capas de f avanzan a la par y se expanden pocos
+#     nodos que A* no expandiría (con más procesos que núcleos, un trabajador
+#     podría si no adelantarse varias capas)
+#   - un trabajador sin nodos útiles queda ocioso. El proceso principal da la
+#     búsqueda por terminada cuando ve dos veces seguidas a todos ociosos y la
+#     misma cantidad de lotes enviados y recibidos (ningún lote en viaje)
+#   - con una heurística admisible, en ese momento ningún nodo con f menor a
+#     la incumbente queda sin expandir, así que la solución es óptima
+# Cada trabajador guarda el padre de cada estado suyo; el camino se reconstruye
+# al final preguntando a los dueños, de la meta hacia el inicio.
+#
+# Uso (compara con A* en tableros al azar): python busqueda_paralela.py [--tamano N] [--procesos P] [--pasos K]
+import os
+import sys
+import time
+import queue
+import random
+import multiprocessing
+from collections import deque
+
+from codificacion import tablero, meta_espiral
+from heuristicas import obtener_heuristica, nombre_por_defecto
+from nodos import ColaCubetas
+
+# Nodos por lote enviado a otro trabajador, y expansiones entre revisiones del buzón
+TAMANO_LOTE = 128
+EXPANSIONES_POR_RONDA = 256
+
+# Segundos entre revisiones de terminación del proceso principal y de espera de un trabajador ocioso
+INTERVALO = 0.001
+
+# Incumbente mientras no hay solución
+SIN_SOLUCION = 2 ** 62
+
+_MULTIPLICADOR = 0x9E3779B97F4A7C15
+_MASCARA_64 = (1 << 64) - 1
+
+
+# Trabajador dueño del estado: hash multiplicativo, así estados parecidos quedan repartidos
+def dueno(code, procesos):
+    return (((code * _MULTIPLICADOR) & _MASCARA_64) >> 32) % procesos
+
+
+# ---------- Trabajador ----------
+# Mensajes del buzón: ('nodos', origen, [(code, g, h, aux, padre), ...]) con h = None
+# si hay que calcularla, ('padre', code) para reconstruir el camino y ('fin',).
+# enviados[i * procesos + j] cuenta los lotes que i mandó a j y recibidos[i * procesos + j]
+# los que j ya procesó de i (la fila `procesos` es la del proceso principal). Como
+# la cola entre dos procesos es FIFO, los lotes de i a j todavía en viaje son los
+# últimos enviados - recibidos: su menor f se publica junto con el de la lista de
+# abiertos, así el menor f global nunca ignora nodos en viaje.
+def _trabajador(indice, procesos, n, nombre_heuristica, goal_code, buzones, respuestas,
+                incumbente, bloqueo, ociosos, enviados, recibidos, minimos):
+    tab = tablero(n)
+    heuristica = obtener_heuristica(nombre_heuristica, tab, goal_code)
+    # Calcular h una vez carga las tablas de la heurística (las de patrones se abren recién al usarlas)
+    # antes de avisar que el trabajador está listo; así mover() las encuentra abiertas
+    heuristica.inicial(goal_code)
+    sucesores = tab.sucesores
+    ficha = tab.ficha
+    mascara = tab.mascara
+    mover = heuristica.mover
+    abiertos = ColaCubetas('g')
+    costos = {}
+    padres = {}
+    lotes = [[] for _ in range(procesos)]
+    # Menor f de cada lote en armado, y (número, menor f) de los lotes enviados sin confirmar
+    minimos_lote = [SIN_SOLUCION] * procesos
+    en_viaje = [deque() for _ in range(procesos)]
+    buzon = buzones[indice]
+    expandidos = generados = duplicados = obsoletos = frontera_maxima = 0
+    respuestas.put(('listo', indice))
+
+    def enviar(destino):
+        posicion = indice * procesos + destino
+        enviados[posicion] += 1
+        en_viaje[destino].append((enviados[posicion], minimos_lote[destino]))
+        buzones[destino].put(('nodos', indice, lotes[destino]))
+        lotes[destino] = []
+        minimos_lote[destino] = SIN_SOLUCION
+
+    # Menor f entre la lista de abiertos y los lotes enviados que su dueño todavía no procesó
+    def menor_f_pendiente():
+        menor = abiertos.menor_f() if abiertos else SIN_SOLUCION
+        for destino in range(procesos):
+            pendientes = en_viaje[destino]
+            confirmados = recibidos[indice * procesos + destino]
+            while pendientes and pendientes[0][0] <= confirmados:
+                pendientes.popleft()
+            for _, f in pendientes:
+                if f < menor:
+                    menor = f
+        return menor
+
+    # Procesa un mensaje. Retorna False con el mensaje de fin.
+    def atender(mensaje):
+        nonlocal duplicados, frontera_maxima
+        if mensaje[0] == 'fin':
+            respuestas.put(('estadisticas', indice, {
+                'expandidos': expandidos,
+                'generados': generados,
+                'duplicados': duplicados,
+                'obsoletos': obsoletos,
+                'frontera_maxima': frontera_maxima,
+                'cerrados_maximo': len(costos),
+            }))
+            return False
+        if mensaje[0] == 'padre':
+            respuestas.put(('padre', padres[mensaje[1]]))
+            return True
+        _, origen, lote = mensaje
+        # Primero deja de estar ocioso y después cuenta el lote: así el proceso principal
+        # nunca ve a todos ociosos con este lote ya contado y sus nodos sin procesar
+        ociosos[indice] = 0
+        mejor = incumbente.value
+        for code, g, h, aux, padre in lote:
+            if h is None:
+                h, aux = heuristica.inicial(code)
+            if g + h >= mejor:
+                continue
+            anterior = costos.get(code)
+            if anterior is not None and anterior <= g:
+                duplicados += 1
+                continue
+            costos[code] = g
+            padres[code] = padre
+            abiertos.agregar(g + h, g, (g + h, g, code, h, aux))
+        if len(abiertos) > frontera_maxima:
+            frontera_maxima = len(abiertos)
+        # El menor f de los nodos recibidos se publica antes de confirmar el lote,
+        # para que su remitente pueda dejar de contarlo como en viaje
+        minimos[indice] = menor_f_pendiente()
+        recibidos[origen * procesos + indice] += 1
+        return True
+
+    while True:
+        # Se vacía el buzón entero antes de cada ronda de expansiones: los lotes de los
+        # demás no se acumulan y sus nodos cuentan para el límite de esta ronda
+        mensaje = None
+        if not abiertos:
+            for destino in range(procesos):
+                if lotes[destino]:
+                    enviar(destino)
+            ociosos[indice] = 1
+            try:
+                mensaje = buzon.get(timeout=INTERVALO)
+            except queue.Empty:
+                pass
+        while True:
+            if mensaje is None:
+                try:
+                    mensaje = buzon.get_nowait()
+                except queue.Empty:
+                    break
+            if not atender(mensaje):
+                return
+            mensaje = None
+
+        mejor = incumbente.value
+        if abiertos and abiertos.menor_f() >= mejor:
+            # Las cubetas salen en orden de f: ningún nodo restante puede mejorar la incumbente
+            abiertos = ColaCubetas('g')
+        minimos[indice] = menor_f_pendiente()
+        limite = min(minimos)
+        if abiertos and abiertos.menor_f() > limite:
+            # Hay que esperar a que los demás terminen la capa de f actual
+            try:
+                mensaje = buzon.get(timeout=INTERVALO)
+            except queue.Empty:
+                continue
+            if not atender(mensaje):
+                return
+            continue
+        for _ in range(EXPANSIONES_POR_RONDA):
+            if not abiertos or abiertos.menor_f() > limite:
+                break
+            f, g, current, h, aux = abiertos.sacar()
+            if f >= mejor:
+                abiertos = ColaCubetas('g')
+                break
+            if costos[current] < g:
+                obsoletos += 1
+                continue
+            if current == goal_code:
+                with bloqueo:
+                    if g < incumbente.value:
+                        incumbente.value = g
+                mejor = incumbente.value
+                continue
+            expandidos += 1
+            padre = padres[current]
+            zero = current & mascara
+            new_g = g + 1
+            for movimiento, neighbor in sucesores(current):
+                generados += 1
+                # Deshacer el movimiento anterior nunca mejora un costo
+                if neighbor == padre:
+                    duplicados += 1
+                    continue
+                destino = neighbor & mascara
+                new_h, new_aux = mover(h, aux, ficha(current, destino), zero, destino, neighbor)
+                new_f = new_g + new_h
+                if new_f >= mejor:
+                    continue
+                propietario = dueno(neighbor, procesos)
+                if propietario != indice:
+                    lote = lotes[propietario]
+                    lote.append((neighbor, new_g, new_h, new_aux, current))
+                    if new_f < minimos_lote[propietario]:
+                        minimos_lote[propietario] = new_f
+                    if len(lote) >= TAMANO_LOTE:
+                        enviar(propietario)
+                    continue
+                anterior = costos.get(neighbor)
+                if anterior is not None and anterior <= new_g:
+                    duplicados += 1
+                    continue
+                costos[neighbor] = new_g
+                padres[neighbor] = current
+                abiertos.agregar(new_f, new_g, (new_f, new_g, neighbor, new_h, new_aux))
+            if len(abiertos) > frontera_maxima:
+                frontera_maxima = len(abiertos)
+        # Los lotes incompletos también salen al final de cada ronda, para no demorar a los demás
+        for destino in range(procesos):
+            if lotes[destino]:
+                enviar(destino)
+
+
+# ---------- Proceso principal ----------
+# HDA* desde `start_code` hasta `goal_code` en el tablero `tab` con la heurística
+# de nombre `nombre_heuristica` (cada trabajador la abre por su cuenta; las bases
+# de datos de patrones se comparten por mmap) y `procesos` trabajadores.
+# `revisar` (opcional) se llama mientras se espera a los trabajadores; si lanza una
+# excepción (por ejemplo BusquedaCancelada) los trabajadores se detienen y la
+# excepción llega a quien llamó.
+# Retorna (camino de estados codificados o None, estadísticas de cada trabajador, tiempo),
+# sin contar el arranque de los procesos.
+def hda_estrella(tab, start_code, goal_code, nombre_heuristica, procesos=None, revisar=None):
+    procesos = procesos or os.cpu_count() or 1
+    contexto = multiprocessing.get_context('spawn')
+    buzones = [contexto.Queue() for _ in range(procesos)]
+    respuestas = contexto.Queue()
+    incumbente = contexto.RawValue('q', SIN_SOLUCION)
+    bloqueo = contexto.Lock()
+    ociosos = contexto.RawArray('b', [1] * procesos)
+    # Una fila por remitente (los trabajadores y el proceso principal) y una columna por destinatario
+    enviados = contexto.RawArray('q', (procesos + 1) * procesos)
+    recibidos = contexto.RawArray('q', (procesos + 1) * procesos)
+    minimos = contexto.RawArray('q', [SIN_SOLUCION] * procesos)
+    trabajadores = [contexto.Process(target=_trabajador,
+                                     args=(i, procesos, tab.n, nombre_heuristica, goal_code, buzones, respuestas,
+                                           incumbente, bloqueo, ociosos, enviados, recibidos, minimos),
+                                     daemon=True)
+                    for i in range(procesos)]
+    for trabajador in trabajadores:
+        trabajador.start()
+
+    # Próxima respuesta de un trabajador; si alguno terminó con un error no se espera para siempre
+    def respuesta():
+        while True:
+            try:
+                return respuestas.get(timeout=0.1)
+            except queue.Empty:
+                if revisar is not None:
+                    revisar()
+                if any(trabajador.exitcode is not None for trabajador in trabajadores):
+                    raise RuntimeError("Un trabajador de HDA* terminó inesperadamente.")
+
+    try:
+        for _ in range(procesos):
+            respuesta()
+        start = time.time()
+        # El lote inicial lo envía este proceso
+        enviados[procesos * procesos + dueno(start_code, procesos)] = 1
+        buzones[dueno(start_code, procesos)].put(('nodos', procesos, [(start_code, 0, None, None, None)]))
+        anterior = None
+        while True:
+            time.sleep(INTERVALO)
+            foto = (all(ociosos), sum(enviados), sum(recibidos))
+            if foto[0] and foto[1] == foto[2] and foto == anterior:
+                break
+            anterior = foto
+            if revisar is not None:
+                revisar()
+            if any(trabajador.exitcode is not None for trabajador in trabajadores):
+                raise RuntimeError("Un trabajador de HDA* terminó inesperadamente.")
+        path = None
+        if incumbente.value != SIN_SOLUCION:
+            path = [goal_code]
+            while path[-1] != start_code:
+                buzones[dueno(path[-1], procesos)].put(('padre', path[-1]))
+                path.append(respuesta()[1])
+            path.reverse()
+        end = time.time()
+        for buzon in buzones:
+            buzon.put(('fin',))
+        estadisticas = [None] * procesos
+        for _ in range(procesos):
+            _, indice, valores = respuesta()
+            estadisticas[indice] = valores
+        for trabajador in trabajadores:
+            trabajador.join()
+    finally:
+        for trabajador in trabajadores:
+            if trabajador.is_alive():
+                trabajador.terminate()
+    return path, estadisticas, end - start
+
+# Carga del trabajador más ocupado sobre el promedio (1 = reparto perfecto)
+def desbalance(estadisticas):
+    cargas = [valores['expandidos'] for valores in estadisticas]
+    total = sum(cargas)
+    return max(cargas) * len(cargas) / total if total else 1.0
+
+
+if __name__ == '__main__':
+    from solucionador import a_star
+    argumentos = sys.argv[1:]
+
+    def opcion(nombre, defecto):
+        return int(argumentos[argumentos.index(nombre) + 1]) if nombre in argumentos else defecto
+
+    n = opcion('--tamano', 4)
+    procesos = opcion('--procesos', os.cpu_count() or 1)
+    pasos = opcion('--pasos', 60)
+    tab = tablero(n)
+    goal_code = tab.encode_state(meta_espiral(n))
+    nombre = nombre_por_defecto(n)
+    generador = random.Random(1)
+    for _ in range(3):
+        # Caminata al azar desde la meta, sin deshacer el último movimiento
+        code, previo = goal_code, None
+        for _ in range(pasos):
+            code, previo = generador.choice([c for _, c in tab.sucesores(code) if c != previo]), code
+        path, estadisticas, tiempo = hda_estrella(tab, code, goal_code, nombre, procesos)
+        solution, nodos_expandidos, tiempo_a = a_star(tab.decode_state(code), nombre)
+        cargas = ' '.join(str(valores['expandidos']) for valores in estadisticas)
+        print(f"HDA* ({procesos} procesos): {len(path) - 1} movimientos, {tiempo:.3f} s, "
+              f"expandidos por trabajador: {cargas} (desbalance {desbalance(estadisticas):.2f})")
+        print(f"A*: {len(solution) - 1} movimientos, {nodos_expandidos} expandidos, {tiempo_a:.3f} s")
@@ -0,0 +1,126 @@
+# ---------- Caché de soluciones óptimas ----------
+# Guarda, para cada estado de una solución óptima ya encontrada, el primer
+# movimiento del vacío y la distancia que le queda hasta la meta. Como todo
+# sufijo de un camino óptimo también es óptimo, cualquier estado intermedio de
+# una solución anterior se resuelve sin buscar: se sigue la cadena de primeros
+# movimientos, y los caminos que comparten un sufijo comparten sus entradas.
+#
+# En memoria es un LRU acotado (OrderedDict). Opcionalmente se respalda en una
+# base sqlite en disco para que la caché sobreviva entre los procesos que lanza
+# el menú. Se puede usar desde varios hilos (el visor resuelve en segundo plano).
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+
+# Directorio donde se guarda la base por defecto (junto a este archivo)
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+
+# Base en disco por defecto
+RUTA_POR_DEFECTO = os.path.join(DIRECTORIO, "soluciones.sqlite")
+
+# Cantidad de estados que se mantienen en memoria por defecto
+CAPACIDAD_POR_DEFECTO = 100000
+
+# Movimiento registrado para la meta (ya no hay que mover nada)
+SIN_MOVIMIENTO = -1
+
+
+class CacheSoluciones:
+    def __init__(self, capacidad=CAPACIDAD_POR_DEFECTO, ruta=None):
+        self.capacidad = capacidad
+        # (tamaño, estado codificado) -> (dirección del primer movimiento, distancia a la meta)
+        self.entradas = OrderedDict()
+        self.aciertos = 0
+        self.fallos = 0
+        self.bloqueo = threading.Lock()
+        self.conexion = None
+        if ruta is not None:
+            # Varios procesos pueden escribir a la vez: se espera el bloqueo en lugar de fallar.
+            # La conexión se comparte entre hilos, siempre bajo self.bloqueo.
+            self.conexion = sqlite3.connect(ruta, timeout=30, check_same_thread=False)
+            self.conexion.execute(
+                "CREATE TABLE IF NOT EXISTS soluciones ("
+                "n INTEGER, estado TEXT, movimiento INTEGER, distancia INTEGER, "
+                "PRIMARY KEY (n, estado))")
+            self.conexion.commit()
+
+    def __len__(self):
+        return len(self.entradas)
+
+    def cerrar(self):
+        with self.bloqueo:
+            if self.conexion is not None:
+                self.conexion.close()
+                self.conexion = None
+
+    # Entrada de un estado: primero en memoria y, si no está, en la base en disco
+    def _entrada(self, tab, code):
+        clave = (tab.n, code)
+        entrada = self.entradas.get(clave)
+        if entrada is not None:
+            self.entradas.move_to_end(clave)
+            return entrada
+        if self.conexion is not None:
+            # Los estados de tableros grandes no caben en un entero de sqlite: se guardan en hexadecimal
+            fila = self.conexion.execute(
+                "SELECT movimiento, distancia FROM soluciones WHERE n = ? AND estado = ?",
+                (tab.n, f"{code:x}")).fetchone()
+            if fila is not None:
+                self._recordar(clave, fila)
+                return fila
+        return None
+
+    def _recordar(self, clave, entrada):
+        self.entradas[clave] = entrada
+        self.entradas.move_to_end(clave)
+        if len(self.entradas) > self.capacidad:
+            self.entradas.popitem(last=False)
+
+    # Camino óptimo (lista de estados codificados) desde `code` hasta la meta, o
+    # None si no está en la caché. Si falta algún eslabón de la cadena (por
+    # ejemplo porque el LRU lo descartó) se considera un fallo.
+    def buscar(self, tab, code):
+        with self.bloqueo:
+            return self._buscar(tab, code)
+
+    def _buscar(self, tab, code):
+        path = [code]
+        entrada = self._entrada(tab, code)
+        while entrada is not None and entrada[1] > 0:
+            movimiento, distancia = entrada
+            code = tab.mover(code, movimiento)
+            entrada = self._entrada(tab, code)
+            if entrada is not None and entrada[1] != distancia - 1:
+                entrada = None
+            path.append(code)
+        if entrada is None:
+            self.fallos += 1
+            return None
+        self.aciertos += 1
+        return path
+
+    # Registra cada estado de un camino óptimo (lista de estados codificados que
+    # termina en la meta) con su primer movimiento y su distancia restante
+    def guardar(self, tab, path):
+        with self.bloqueo:
+            self._guardar(tab, path)
+
+    def _guardar(self, tab, path):
+        filas = []
+        largo = len(path) - 1
+        for i, code in enumerate(path):
+            if i < largo:
+                destino = tab.posicion_vacio(path[i + 1])
+                movimiento = next(d for d, pos in tab.movimientos[tab.posicion_vacio(code)] if pos == destino)
+            else:
+                movimiento = SIN_MOVIMIENTO
+            entrada = (movimiento, largo - i)
+            self._recordar((tab.n, code), entrada)
+            filas.append((tab.n, f"{code:x}") + entrada)
+        if self.conexion is not None:
+            # Si el estado ya estaba, su entrada también es óptima: se conserva la anterior
+            with self.conexion:
+                self.conexion.executemany(
+                    "INSERT OR IGNORE INTO soluciones (n, estado, movimiento, distancia) VALUES (?, ?, ?, ?)",
+                    filas)
@@ -0,0 +1,188 @@
+# ---------- Codificación compacta de estados del puzzle ----------
+# Cada estado se empaqueta en un único entero:
+#   - BITS bits por ficha (4 en los tableros de 3x3 y 4x4); la casilla (0, 0)
+#     ocupa los bits más altos, así el orden de los enteros coincide con el
+#     orden de las listas de listas originales.
+#   - los BITS bits más bajos guardan el índice del espacio vacío, de modo que
+#     nunca hay que volver a buscar el cero.
+# Las listas de listas sólo se usan en los bordes (JSON y dibujo con Pygame).
+#
+# La clase Tablero agrupa las tablas de un tamaño N x N. Las funciones y
+# constantes a nivel de módulo corresponden al puzzle 8 (3x3).
+
+# Movimientos posibles del espacio vacío: arriba, abajo, izquierda, derecha
+moves = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+
+# Construye, para cada posición del vacío, la lista de movimientos válidos como
+# pares (dirección, casilla destino). El orden respeta el de `moves`.
+def construir_tabla_movimientos(n):
+    tabla = []
+    for pos in range(n * n):
+        x, y = divmod(pos, n)
+        opciones = []
+        for direccion, (dx, dy) in enumerate(moves):
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < n and 0 <= ny < n:
+                opciones.append((direccion, nx * n + ny))
+        tabla.append(tuple(opciones))
+    return tuple(tabla)
+
+# Meta en espiral ("caracol") para un tablero de n x n: las fichas 1, 2, ...
+# recorren el borde en sentido horario hacia el centro y el vacío queda al final.
+def meta_espiral(n):
+    goal = [[0] * n for _ in range(n)]
+    top, bottom, left, right = 0, n - 1, 0, n - 1
+    value = 1
+    while value < n * n:
+        for j in range(left, right + 1):
+            if value < n * n:
+                goal[top][j] = value
+                value += 1
+        top += 1
+        for i in range(top, bottom + 1):
+            if value < n * n:
+                goal[i][right] = value
+                value += 1
+        right -= 1
+        for j in range(right, left - 1, -1):
+            if value < n * n:
+                goal[bottom][j] = value
+                value += 1
+        bottom -= 1
+        for i in range(bottom, top - 1, -1):
+            if value < n * n:
+                goal[i][left] = value
+                value += 1
+        left += 1
+    return goal
+
+
+class Tablero:
+    def __init__(self, n):
+        self.n = n
+        self.celdas = n * n
+        # 4 bits alcanzan hasta 4x4; tableros mayores necesitan más por ficha
+        self.bits = max(4, (self.celdas - 1).bit_length())
+        self.mascara = (1 << self.bits) - 1
+        # Desplazamiento (en bits) de cada casilla dentro del entero, en orden de lectura
+        self.desplazamientos = tuple(self.bits * (self.celdas - pos) for pos in range(self.celdas))
+        # Tabla precalculada de movimientos por posición del vacío
+        self.movimientos = construir_tabla_movimientos(n)
+
+    # Convierte una matriz (lista de listas) en su entero empaquetado
+    def encode_state(self, state):
+        desplazamientos = self.desplazamientos
+        code = 0
+        zero = 0
+        pos = 0
+        for row in state:
+            for value in row:
+                if value == 0:
+                    zero = pos
+                code |= value << desplazamientos[pos]
+                pos += 1
+        return code | zero
+
+    # Convierte un entero empaquetado de vuelta a una matriz (lista de listas)
+    def decode_state(self, code):
+        n = self.n
+        flat = [(code >> shift) & self.mascara for shift in self.desplazamientos]
+        return [flat[i:i + n] for i in range(0, self.celdas, n)]
+
+    # Índice del espacio vacío de un estado codificado
+    def posicion_vacio(self, code):
+        return code & self.mascara
+
+    # Valor de la ficha en la casilla `pos` de un estado codificado
+    def ficha(self, code, pos):
+        return (code >> self.desplazamientos[pos]) & self.mascara
+
+    # Mueve el vacío a la casilla `destino`. Sólo cambian dos fichas y el índice
+    # del vacío, por lo que basta con sumar y restar desplazamientos.
+    def aplicar_movimiento(self, code, destino):
+        desplazamientos = self.desplazamientos
+        zero = code & self.mascara
+        value = (code >> desplazamientos[destino]) & self.mascara
+        return code + (value << desplazamientos[zero]) - (value << desplazamientos[destino]) + destino - zero
+
+    # Aplica al estado el movimiento `direccion` (índice en `moves`) del vacío
+    def mover(self, code, direccion):
+        for d, destino in self.movimientos[code & self.mascara]:
+            if d == direccion:
+                return self.aplicar_movimiento(code, destino)
+        raise ValueError("Movimiento inválido para la posición actual del vacío.")
+
+    # Genera los estados vecinos (codificados) usando la tabla de movimientos
+    def vecinos(self, code):
+        desplazamientos = self.desplazamientos
+        mascara = self.mascara
+        zero = code & mascara
+        shift_zero = desplazamientos[zero]
+        result = []
+        for _, destino in self.movimientos[zero]:
+            shift = desplazamientos[destino]
+            value = (code >> shift) & mascara
+            result.append(code + (value << shift_zero) - (value << shift) + destino - zero)
+        return result
+
+    # Igual que vecinos, pero devuelve pares (dirección, estado) para poder
+    # registrar qué movimiento produjo cada sucesor
+    def sucesores(self, code):
+        desplazamientos = self.desplazamientos
+        mascara = self.mascara
+        zero = code & mascara
+        shift_zero = desplazamientos[zero]
+        result = []
+        for direccion, destino in self.movimientos[zero]:
+            shift = desplazamientos[destino]
+            value = (code >> shift) & mascara
+            result.append((direccion, code + (value << shift_zero) - (value << shift) + destino - zero))
+        return result
+
+    # Invariante de los movimientos: paridad de las inversiones de las fichas y,
+    # en tableros de ancho par, también de la fila del vacío (cada movimiento
+    # vertical salta n - 1 fichas). Dos estados del mismo tamaño se pueden
+    # alcanzar entre sí si y sólo si tienen el mismo invariante.
+    def invariante(self, code):
+        usados = 0
+        inversiones = 0
+        for shift in self.desplazamientos:
+            value = (code >> shift) & self.mascara
+            if value:
+                inversiones += value - 1 - (usados & ((1 << value) - 1)).bit_count()
+                usados |= 1 << value
+        if self.n % 2 == 0:
+            inversiones += (code & self.mascara) // self.n
+        return inversiones & 1
+
+
+# Tableros ya construidos, por tamaño
+_tableros = {}
+
+# Tablero de n x n (las tablas se construyen una sola vez por tamaño)
+def tablero(n):
+    result = _tableros.get(n)
+    if result is None:
+        result = _tableros[n] = Tablero(n)
+    return result
+
+# Tablero correspondiente a una matriz (lista de listas)
+def tablero_de(state):
+    return tablero(len(state))
+
+# ---------- Puzzle 8 (3x3) ----------
+_TABLERO_3 = tablero(3)
+N = _TABLERO_3.n
+BITS = _TABLERO_3.bits
+MASCARA = _TABLERO_3.mascara
+DESPLAZAMIENTOS = _TABLERO_3.desplazamientos
+MOVIMIENTOS = _TABLERO_3.movimientos
+
+encode_state = _TABLERO_3.encode_state
+decode_state = _TABLERO_3.decode_state
+posicion_vacio = _TABLERO_3.posicion_vacio
+ficha = _TABLERO_3.ficha
+aplicar_movimiento = _TABLERO_3.aplicar_movimiento
+mover = _TABLERO_3.mover
+vecinos = _TABLERO_3.vecinos
+sucesores = _TABLERO_3.sucesores
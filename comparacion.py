@@ -0,0 +1,260 @@
+import sys
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from solucionador import AGENTES, INFORMADOS, resolver_con_metricas, to_tuple, is_solvable
+from heuristicas import REGISTRO, nombre_por_defecto
+from metricas import Metricas, BusquedaCancelada
+from Agente import TITULOS, draw_board, draw_buttons, botones_partida, generar_estado_resoluble
+import render
+
+# ---------- Comparación de agentes lado a lado ----------
+# Antes el menú guardaba el tablero en estado_inicial.json y lanzaba un proceso
+# Agente.py por agente, cada uno con su ventana. Aquí el tablero se pasa en
+# memoria a un ProcessPoolExecutor (un proceso por agente, así las búsquedas
+# corren en paralelo de verdad) y una sola ventana muestra un panel por agente.
+# La reproducción está sincronizada: todos los tableros avanzan un paso a la vez
+# cuando terminaron todas las búsquedas; el que llega antes a la meta se queda
+# en ella. Se usa el contexto 'spawn' para no copiar a los procesos hijos el
+# estado de SDL de la ventana.
+#
+# Cada pool recibe al crearse un evento de cancelación (los eventos sólo se
+# pueden pasar a un proceso al crearlo). Al reiniciar o cerrar la ventana se
+# activa: las búsquedas en curso lo ven en su próximo muestreo de métricas y
+# terminan, en lugar de seguir ocupando CPU y memoria en procesos huérfanos.
+
+# Agentes que compara el menú
+AGENTES_POR_DEFECTO = ['bfs', 'a*', 'ida*', 'tabla']
+
+# Segundos entre pasos de la reproducción
+PASO = 0.5
+
+# Ancho máximo de la ventana (las casillas se achican con muchos agentes)
+ANCHO_MAXIMO = 1000
+
+# Evento de cancelación del pool al que pertenece este proceso (sólo en los procesos del pool)
+_cancelado = None
+
+
+# Inicializador de los procesos del pool
+def _preparar(cancelado):
+    global _cancelado
+    _cancelado = cancelado
+
+# Muestreo de métricas de las búsquedas del pool: las detiene si se canceló el pool
+def _revisar_cancelacion(metricas):
+    if _cancelado.is_set():
+        raise BusquedaCancelada
+
+# Crea un pool de `k` procesos con su evento de cancelación. Retorna (executor, evento).
+def nuevo_pool(k, contexto):
+    cancelado = contexto.Event()
+    executor = ProcessPoolExecutor(k, mp_context=contexto, initializer=_preparar, initargs=(cancelado,))
+    return executor, cancelado
+
+# Detiene las búsquedas en curso del pool y lo cierra sin esperarlas
+def detener_pool(executor, cancelado):
+    cancelado.set()
+    executor.shutdown(wait=False, cancel_futures=True)
+
+# Lanza una búsqueda por agente en `executor` con el mismo tablero. Retorna los futures en orden.
+def lanzar(executor, agentes, estado, heuristica=None):
+    return [executor.submit(resolver_con_metricas, agente, estado, heuristica, _revisar_cancelacion)
+            for agente in agentes]
+
+# Resuelve el tablero con todos los agentes en paralelo, sin ventana.
+# Retorna una lista de (solución, nodos expandidos, tiempo, métricas), en el orden de `agentes`.
+def comparar(agentes, estado, heuristica=None):
+    executor, _ = nuevo_pool(len(agentes), multiprocessing.get_context('spawn'))
+    with executor:
+        return [future.result() for future in lanzar(executor, agentes, estado, heuristica)]
+
+# Título del panel de un agente (con la heurística si la usa)
+def titulo_agente(agente, heuristica=None, n=3):
+    if agente in INFORMADOS:
+        return f"{TITULOS[agente]} ({heuristica or nombre_por_defecto(n)})"
+    return TITULOS[agente]
+
+# Dibuja las estadísticas de un agente bajo su tablero. `resultado` es None mientras
+# busca y la excepción si el proceso falló.
+def draw_resumen(screen, font, resultado, x, y, inicio):
+    if resultado is None:
+        # El tiempo cambia en cada cuadro: no vale la pena guardarlo en la caché
+        screen.blit(font.render(f"Resolviendo... {time.time() - inicio:.1f} s", True, (0, 0, 0)), (x, y))
+        return
+    if isinstance(resultado, Exception):
+        screen.blit(render.texto(font, f"Error: {type(resultado).__name__}", (180, 0, 0)), (x, y))
+        return
+    solution, nodos_expandidos, tiempo, valores = resultado
+    if solution is None:
+        screen.blit(render.texto(font, "No se encontró solución", (180, 0, 0)), (x, y))
+        return
+    metricas = Metricas()
+    metricas.sumar(valores)
+    lineas = [
+        f"Movimientos: {len(solution) - 1}",
+        f"Nodos expandidos: {nodos_expandidos}",
+        f"Tiempo: {tiempo:.4f} s",
+        f"Generados: {metricas.generados}",
+        f"Frontera máxima: {metricas.frontera_maxima}",
+        f"Visitados: {metricas.cerrados_maximo}",
+    ]
+    if metricas.consultas:
+        lineas.append(f"Consultas a la tabla: {metricas.consultas}")
+    for idx, txt in enumerate(lineas):
+        screen.blit(render.texto(font, txt, (0, 0, 0)), (x, y + idx * 22))
+
+# ---------- Ventana de comparación ----------
+# Un panel por agente (título, tablero y estadísticas). Los resultados se recogen
+# sin bloquear: cada panel muestra "Resolviendo..." hasta que su proceso termina.
+# "Reiniciar" descarta las búsquedas en curso y compara otro tablero al azar.
+# Con cerrar=False no se cierra pygame al salir (el menú sigue usando su ventana).
+def ejecutar_comparacion(agentes, start_state, heuristica=None, cerrar=True):
+    import pygame
+    pygame.init()
+    n = len(start_state)
+    k = len(agentes)
+    tile_size = max(20, min(100, (ANCHO_MAXIMO // k - 40) // n))
+    ancho_panel = tile_size * n + 40
+    offset_y = 120
+    screen_width = max(ancho_panel * k + 20, 420)
+    screen_height = offset_y + tile_size * n + 170
+    screen = pygame.display.set_mode((screen_width, screen_height))
+    pygame.display.set_caption(f"Puzzle {n * n - 1} - Comparación de agentes")
+    font = pygame.font.SysFont(None, 28)
+    small_font = pygame.font.SysFont(None, 22)
+    big_font = pygame.font.SysFont(None, max(24, tile_size * 3 // 5))
+    clock = pygame.time.Clock()
+    regiones = render.Regiones(screen, (240, 240, 240))
+    regiones.invalidar()
+    zona_botones = pygame.Rect(0, 0, screen_width, 70)
+    zona_paso = pygame.Rect(0, 70, screen_width, 20)
+    zonas_titulo = [pygame.Rect(10 + i * ancho_panel, 90, ancho_panel, 20) for i in range(k)]
+    zonas_tablero = [pygame.Rect(10 + i * ancho_panel + 10, offset_y - 10, tile_size * n + 20, tile_size * n + 20)
+                     for i in range(k)]
+    zonas_resumen = [pygame.Rect(10 + i * ancho_panel, zonas_tablero[i].bottom, ancho_panel,
+                                 screen_height - zonas_tablero[i].bottom) for i in range(k)]
+    pause_btn, resume_btn, reset_btn = botones_partida()
+
+    contexto = multiprocessing.get_context('spawn')
+    executor, cancelado = nuevo_pool(k, contexto)
+    futures = lanzar(executor, agentes, start_state, heuristica)
+    resultados = [None] * k
+    inicio = time.time()
+    running = True
+    paused = False
+    step_index = 0
+    ultimo_paso = None
+    pasos = 0
+
+    while running:
+        # Recoge los resultados que ya llegaron; la reproducción empieza con el último
+        for i, future in enumerate(futures):
+            if resultados[i] is None and future.done():
+                resultados[i] = future.exception() or future.result()
+        listos = all(resultado is not None for resultado in resultados)
+        soluciones = [None if resultado is None or isinstance(resultado, Exception) else resultado[0]
+                      for resultado in resultados]
+        if listos and ultimo_paso is None:
+            pasos = max((len(solution) - 1 for solution in soluciones if solution is not None), default=0)
+            ultimo_paso = time.time()
+
+        current_time = time.time()
+        if listos and not paused and step_index < pasos and current_time - ultimo_paso >= PASO:
+            step_index += 1
+            ultimo_paso = current_time
+
+        regiones.dibujar('botones', zona_botones, None, lambda: draw_buttons(screen, font, False))
+        texto_paso = f"Paso {step_index} de {pasos}" if listos else "Resolviendo en paralelo..."
+        regiones.dibujar('paso', zona_paso, texto_paso,
+                         lambda: screen.blit(render.texto(small_font, texto_paso, (0, 0, 0)), (20, 70)))
+        for i, agente in enumerate(agentes):
+            resultado = resultados[i]
+            solution = soluciones[i]
+            if solution is None:
+                estado_mostrado = start_state
+            else:
+                estado_mostrado = solution[min(step_index, len(solution) - 1)]
+            x = zonas_titulo[i].x + 10
+            titulo = titulo_agente(agente, heuristica, n)
+            regiones.dibujar(('titulo', i), zonas_titulo[i], titulo,
+                             lambda: screen.blit(render.texto(small_font, titulo, (0, 0, 0)), (x, 90)))
+            regiones.dibujar(('tablero', i), zonas_tablero[i], to_tuple(estado_mostrado),
+                             lambda: draw_board(screen, estado_mostrado, big_font, tile_size, offset_y, x + 10))
+            if resultado is None:
+                firma = int((current_time - inicio) * 10)
+            else:
+                firma = repr(resultado) if isinstance(resultado, Exception) else resultado[1:3]
+            regiones.dibujar(('resumen', i), zonas_resumen[i], firma,
+                             lambda: draw_resumen(screen, small_font, resultado, x, zonas_resumen[i].y + 15, inicio))
+
+        regiones.actualizar()
+        animando = not listos or (not paused and step_index < pasos)
+        clock.tick(render.FPS if animando else render.FPS_REPOSO)
+
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.MOUSEBUTTONDOWN:
+                if pause_btn.collidepoint(event.pos):
+                    paused = True
+                elif resume_btn.collidepoint(event.pos):
+                    paused = False
+                elif reset_btn.collidepoint(event.pos):
+                    # Las búsquedas en curso se cancelan y el tablero nuevo va a otro pool
+                    detener_pool(executor, cancelado)
+                    executor, cancelado = nuevo_pool(k, contexto)
+                    start_state = generar_estado_resoluble(n)
+                    futures = lanzar(executor, agentes, start_state, heuristica)
+                    resultados = [None] * k
+                    inicio = time.time()
+                    paused = False
+                    step_index = 0
+                    ultimo_paso = None
+                    pasos = 0
+
+    detener_pool(executor, cancelado)
+    if cerrar:
+        pygame.quit()
+
+# ---------- Punto de entrada ----------
+# Uso: python comparacion.py [AGENTE ...] [--heuristica NOMBRE] [--tamano N] [--archivo] [--sin-ventana]
+# Sin agentes se comparan bfs, a*, ida* y tabla. Con --archivo el tablero se lee de
+# estado_inicial.json; si no, se genera uno al azar. Con --sin-ventana se imprimen
+# los resultados en lugar de abrir la ventana.
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    heuristica = None
+    n = 3
+    if '--heuristica' in args:
+        heuristica = args.pop(args.index('--heuristica') + 1).lower()
+        if heuristica not in REGISTRO:
+            print(f"Heurística desconocida: {heuristica}. Opciones: {', '.join(REGISTRO)}")
+            sys.exit(1)
+    if '--tamano' in args:
+        n = int(args.pop(args.index('--tamano') + 1))
+    agentes = [arg.lower() for arg in args if not arg.startswith('--')] or AGENTES_POR_DEFECTO
+    desconocidos = [agente for agente in agentes if agente not in AGENTES]
+    if desconocidos:
+        print(f"Agente desconocido: {', '.join(desconocidos)}. Opciones: {', '.join(AGENTES)}")
+        sys.exit(1)
+
+    if '--archivo' in args:
+        from Agente import cargar_estado_inicial
+        start_state = cargar_estado_inicial()
+        if not is_solvable(start_state):
+            print("El estado inicial no tiene solución")
+            sys.exit(1)
+    else:
+        start_state = generar_estado_resoluble(n)
+
+    if '--sin-ventana' in args:
+        for agente, (solution, nodos_expandidos, tiempo, valores) in zip(
+                agentes, comparar(agentes, start_state, heuristica)):
+            movimientos = len(solution) - 1 if solution else None
+            print(f"{titulo_agente(agente, heuristica, len(start_state))}: {movimientos} movimientos, "
+                  f"{nodos_expandidos} nodos expandidos, {tiempo:.4f} s, "
+                  f"frontera máxima {valores['frontera_maxima']}")
+    else:
+        ejecutar_comparacion(agentes, start_state, heuristica)
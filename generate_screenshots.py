@@ -5,7 +5,9 @@ import sys
 # Asegurar que se puedan importar los módulos locales
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from Agente import bfs, a_star, goal_state, draw_board, draw_buttons, draw_info, draw_stats
+from solucionador import bfs, a_star, goal_state
+from Agente import draw_board, draw_buttons, draw_info, draw_stats
+from metricas import Metricas
 import menu
 
 # Inicializar Pygame y fuentes
@@ -37,7 +39,7 @@ os.makedirs(output_dir, exist_ok=True)
 
 def capture_menu():
     print("Generando captura de pantalla del Menú Principal...")
-    width, height = 500, 400
+    width, height = 500, 540
     screen = pygame.display.set_mode((width, height))
     pygame.display.set_caption("Menu - Puzzle 8")
     
@@ -46,9 +48,12 @@ def capture_menu():
     pygame.draw.rect(screen, apple_green, (20, 20, width - 40, height - 40), 8, border_radius=20)
     
     # Dibujar botones
-    bfs_btn = pygame.Rect((width // 2 - 150, height // 2 - 90, 300, 50))
-    astar_btn = pygame.Rect((width // 2 - 150, height // 2 - 20, 300, 50))
-    both_btn = pygame.Rect((width // 2 - 150, height // 2 + 50, 300, 50))
+    bfs_btn = pygame.Rect((width // 2 - 150, height // 2 - 160, 300, 50))
+    bfs2_btn = pygame.Rect((width // 2 - 150, height // 2 - 95, 300, 50))
+    astar_btn = pygame.Rect((width // 2 - 150, height // 2 - 30, 300, 50))
+    idastar_btn = pygame.Rect((width // 2 - 150, height // 2 + 35, 300, 50))
+    both_btn = pygame.Rect((width // 2 - 150, height // 2 + 100, 300, 50))
+    heuristica_btn = pygame.Rect((width // 2 - 150, height // 2 + 165, 300, 50))
     
     # Función de dibujado de botones adaptada para recibir la pantalla y fuente
     def draw_btn_local(rect, text):
@@ -59,8 +64,11 @@ def capture_menu():
         screen.blit(label, label_rect)
         
     draw_btn_local(bfs_btn, "Jugar con agente no informado (BFS)")
+    draw_btn_local(bfs2_btn, "Jugar con BFS bidireccional")
     draw_btn_local(astar_btn, "Jugar con agente informado (A*)")
-    draw_btn_local(both_btn, "Comparar ambos agentes lado a lado")
+    draw_btn_local(idastar_btn, "Jugar con agente informado (IDA*)")
+    draw_btn_local(both_btn, "Comparar agentes lado a lado")
+    draw_btn_local(heuristica_btn, "Heurística de A* e IDA*: manhattan")
     
     pygame.display.flip()
     pygame.image.save(screen, os.path.join(output_dir, "menu_principal.png"))
@@ -68,7 +76,7 @@ def capture_menu():
 
 def capture_manual_input():
     print("Generando captura de pantalla de Ingreso Manual...")
-    width, height = 500, 400
+    width, height = 500, 540
     screen = pygame.display.set_mode((width, height))
     pygame.display.set_caption("Menu - Puzzle 8")
     
@@ -117,7 +125,7 @@ def capture_bfs_solving():
     tile_size = 100
     offset_y = 80
     screen_width = tile_size * 3 + 100
-    screen_height = tile_size * 3 + offset_y + 160
+    screen_height = tile_size * 3 + offset_y + 260
     screen = pygame.display.set_mode((screen_width, screen_height))
     pygame.display.set_caption("Puzzle 8 - Agente BFS")
     
@@ -136,12 +144,13 @@ def capture_bfs_solving():
 
 def capture_bfs_result():
     print("Generando captura de pantalla de Resultado BFS...")
-    solution, nodos, tiempo = bfs(start_state)
+    metricas = Metricas()
+    solution, nodos, tiempo = bfs(start_state, metricas)
     
     tile_size = 100
     offset_y = 80
     screen_width = tile_size * 3 + 100
-    screen_height = tile_size * 3 + offset_y + 160
+    screen_height = tile_size * 3 + offset_y + 260
     screen = pygame.display.set_mode((screen_width, screen_height))
     pygame.display.set_caption("Puzzle 8 - Agente BFS")
     
@@ -153,7 +162,7 @@ def capture_bfs_result():
     
     # Dibujar información final
     draw_info(screen, font_agent, tiempo, len(solution) - 1, screen_width, screen_height)
-    draw_stats(screen, font_agent, nodos, tiempo, screen_height)
+    draw_stats(screen, font_agent, nodos, tiempo, screen_height, metricas)
     
     pygame.display.flip()
     pygame.image.save(screen, os.path.join(output_dir, "resultado_bfs.png"))
@@ -161,12 +170,13 @@ def capture_bfs_result():
 
 def capture_astar_result():
     print("Generando captura de pantalla de Resultado A*...")
-    solution, nodos, tiempo = a_star(start_state)
+    metricas = Metricas()
+    solution, nodos, tiempo = a_star(start_state, metricas=metricas)
     
     tile_size = 100
     offset_y = 80
     screen_width = tile_size * 3 + 100
-    screen_height = tile_size * 3 + offset_y + 160
+    screen_height = tile_size * 3 + offset_y + 260
     screen = pygame.display.set_mode((screen_width, screen_height))
     pygame.display.set_caption("Puzzle 8 - Agente A*")
     
@@ -178,7 +188,7 @@ def capture_astar_result():
     
     # Dibujar información final
     draw_info(screen, font_agent, tiempo, len(solution) - 1, screen_width, screen_height)
-    draw_stats(screen, font_agent, nodos, tiempo, screen_height)
+    draw_stats(screen, font_agent, nodos, tiempo, screen_height, metricas)
     
     pygame.display.flip()
     pygame.image.save(screen, os.path.join(output_dir, "resultado_astar.png"))
@@ -0,0 +1,246 @@
+# ---------- Heurísticas para los agentes informados ----------
+# Todas las heurísticas comparten la misma interfaz:
+#   heuristica(code)                                  -> h del estado
+#   heuristica.inicial(code)                          -> (h, aux) del estado inicial
+#   heuristica.mover(h, aux, value, zero, destino, hijo) -> (h, aux) del sucesor `hijo`
+# `aux` es información propia de cada heurística que se arrastra de padre a
+# hijo para poder actualizar h sin recalcularla cuando la ficha `value` pasa
+# de la casilla `destino` a la casilla del vacío `zero`.
+#
+# Cada clase declara su `nombre` (el que se usa en la línea de comandos y en el
+# menú), si es `admisible` (nunca sobreestima, así A*/IDA* siguen siendo
+# óptimos) y una breve descripción. REGISTRO las agrupa por nombre.
+from collections import deque
+
+from patrones import BasePatrones
+
+
+# Posición (fila, columna) de cada ficha en la meta
+def posiciones_meta(tab, goal_code):
+    goal_positions = {}
+    for pos in range(tab.celdas):
+        goal_positions[tab.ficha(goal_code, pos)] = divmod(pos, tab.n)
+    return goal_positions
+
+
+# Suma de las distancias de Manhattan de cada ficha a su posición en la meta
+class Manhattan:
+    nombre = 'manhattan'
+    admisible = True
+    descripcion = "Distancia de Manhattan"
+
+    def __init__(self, tab, goal_code):
+        self.tablero = tab
+        goal_positions = posiciones_meta(tab, goal_code)
+        # tabla[ficha][casilla]: distancia de la ficha en esa casilla a su posición en la meta
+        self.tabla = [[0] * tab.celdas for _ in range(tab.celdas)]
+        for value in range(1, tab.celdas):
+            goal_i, goal_j = goal_positions[value]
+            for pos in range(tab.celdas):
+                i, j = divmod(pos, tab.n)
+                self.tabla[value][pos] = abs(i - goal_i) + abs(j - goal_j)
+
+    def __call__(self, code):
+        tab = self.tablero
+        distance = 0
+        for pos in range(tab.celdas):
+            distance += self.tabla[tab.ficha(code, pos)][pos]
+        return distance
+
+    def inicial(self, code):
+        return self(code), None
+
+    def mover(self, h, aux, value, zero, destino, hijo):
+        distancias = self.tabla[value]
+        return h + distancias[zero] - distancias[destino], None
+
+
+# Manhattan más conflictos lineales: dos fichas que están en su fila (o columna)
+# meta pero en orden invertido obligan a que una de ellas salga y vuelva a
+# entrar, lo que suma 2 movimientos que Manhattan no cuenta.
+class ConflictoLineal(Manhattan):
+    nombre = 'conflicto'
+    admisible = True
+    descripcion = "Manhattan + conflictos lineales"
+
+    # Bits por línea dentro de `aux` (hasta 2 * (n - 1) conflictos por línea)
+    BITS_LINEA = 5
+
+    def __init__(self, tab, goal_code):
+        super().__init__(tab, goal_code)
+        n = tab.n
+        goal_positions = posiciones_meta(tab, goal_code)
+        # Líneas 0..n-1 son filas y n..2n-1 columnas. Para cada línea: sus casillas y,
+        # para cada ficha, su posición dentro de la línea meta (o None si su meta está en otra línea)
+        self.casillas = [[i * n + j for j in range(n)] for i in range(n)]
+        self.casillas += [[i * n + j for i in range(n)] for j in range(n)]
+        self.orden_meta = []
+        for linea in range(2 * n):
+            orden = [None] * tab.celdas
+            for value in range(1, tab.celdas):
+                goal_i, goal_j = goal_positions[value]
+                if linea < n and goal_i == linea:
+                    orden[value] = goal_j
+                elif linea >= n and goal_j == linea - n:
+                    orden[value] = goal_i
+            self.orden_meta.append(orden)
+        self._memo = [{} for _ in range(2 * n)]
+
+    # 2 x (fichas de la línea en su línea meta - la subsecuencia creciente más larga)
+    def conflictos_linea(self, code, linea):
+        ficha = self.tablero.ficha
+        clave = 0
+        for pos in self.casillas[linea]:
+            clave = (clave << self.tablero.bits) | ficha(code, pos)
+        memo = self._memo[linea]
+        conflictos = memo.get(clave)
+        if conflictos is None:
+            orden = self.orden_meta[linea]
+            secuencia = [orden[ficha(code, pos)] for pos in self.casillas[linea] if orden[ficha(code, pos)] is not None]
+            mejores = []
+            for i, value in enumerate(secuencia):
+                mejores.append(1 + max((mejores[k] for k in range(i) if secuencia[k] < value), default=0))
+            conflictos = memo[clave] = 2 * (len(secuencia) - max(mejores, default=0))
+        return conflictos
+
+    def inicial(self, code):
+        h = Manhattan.__call__(self, code)
+        aux = 0
+        for linea in range(2 * self.tablero.n):
+            conflictos = self.conflictos_linea(code, linea)
+            h += conflictos
+            aux |= conflictos << (self.BITS_LINEA * linea)
+        return h, aux
+
+    def __call__(self, code):
+        return self.inicial(code)[0]
+
+    def mover(self, h, aux, value, zero, destino, hijo):
+        distancias = self.tabla[value]
+        h += distancias[zero] - distancias[destino]
+        n = self.tablero.n
+        # Un movimiento vertical cambia dos filas; uno horizontal, dos columnas
+        if zero // n == destino // n:
+            lineas = (n + zero % n, n + destino % n)
+        else:
+            lineas = (zero // n, destino // n)
+        for linea in lineas:
+            shift = self.BITS_LINEA * linea
+            anterior = (aux >> shift) & ((1 << self.BITS_LINEA) - 1)
+            nuevo = self.conflictos_linea(hijo, linea)
+            h += nuevo - anterior
+            aux += (nuevo - anterior) << shift
+        return h, aux
+
+
+# Distancia de caminata (walking distance): se cuenta, por separado para filas y
+# columnas, cuántos movimientos hacen falta para que cada fila contenga las
+# fichas cuya meta está en esa fila, sin importar el orden. Cada relajación se
+# resuelve una vez con una BFS sobre las matrices de conteo.
+class DistanciaCaminata:
+    nombre = 'caminata'
+    admisible = True
+    descripcion = "Distancia de caminata (filas + columnas)"
+
+    # Bits por entrada de la matriz de conteo
+    BITS_CONTEO = 3
+
+    def __init__(self, tab, goal_code):
+        self.tablero = tab
+        n = tab.n
+        goal_positions = posiciones_meta(tab, goal_code)
+        self.fila_meta = [0] * tab.celdas
+        self.columna_meta = [0] * tab.celdas
+        for value in range(1, tab.celdas):
+            self.fila_meta[value], self.columna_meta[value] = goal_positions[value]
+        vacio_i, vacio_j = goal_positions[0]
+        self.bits_clave = self.BITS_CONTEO * n * n + 4
+        self.tabla_filas = self._bfs(vacio_i)
+        self.tabla_columnas = self.tabla_filas if vacio_i == vacio_j else self._bfs(vacio_j)
+
+    # Desplazamiento de la entrada (línea actual, línea meta) dentro de una clave
+    def _shift(self, actual, meta):
+        return self.BITS_CONTEO * (actual * self.tablero.n + meta) + 4
+
+    # BFS desde la matriz meta (cada línea contiene sus propias fichas) con el vacío en `vacio`
+    def _bfs(self, vacio):
+        n = self.tablero.n
+        inicio = vacio
+        for i in range(n):
+            inicio += (n - 1 if i == vacio else n) << self._shift(i, i)
+        mascara = (1 << self.BITS_CONTEO) - 1
+        tabla = {inicio: 0}
+        queue = deque([inicio])
+        while queue:
+            clave = queue.popleft()
+            distancia = tabla[clave]
+            zero = clave & 15
+            for otra in (zero - 1, zero + 1):
+                if 0 <= otra < n:
+                    # Cualquier ficha de la línea vecina puede pasar a la línea del vacío
+                    for meta in range(n):
+                        if (clave >> self._shift(otra, meta)) & mascara:
+                            nueva = clave - (1 << self._shift(otra, meta)) + (1 << self._shift(zero, meta)) - zero + otra
+                            if nueva not in tabla:
+                                tabla[nueva] = distancia + 1
+                                queue.append(nueva)
+        return tabla
+
+    def inicial(self, code):
+        tab = self.tablero
+        n = tab.n
+        zero = tab.posicion_vacio(code)
+        filas = zero // n
+        columnas = zero % n
+        for pos in range(tab.celdas):
+            value = tab.ficha(code, pos)
+            if value:
+                i, j = divmod(pos, n)
+                filas += 1 << self._shift(i, self.fila_meta[value])
+                columnas += 1 << self._shift(j, self.columna_meta[value])
+        aux = filas | (columnas << self.bits_clave)
+        return self.tabla_filas[filas] + self.tabla_columnas[columnas], aux
+
+    def __call__(self, code):
+        return self.inicial(code)[0]
+
+    def mover(self, h, aux, value, zero, destino, hijo):
+        n = self.tablero.n
+        filas = aux & ((1 << self.bits_clave) - 1)
+        columnas = aux >> self.bits_clave
+        zi, zj = divmod(zero, n)
+        di, dj = divmod(destino, n)
+        if zi != di:
+            # Movimiento vertical: la ficha cambia de fila y el vacío también
+            meta = self.fila_meta[value]
+            filas += (1 << self._shift(zi, meta)) - (1 << self._shift(di, meta)) + di - zi
+        else:
+            meta = self.columna_meta[value]
+            columnas += (1 << self._shift(zj, meta)) - (1 << self._shift(dj, meta)) + dj - zj
+        return self.tabla_filas[filas] + self.tabla_columnas[columnas], filas | (columnas << self.bits_clave)
+
+
+# Registro de heurísticas disponibles, por nombre
+REGISTRO = {cls.nombre: cls for cls in (Manhattan, ConflictoLineal, DistanciaCaminata, BasePatrones)}
+
+# Instancias ya construidas, por (nombre, tamaño, meta)
+_cache = {}
+
+# Heurística `nombre` para el tablero y la meta indicados (se construye una sola vez por meta)
+def obtener_heuristica(nombre, tab, goal_code):
+    if nombre not in REGISTRO:
+        raise ValueError(f"Heurística desconocida: {nombre}. Opciones: {', '.join(REGISTRO)}")
+    clave = (nombre, tab.n, goal_code)
+    heuristica = _cache.get(clave)
+    if heuristica is None:
+        heuristica = _cache[clave] = REGISTRO[nombre](tab, goal_code)
+    return heuristica
+
+# Nombre de la heurística por defecto de cada tamaño: Manhattan en el puzzle 8
+# y bases de datos de patrones aditivas en tableros mayores
+def nombre_por_defecto(n):
+    return 'manhattan' if n == 3 else 'patrones'
+
+# Heurística por defecto del tablero y la meta indicados
+def heuristica_por_defecto(tab, goal_code):
+    return obtener_heuristica(nombre_por_defecto(tab.n), tab, goal_code)
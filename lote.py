@@ -0,0 +1,345 @@
+# ---------- Resolución por lotes, sin ventana ----------
+# Lee tableros de un archivo JSONL (uno por línea) o JSON (una lista), o de la
+# entrada estándar, y los reparte entre un pool de procesos. Por cada tablero
+# se escribe una línea JSON con los movimientos, la longitud de la solución, los
+# nodos expandidos y el tiempo, a medida que van terminando. Con --metricas
+# cada línea incluye además las métricas de la búsqueda (ver metricas.py).
+#
+# La entrada se lee como flujo y sólo se mantiene en vuelo una ventana acotada
+# de tableros, así la memoria no crece con el tamaño del archivo.
+#
+# Cada tablero puede ser una matriz ([[1, 2, 3], ...]) o un objeto
+# {"id": ..., "estado": [[...]]}. Si no trae id se usa su número de orden.
+#
+# Uso: python lote.py [entrada|-] [--salida ARCHIVO] [--agente a*] [--heuristica NOMBRE]
+#                     [--procesos N] [--lote K] [--ordenado] [--cache] [--servicio] [--metricas]
+# Con --cache los procesos comparten las soluciones óptimas en soluciones.sqlite.
+# Con --servicio los tableros se resuelven en el servicio local (servicio.py)
+# en lugar de en un pool propio.
+import asyncio
+import json
+import multiprocessing
+import os
+import sys
+import threading
+import time
+
+import solucionador
+from cache_soluciones import CacheSoluciones, RUTA_POR_DEFECTO
+from codificacion import moves
+from metricas import Metricas
+from servicio import DIRECCION_POR_DEFECTO, LIMITE_LINEA
+
+# Nombre de cada dirección de `moves` (movimiento del espacio vacío)
+NOMBRES_MOVIMIENTOS = ['arriba', 'abajo', 'izquierda', 'derecha']
+
+# Tamaño de lectura al recorrer la entrada
+TAM_BLOQUE = 1 << 16
+
+_decodificador = json.JSONDecoder()
+
+
+# ---------- Lectura de la entrada como flujo ----------
+
+# Valores JSON consecutivos de un archivo de texto. Si el archivo es una lista
+# de tableros ([[[...]], ...] o [{...}, ...]) se recorren sus elementos uno a
+# uno sin cargar la lista completa; si no, se leen valores separados por
+# espacios o saltos de línea (JSONL).
+def leer_valores(f):
+    buffer = ''
+    fin = False
+    pos = 0
+
+    # Garantiza al menos `minimo` caracteres sin procesar en el buffer (si quedan en el archivo)
+    def rellenar(minimo=1):
+        nonlocal buffer, pos, fin
+        while not fin and len(buffer) - pos < minimo:
+            bloque = f.read(TAM_BLOQUE)
+            if not bloque:
+                fin = True
+            buffer = buffer[pos:] + bloque
+            pos = 0
+
+    def saltar(separadores):
+        nonlocal pos
+        while True:
+            rellenar()
+            while pos < len(buffer) and buffer[pos] in separadores:
+                pos += 1
+            if pos < len(buffer) or fin:
+                return
+
+    # Primeros caracteres significativos, para distinguir una lista de tableros
+    # de un único tablero o de un archivo JSONL
+    saltar(' \t\r\n')
+    rellenar(256)
+    inicio = ''.join(buffer[pos:pos + 256].split())
+    es_lista = inicio.startswith('[[[') or inicio.startswith('[{')
+    if es_lista:
+        pos += 1
+    separadores = ' \t\r\n,' if es_lista else ' \t\r\n'
+
+    while True:
+        saltar(separadores)
+        if pos >= len(buffer) or (es_lista and buffer[pos] == ']'):
+            return
+        while True:
+            try:
+                valor, final = _decodificador.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # El valor quedó cortado al final del bloque: se lee más
+                if fin:
+                    raise
+                rellenar(len(buffer) - pos + TAM_BLOQUE)
+                continue
+            # Un número al final del bloque podría seguir en el próximo
+            if final == len(buffer) and not fin:
+                rellenar(len(buffer) - pos + TAM_BLOQUE)
+                continue
+            break
+        pos = final
+        yield valor
+
+# Pares (id, estado) de la entrada, numerando los tableros que no traen id
+def leer_tableros(f):
+    for numero, valor in enumerate(leer_valores(f)):
+        if isinstance(valor, dict):
+            yield valor.get('id', numero), valor.get('estado')
+        else:
+            yield numero, valor
+
+
+# ---------- Trabajo de cada proceso ----------
+_agente = None
+_heuristica = None
+_cache = None
+_con_metricas = False
+
+def _inicializar(agente, heuristica, ruta_cache=None, con_metricas=False):
+    global _agente, _heuristica, _cache, _con_metricas
+    _agente = agente
+    _heuristica = heuristica
+    _con_metricas = con_metricas
+    if ruta_cache is not None:
+        _cache = CacheSoluciones(ruta=ruta_cache)
+    # La tabla de distancias se abre una vez por proceso (mmap compartido por el sistema)
+    if agente == 'tabla':
+        solucionador.abrir_tabla(solucionador.GOAL_CODE)
+
+# Direcciones del espacio vacío entre estados consecutivos de una solución
+def movimientos_de(solution):
+    result = []
+    anterior = solucionador.find_zero(solution[0])
+    for state in solution[1:]:
+        actual = solucionador.find_zero(state)
+        delta = (actual[0] - anterior[0], actual[1] - anterior[1])
+        result.append(NOMBRES_MOVIMIENTOS[moves.index(delta)])
+        anterior = actual
+    return result
+
+# Resuelve un tablero y retorna su línea de resultado (ya serializada)
+def resolver_tablero(tarea):
+    identificador, estado = tarea
+    resultado = {'id': identificador}
+    metricas = Metricas() if _con_metricas else None
+    # Un error de un tablero (inválido, de un tamaño que el agente no admite, como
+    # 'tabla' en el 4x4, o cualquier falla del agente) queda en su línea y no corta el lote
+    try:
+        if not solucionador.is_solvable(estado):
+            resultado['error'] = "El estado no es resoluble."
+            return json.dumps(resultado)
+        solution, nodos_expandidos, tiempo = solucionador.resolver(_agente, estado, _heuristica, _cache, metricas)
+    except (TypeError, ValueError) as e:
+        resultado['error'] = str(e) or "Tablero inválido."
+        return json.dumps(resultado)
+    except Exception as e:
+        resultado['error'] = f"{type(e).__name__}: {e}"
+        return json.dumps(resultado)
+    return linea_resultado(identificador, solution, nodos_expandidos, tiempo,
+                           metricas.como_dict() if metricas is not None else None)
+
+# Línea de resultado de un tablero ya resuelto (`metricas` es un diccionario de Metricas.como_dict)
+def linea_resultado(identificador, solution, nodos_expandidos, tiempo, metricas=None):
+    resultado = {'id': identificador}
+    if solution is None:
+        resultado['error'] = "No se encontró solución."
+    else:
+        movimientos = movimientos_de(solution)
+        resultado['movimientos'] = movimientos
+        resultado['longitud'] = len(movimientos)
+    resultado['nodos'] = nodos_expandidos
+    resultado['tiempo'] = round(tiempo, 6)
+    if metricas is not None:
+        resultado['metricas'] = metricas
+    return json.dumps(resultado)
+
+
+# ---------- Reparto entre procesos ----------
+
+# Resuelve los tableros de `entrada` en un pool de `procesos` procesos y escribe
+# cada resultado en `salida` apenas está listo. `lote` es la cantidad de tableros
+# que se envía de una vez a cada proceso; como mucho hay `ventana` tableros en
+# vuelo. Con `ordenado` los resultados salen en el orden de la entrada y con
+# `ruta_cache` cada proceso usa una caché de soluciones respaldada en esa base.
+# Retorna la cantidad de tableros procesados.
+def resolver_lote(entrada, salida, agente='a*', heuristica=None, procesos=None,
+                  lote=16, ventana=None, ordenado=False, ruta_cache=None, con_metricas=False):
+    procesos = procesos or os.cpu_count() or 1
+    ventana = ventana or procesos * lote * 4
+    # El hilo del pool que reparte tareas se bloquea cuando la ventana está llena
+    # y se libera un lugar por cada resultado escrito
+    lugares = threading.BoundedSemaphore(ventana)
+
+    def tareas():
+        for tarea in leer_tableros(entrada):
+            lugares.acquire()
+            yield tarea
+
+    total = 0
+    with multiprocessing.Pool(procesos, _inicializar, (agente, heuristica, ruta_cache, con_metricas)) as pool:
+        recorrer = pool.imap if ordenado else pool.imap_unordered
+        for linea in recorrer(resolver_tablero, tareas(), chunksize=lote):
+            salida.write(linea + '\n')
+            salida.flush()
+            lugares.release()
+            total += 1
+    return total
+
+# Igual que resolver_lote, pero enviando los tableros al servicio local
+# (servicio.py) por una sola conexión, con hasta `ventana` pedidos en vuelo.
+# El servicio reparte los pedidos entre sus propios procesos trabajadores.
+async def resolver_lote_servicio(entrada, salida, agente='a*', heuristica=None, ventana=64,
+                                 ordenado=False, usar_cache=False, direccion=DIRECCION_POR_DEFECTO,
+                                 con_metricas=False):
+    if isinstance(direccion, str):
+        reader, writer = await asyncio.open_unix_connection(direccion, limit=LIMITE_LINEA)
+    else:
+        reader, writer = await asyncio.open_connection(*direccion, limit=LIMITE_LINEA)
+    lugares = asyncio.Semaphore(ventana)
+    # Número de pedido -> id del tablero en la entrada
+    identificadores = {}
+    # Con `ordenado`, líneas que esperan a que salgan las anteriores
+    listas = {}
+    proxima = 0
+    total = 0
+
+    async def enviar():
+        numero = 0
+        # La lectura de la entrada es bloqueante: se hace en un hilo aparte
+        tableros = leer_tableros(entrada)
+        while True:
+            tarea = await asyncio.to_thread(next, tableros, None)
+            if tarea is None:
+                break
+            await lugares.acquire()
+            identificadores[numero] = tarea[0]
+            pedido = {'op': 'resolver', 'id': numero, 'agente': agente, 'estado': tarea[1],
+                      'heuristica': heuristica, 'cache': usar_cache, 'metricas': con_metricas}
+            writer.write(json.dumps(pedido).encode() + b'\n')
+            await writer.drain()
+            numero += 1
+        return numero
+
+    async def recibir():
+        nonlocal total, proxima
+        while True:
+            linea = await reader.readline()
+            if not linea:
+                raise ConnectionError("El servicio cerró la conexión.")
+            respuesta = json.loads(linea)
+            numero = respuesta['id']
+            identificador = identificadores.pop(numero)
+            if 'error' in respuesta:
+                texto = json.dumps({'id': identificador, 'error': respuesta['error']})
+            else:
+                texto = linea_resultado(identificador, respuesta['solucion'], respuesta['nodos'], respuesta['tiempo'],
+                                        respuesta.get('metricas'))
+            lugares.release()
+            total += 1
+            if ordenado:
+                listas[numero] = texto
+                while proxima in listas:
+                    salida.write(listas.pop(proxima) + '\n')
+                    proxima += 1
+            else:
+                salida.write(texto + '\n')
+            salida.flush()
+            if envio.done() and total == envio.result():
+                return
+
+    envio = asyncio.create_task(enviar())
+    recepcion = asyncio.create_task(recibir())
+    try:
+        # Si la recepción falla antes de terminar el envío, el envío podría quedar esperando lugar
+        await asyncio.wait({envio, recepcion}, return_when=asyncio.FIRST_COMPLETED)
+        if recepcion.done():
+            recepcion.result()
+        enviados = await envio
+        if total < enviados:
+            await recepcion
+    finally:
+        envio.cancel()
+        recepcion.cancel()
+        writer.close()
+    return total
+
+if __name__ == '__main__':
+    argumentos = sys.argv[1:]
+
+    def opcion(nombre, defecto=None):
+        if nombre in argumentos:
+            i = argumentos.index(nombre)
+            valor = argumentos[i + 1]
+            del argumentos[i:i + 2]
+            return valor
+        return defecto
+
+    ruta_salida = opcion('--salida')
+    agente = opcion('--agente', 'a*').lower()
+    heuristica = opcion('--heuristica')
+    procesos = int(opcion('--procesos', 0)) or None
+    lote = int(opcion('--lote', 16))
+    ordenado = '--ordenado' in argumentos
+    if ordenado:
+        argumentos.remove('--ordenado')
+    ruta_cache = None
+    if '--cache' in argumentos:
+        argumentos.remove('--cache')
+        ruta_cache = RUTA_POR_DEFECTO
+    usar_servicio = '--servicio' in argumentos
+    if usar_servicio:
+        argumentos.remove('--servicio')
+    con_metricas = '--metricas' in argumentos
+    if con_metricas:
+        argumentos.remove('--metricas')
+    if agente not in solucionador.AGENTES:
+        print(f"Agente desconocido: {agente}. Opciones: {', '.join(solucionador.AGENTES)}", file=sys.stderr)
+        sys.exit(1)
+    if agente in solucionador.AGENTES_CON_PROCESOS:
+        print(solucionador.MENSAJE_CON_PROCESOS, file=sys.stderr)
+        sys.exit(1)
+    if heuristica is not None and heuristica not in solucionador.REGISTRO:
+        print(f"Heurística desconocida: {heuristica}. Opciones: {', '.join(solucionador.REGISTRO)}", file=sys.stderr)
+        sys.exit(1)
+
+    entrada = sys.stdin if not argumentos or argumentos[0] == '-' else open(argumentos[0])
+    salida = open(ruta_salida, 'w') if ruta_salida else sys.stdout
+    inicio = time.perf_counter()
+    try:
+        total = None
+        if usar_servicio:
+            try:
+                total = asyncio.run(resolver_lote_servicio(entrada, salida, agente, heuristica,
+                                                           ordenado=ordenado, usar_cache=ruta_cache is not None,
+                                                           con_metricas=con_metricas))
+            except (ConnectionRefusedError, FileNotFoundError):
+                print("El servicio no está corriendo: se resuelve con un pool local.", file=sys.stderr)
+        if total is None:
+            total = resolver_lote(entrada, salida, agente, heuristica, procesos, lote, ordenado=ordenado,
+                                  ruta_cache=ruta_cache, con_metricas=con_metricas)
+    finally:
+        if entrada is not sys.stdin:
+            entrada.close()
+        if salida is not sys.stdout:
+            salida.close()
+    print(f"{total} tableros resueltos en {time.perf_counter() - inicio:.2f} s", file=sys.stderr)
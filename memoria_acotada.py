@@ -0,0 +1,213 @@
+# ---------- A* con memoria acotada (SMA*) ----------
+# A* guarda todos los estados generados: en tableros grandes, o con una
+# heurística débil, el heap y la tabla de costos crecen hasta agotar la memoria.
+# SMA* (Russell, 1992) conserva a lo sumo `limite` nodos del árbol de búsqueda:
+#   - cada iteración toma la hoja abierta de menor f (entre empates, la más
+#     profunda) y genera uno solo de sus sucesores
+#   - con la memoria llena olvida la hoja abierta de mayor f (entre empates, la
+#     menos profunda); el padre recuerda el f del hijo olvidado y vuelve a la
+#     lista de abiertos para regenerarlo si hace falta
+#   - cuando un nodo tiene todos sus sucesores generados, su f pasa a ser el
+#     menor f de los hijos (en memoria u olvidados) y el cambio se propaga a
+#     los ancestros
+# Un nodo a profundidad limite - 1 que no es la meta recibe f = infinito: su
+# camino no cabe en memoria. Con una heurística admisible la solución es óptima
+# siempre que el camino óptimo quepa (limite > longitud óptima); si no, se
+# devuelve la mejor que cabe, o ninguna.
+#
+# El árbol no detecta estados repetidos (como IDA*, sólo descarta deshacer el
+# último movimiento), así que la memoria no depende del tamaño del espacio de
+# estados sino únicamente de `limite`.
+import heapq
+
+# Nodos que conserva por defecto el agente 'sma*'
+LIMITE_POR_DEFECTO = 100_000
+
+INFINITO = float('inf')
+
+
+class _Nodo:
+    __slots__ = ('code', 'g', 'h', 'f', 'aux', 'padre', 'movimiento', 'profundidad',
+                 'sucesores', 'hijos', 'olvidados', 'version', 'abierto', 'vivo')
+
+    def __init__(self, code, g, h, f, aux, padre, movimiento, profundidad):
+        self.code = code
+        self.g = g
+        self.h = h
+        self.f = f
+        self.aux = aux
+        self.padre = padre
+        self.movimiento = movimiento
+        self.profundidad = profundidad
+        # Sucesores (movimiento, código) sin el que deshace el último movimiento; se calculan al expandir
+        self.sucesores = None
+        # Hijos en memoria y f de los olvidados, por movimiento
+        self.hijos = {}
+        self.olvidados = {}
+        self.version = 0
+        self.abierto = False
+        self.vivo = True
+
+    # True si ya se generaron todos los sucesores (en memoria u olvidados)
+    def completo(self):
+        return self.sucesores is not None and len(self.hijos) + len(self.olvidados) == len(self.sucesores)
+
+
+# SMA* desde `start_code` hasta `goal_code` en el tablero `tab` con una heurística
+# incremental (ver heuristicas.py). Con `metricas` también cuenta los nodos
+# olvidados y regenerados. Retorna (camino de estados codificados o None, nodos expandidos).
+def sma_estrella(tab, start_code, goal_code, heuristica, limite=LIMITE_POR_DEFECTO, metricas=None):
+    if limite < 2:
+        raise ValueError("SMA* necesita memoria para al menos 2 nodos.")
+    sucesores = tab.sucesores
+    ficha = tab.ficha
+    mascara = tab.mascara
+    mover = heuristica.mover
+    if metricas is not None:
+        sucesores = metricas.sucesores(sucesores)
+        mover = metricas.heuristica(mover)
+    # mejores: (f, -profundidad) ascendente; peores: (f, profundidad) descendente.
+    # Las entradas con una versión vieja del nodo se descartan al salir.
+    mejores = []
+    peores = []
+    contador = 0
+    abiertos = 0
+    en_memoria = 1
+    nodos_expandidos = 0
+
+    def abrir(nodo):
+        nonlocal contador, abiertos
+        if not nodo.abierto:
+            nodo.abierto = True
+            abiertos += 1
+        nodo.version += 1
+        contador += 1
+        heapq.heappush(mejores, (nodo.f, -nodo.profundidad, contador, nodo.version, nodo))
+        heapq.heappush(peores, (-nodo.f, nodo.profundidad, contador, nodo.version, nodo))
+
+    def cerrar(nodo):
+        nonlocal abiertos
+        nodo.abierto = False
+        nodo.version += 1
+        abiertos -= 1
+
+    # Recalcula f de los nodos completos desde `nodo` hacia la raíz
+    def respaldar(nodo):
+        while nodo is not None and nodo.completo():
+            f = min([hijo.f for hijo in nodo.hijos.values()] + list(nodo.olvidados.values()))
+            if f == nodo.f:
+                return
+            nodo.f = f
+            if nodo.abierto:
+                abrir(nodo)
+            nodo = nodo.padre
+
+    # Olvida la peor hoja abierta distinta de `actual`. Retorna False si no hay ninguna.
+    def olvidar(actual):
+        nonlocal en_memoria
+        apartadas = []
+        result = False
+        while peores:
+            entrada = heapq.heappop(peores)
+            nodo = entrada[4]
+            if not nodo.vivo or not nodo.abierto or entrada[3] != nodo.version or nodo.hijos:
+                continue
+            if nodo is actual or nodo.padre is None:
+                apartadas.append(entrada)
+                continue
+            padre = nodo.padre
+            del padre.hijos[nodo.movimiento]
+            padre.olvidados[nodo.movimiento] = nodo.f
+            nodo.vivo = False
+            cerrar(nodo)
+            en_memoria -= 1
+            if metricas is not None:
+                metricas.olvidados += 1
+            # El padre vuelve a estar abierto (y, si quedó sin hijos, es una hoja candidata)
+            abrir(padre)
+            result = True
+            break
+        for entrada in apartadas:
+            heapq.heappush(peores, entrada)
+        return result
+
+    h, aux = heuristica.inicial(start_code)
+    raiz = _Nodo(start_code, 0, h, h, aux, None, -2, 0)
+    abrir(raiz)
+    maximo_en_memoria = 1
+    while True:
+        # Mejor hoja abierta (la entrada queda en el heap: el nodo puede seguir abierto)
+        while mejores:
+            entrada = mejores[0]
+            nodo = entrada[4]
+            if nodo.vivo and nodo.abierto and entrada[3] == nodo.version:
+                break
+            heapq.heappop(mejores)
+        if not mejores or mejores[0][0] == INFINITO:
+            # No hay camino a la meta que quepa en `limite` nodos
+            break
+        actual = mejores[0][4]
+        nodos_expandidos += 1
+        if metricas is not None:
+            metricas.expansion(abiertos)
+        if actual.code == goal_code:
+            path = []
+            nodo = actual
+            while nodo is not None:
+                path.append(nodo.code)
+                nodo = nodo.padre
+            path.reverse()
+            if metricas is not None:
+                metricas.cerrados(maximo_en_memoria)
+            return path, nodos_expandidos
+        if actual.sucesores is None:
+            # Las direcciones opuestas difieren sólo en el último bit (ver ida_star)
+            actual.sucesores = [(movimiento, code) for movimiento, code in sucesores(actual.code)
+                                if movimiento != actual.movimiento ^ 1]
+            if not actual.sucesores:
+                actual.f = INFINITO
+                abrir(actual)
+                continue
+
+        # Primero los sucesores nunca generados; después el olvidado de menor f
+        pendientes = [(movimiento, code) for movimiento, code in actual.sucesores
+                      if movimiento not in actual.hijos and movimiento not in actual.olvidados]
+        if pendientes:
+            movimiento, code = pendientes[0]
+            olvidado = None
+        else:
+            movimiento = min(actual.olvidados, key=actual.olvidados.get)
+            code = next(c for m, c in actual.sucesores if m == movimiento)
+            olvidado = actual.olvidados.pop(movimiento)
+            if metricas is not None:
+                metricas.regenerados += 1
+
+        if en_memoria >= limite and not olvidar(actual):
+            break
+        zero = actual.code & mascara
+        destino = code & mascara
+        h, aux = mover(actual.h, actual.aux, ficha(actual.code, destino), zero, destino, code)
+        g = actual.g + 1
+        profundidad = actual.profundidad + 1
+        if code != goal_code and profundidad >= limite - 1:
+            f = INFINITO
+        else:
+            # El f de un hijo nunca es menor que el del padre (pathmax)
+            f = max(actual.f, g + h)
+        if olvidado is not None:
+            f = max(f, olvidado)
+        hijo = _Nodo(code, g, h, f, aux, actual, movimiento, profundidad)
+        actual.hijos[movimiento] = hijo
+        en_memoria += 1
+        if en_memoria > maximo_en_memoria:
+            maximo_en_memoria = en_memoria
+        abrir(hijo)
+        if actual.completo():
+            # Con todos los hijos en memoria el nodo deja de estar abierto
+            if not actual.olvidados:
+                cerrar(actual)
+            respaldar(actual)
+
+    if metricas is not None:
+        metricas.cerrados(maximo_en_memoria)
+    return None, nodos_expandidos
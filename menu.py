@@ -1,19 +1,18 @@
 # ---------- Librerías ----------
-import pygame
-import subprocess
-import sys
-import os
-import threading
-import json
-import random
-
-# ---------- Inicialización de Pygame y configuración de la ventana ----------
-pygame.init()
-
-# Dimensiones de la ventana del menú
-width, height = 500, 400
-screen = pygame.display.set_mode((width, height))
-pygame.display.set_caption("Menu - Puzzle 8")
+# pygame se importa recién al abrir la ventana (como en Agente.py y comparacion.py),
+# así importar este módulo no carga pygame
+import Agente
+import comparacion
+import render
+from cache_soluciones import CacheSoluciones, RUTA_POR_DEFECTO
+from heuristicas import REGISTRO
+from resolubilidad import es_resoluble, estado_resoluble_aleatorio
+
+# ---------- Configuración de la ventana ----------
+# Dimensiones de la ventana del menú. La ventana se abre recién en main(), así
+# importar este módulo no inicia pygame ni abre una pantalla.
+width, height = 500, 540
+screen = None
 
 # ---------- Definición de colores ----------
 background_color = (240, 240, 240)   # Color de fondo
@@ -22,52 +21,53 @@ border_color = (100, 100, 100)       # Color del borde de los botones
 text_color = (0, 0, 0)               # Color del texto
 apple_green = (140, 220, 100)        # Color decorativo (verde manzana)
 
-# ---------- Fuente para los textos ----------
-font = pygame.font.SysFont(None, 24)
+# ---------- Fuente para los textos (se crea al abrir la ventana) ----------
+font = None
+
+# ---------- Inicializa pygame y abre (o restaura) la ventana del menú ----------
+def abrir_ventana():
+    global screen, font
+    import pygame
+    pygame.init()
+    screen = pygame.display.set_mode((width, height))
+    pygame.display.set_caption("Menu - Puzzle 8")
+    if font is None:
+        font = pygame.font.SysFont(None, 24)
 
 # ---------- Definición de los botones ----------
-bfs_button_rect = pygame.Rect((width // 2 - 150, height // 2 - 90, 300, 50))
-a_star_button_rect = pygame.Rect((width // 2 - 150, height // 2 - 20, 300, 50))
-both_button_rect = pygame.Rect((width // 2 - 150, height // 2 + 50, 300, 50))
+# Rectángulos de los botones del menú, en orden: BFS, BFS bidireccional, A*, IDA*,
+# comparación y heurística
+def botones_menu():
+    import pygame
+    return tuple(pygame.Rect((width // 2 - 150, height // 2 + desplazamiento, 300, 50))
+                 for desplazamiento in (-160, -95, -30, 35, 100, 165))
+
+# Heurísticas disponibles para A* e IDA* (el botón las recorre en orden)
+heuristicas = list(REGISTRO)
 
-# ---------- Dibuja un botón con el texto especificado en la pantalla ---------- 
+# ---------- Dibuja un botón con el texto especificado en la pantalla (superficie en la caché de render.py) ---------- 
 def draw_button(rect, text):
-    pygame.draw.rect(screen, button_color, rect, border_radius=10)
-    pygame.draw.rect(screen, border_color, rect, 2, border_radius=10)
-    label = font.render(text, True, text_color)
-    label_rect = label.get_rect(center=rect.center)
-    screen.blit(label, label_rect)
+    screen.blit(render.boton(font, text, rect.size, 10, button_color, border_color, text_color), rect)
 
-# ---------- Genera un estado aleatorio resoluble para el puzzle 8 ---------- 
+# ---------- Genera un estado aleatorio resoluble para el puzzle 8 (uniforme, sin reintentos) ---------- 
 def generar_estado_resoluble():
-    nums = list(range(9))
-    while True:
-        random.shuffle(nums)
-        state = [nums[i:i + 3] for i in range(0, 9, 3)]
-        if is_solvable(state):
-            return state
-
-# ---------- Guarda el estado inicial en un archivo JSON para ser usado por ambos agentes ----------
-def guardar_estado_inicial(estado):
-    with open("estado_inicial.json", "w") as f:
-        json.dump(estado, f)
-
-# ---------- Carga el estado inicial desde un archivo JSON ----------
-def cargar_estado_inicial():
+    return estado_resoluble_aleatorio(3)
+
+# ---------- Juega con el agente especificado en esta misma ventana. La solución se pide al servicio
+#    local (servicio.py) si está corriendo; si no, se resuelve aquí mismo. Al terminar se restaura el menú ----------
+def jugar(nombre, estado, heuristica=None):
+    cache = CacheSoluciones(ruta=RUTA_POR_DEFECTO)
     try:
-        with open("estado_inicial.json", "r") as f:
-            estado = json.load(f)
-            return estado
-    except Exception:
-        return None
+        Agente.ejecutar_interactivo(nombre, estado, heuristica, cache, usar_servicio=True, cerrar=False)
+    finally:
+        cache.cerrar()
+    abrir_ventana()
 
-# ---------- Ejecuta el archivo Agente.py con el agente especificado.
-#    Si usar_archivo es True, se pasa el argumento --archivo para que ambos agentes usen el mismo estado inicial ----------
-def ejecutar_agente(nombre, usar_archivo=False):
-    cmd = [sys.executable, "Agente.py", nombre]
-    if usar_archivo:
-        cmd.append("--archivo")
-    subprocess.run(cmd)
+# ---------- Compara varios agentes con el mismo tablero en esta misma ventana (ver comparacion.py):
+#    el tablero se pasa en memoria y las búsquedas corren en paralelo, en procesos aparte ----------
+def comparar(estado, heuristica=None):
+    comparacion.ejecutar_comparacion(comparacion.AGENTES_POR_DEFECTO, estado, heuristica, cerrar=False)
+    abrir_ventana()
 
 # ---------- Función para seleccionar el estado inicial del juego ----------
 def seleccionar_estado():
@@ -98,8 +98,10 @@ def seleccionar_estado():
     else:
         return None
 
-# ---------- Función para ingresar la matriz manualmente usando Pygame ----------
+# ---------- Función para ingresar la matriz manualmente usando Pygame. Sólo se redibuja
+#    cuando llega un evento; mientras tanto la ventana espera sin consumir CPU ----------
 def ingresar_matriz_pygame():
+    import pygame
     matriz = [[None for _ in range(3)] for _ in range(3)]
     tile_size = 80
     offset_x = (width - tile_size * 3) // 2
@@ -114,25 +116,20 @@ def ingresar_matriz_pygame():
         # Dibuja el tablero
         for i in range(3):
             for j in range(3):
-                rect = pygame.Rect(offset_x + j * tile_size, offset_y + i * tile_size, tile_size, tile_size)
-                pygame.draw.rect(screen, (255, 255, 255), rect)
-                pygame.draw.rect(screen, (100, 100, 100), rect, 2)
-                if matriz[i][j] is not None:
-                    num_text = font_big.render(str(matriz[i][j]), True, (0, 0, 0))
-                    text_rect = num_text.get_rect(center=rect.center)
-                    screen.blit(num_text, text_rect)
+                tile = render.casilla(font_big, matriz[i][j], tile_size, (0, 0, 0), borde=(100, 100, 100), radio=0)
+                screen.blit(tile, (offset_x + j * tile_size, offset_y + i * tile_size))
         # Dibuja el selector
         sel_rect = pygame.Rect(offset_x + selected[1] * tile_size, offset_y + selected[0] * tile_size, tile_size, tile_size)
         pygame.draw.rect(screen, (140, 220, 100), sel_rect, 4)
 
         # Mensaje de instrucciones
         msg = "Haz clic o usa flechas. Escribe 0-8. Enter para aceptar."
-        msg_text = font.render(msg, True, (0, 0, 0))
-        screen.blit(msg_text, (offset_x, offset_y + tile_size * 3 + 10))
+        screen.blit(render.texto(font, msg, (0, 0, 0)), (offset_x, offset_y + tile_size * 3 + 10))
 
         pygame.display.flip()
 
-        for event in pygame.event.get():
+        # Espera el próximo evento y atiende también los que llegaron junto con él
+        for event in [pygame.event.wait()] + pygame.event.get():
             if event.type == pygame.QUIT:
                 return None
             elif event.type == pygame.KEYDOWN:
@@ -170,53 +167,45 @@ def ingresar_matriz_pygame():
                             selected = [i, j]
     return None
 
-# Estado meta del puzzle 8 (debe ser igual al de Agente.py)
-goal_state = [[1, 2, 3],
-              [8, 0, 4],
-              [7, 6, 5]]
-
+# ---------- Verifica si un estado del puzzle 8 es resoluble para la meta en espiral (ver resolubilidad.py) ----------
 def is_solvable(state):
-    """
-    Verifica si un estado del puzzle 8 es resoluble para la meta personalizada.
-    """
-    # Encuentra la posición objetivo de cada número
-    goal_positions = {}
-    for i in range(3):
-        for j in range(3):
-            goal_positions[goal_state[i][j]] = (i, j)
-    # Aplana el estado y la meta
-    flat = [num for row in state for num in row]
-    flat_goal = [num for row in goal_state for num in row]
-    # Calcula las inversiones respecto a la meta personalizada
-    inversions = 0
-    for i in range(9):
-        for j in range(i + 1, 9):
-            if flat[i] != 0 and flat[j] != 0:
-                # Compara la posición en la meta
-                pos_i = flat_goal.index(flat[i])
-                pos_j = flat_goal.index(flat[j])
-                if pos_i > pos_j:
-                    inversions += 1
-    return inversions % 2 == 0
-
-# ---------- Función principal del menú. Dibuja la interfaz y gestiona los eventos de los botones ----------
-def main():
-    running = True
-    while running:
-        screen.fill(background_color)
+    return es_resoluble(state)
 
-        # Dibuja un marco decorativo verde manzana alrededor del menú
-        pygame.draw.rect(screen, apple_green, (20, 20, width - 40, height - 40), 8, border_radius=20)
+# ---------- Dibuja el menú completo ----------
+def dibujar_menu(heuristica, botones):
+    import pygame
+    bfs_button_rect, bfs2_button_rect, a_star_button_rect, ida_star_button_rect, both_button_rect, \
+        heuristica_button_rect = botones
+    screen.fill(background_color)
 
-        # Dibuja los botones del menú
-        draw_button(bfs_button_rect, "Jugar con agente no informado (BFS)")
-        draw_button(a_star_button_rect, "Jugar con agente informado (A*)")
-        draw_button(both_button_rect, "Comparar ambos agentes lado a lado")
+    # Dibuja un marco decorativo verde manzana alrededor del menú
+    pygame.draw.rect(screen, apple_green, (20, 20, width - 40, height - 40), 8, border_radius=20)
 
-        pygame.display.flip()
+    # Dibuja los botones del menú
+    draw_button(bfs_button_rect, "Jugar con agente no informado (BFS)")
+    draw_button(bfs2_button_rect, "Jugar con BFS bidireccional")
+    draw_button(a_star_button_rect, "Jugar con agente informado (A*)")
+    draw_button(ida_star_button_rect, "Jugar con agente informado (IDA*)")
+    draw_button(both_button_rect, "Comparar agentes lado a lado")
+    draw_button(heuristica_button_rect, f"Heurística de A* e IDA*: {heuristica}")
+
+    pygame.display.flip()
 
+# ---------- Función principal del menú. Dibuja la interfaz y gestiona los eventos de los botones.
+#    El menú no se anima: se redibuja sólo cuando algo cambia y entre eventos la ventana espera
+#    sin consumir CPU ----------
+def main():
+    import pygame
+    abrir_ventana()
+    botones = botones_menu()
+    bfs_button_rect, bfs2_button_rect, a_star_button_rect, ida_star_button_rect, both_button_rect, \
+        heuristica_button_rect = botones
+    running = True
+    heuristica = heuristicas[0]
+    dibujar_menu(heuristica, botones)
+    while running:
         # Manejo de eventos
-        for event in pygame.event.get():
+        for event in [pygame.event.wait()] + pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
 
@@ -226,23 +215,44 @@ def main():
                     estado = seleccionar_estado()
                     if estado is None:
                         estado = generar_estado_resoluble()
-                    guardar_estado_inicial(estado)
-                    ejecutar_agente("bfs", True)
+                    jugar("bfs", estado)
+                # Ejecuta el agente BFS bidireccional
+                elif bfs2_button_rect.collidepoint(event.pos):
+                    estado = seleccionar_estado()
+                    if estado is None:
+                        estado = generar_estado_resoluble()
+                    jugar("bfs2", estado)
                 # Ejecuta el agente A*
                 elif a_star_button_rect.collidepoint(event.pos):
                     estado = seleccionar_estado()
                     if estado is None:
                         estado = generar_estado_resoluble()
-                    guardar_estado_inicial(estado)
-                    ejecutar_agente("a*", True)
-                # Ejecuta ambos agentes en paralelo con el mismo estado inicial
+                    jugar("a*", estado, heuristica)
+                # Ejecuta el agente IDA*
+                elif ida_star_button_rect.collidepoint(event.pos):
+                    estado = seleccionar_estado()
+                    if estado is None:
+                        estado = generar_estado_resoluble()
+                    jugar("ida*", estado, heuristica)
+                # Compara BFS, A*, IDA* y la tabla en paralelo con el mismo estado inicial (sin
+                # caché, para que todos busquen y las estadísticas sean comparables)
                 elif both_button_rect.collidepoint(event.pos):
                     estado = seleccionar_estado()
                     if estado is None:
                         estado = generar_estado_resoluble()
-                    guardar_estado_inicial(estado)
-                    threading.Thread(target=ejecutar_agente, args=("bfs", True)).start()
-                    threading.Thread(target=ejecutar_agente, args=("a*", True)).start()
+                    comparar(estado, heuristica)
+                # Cambia la heurística que usan A* e IDA*
+                elif heuristica_button_rect.collidepoint(event.pos):
+                    heuristica = heuristicas[(heuristicas.index(heuristica) + 1) % len(heuristicas)]
+                    draw_button(heuristica_button_rect, f"Heurística de A* e IDA*: {heuristica}")
+                    pygame.display.update(heuristica_button_rect)
+                    continue
+                else:
+                    continue
+                # Se volvió de una partida (la ventana se reabrió) o de los diálogos: se redibuja todo
+                dibujar_menu(heuristica, botones)
+            elif event.type in (pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE):
+                dibujar_menu(heuristica, botones)
 
     pygame.quit()
 
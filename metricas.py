@@ -0,0 +1,178 @@
+# ---------- Métricas de búsqueda ----------
+# Los agentes de solucionador.py aceptan un objeto Metricas opcional que
+# observa la búsqueda. Sin él, la búsqueda sólo paga una comparación con None
+# por nodo expandido: los contadores por sucesor y los tiempos por fase se
+# obtienen envolviendo, una sola vez al empezar, las funciones que usa el bucle
+# (generación de sucesores, heurística y tabla de visitados o de costos), así
+# el bucle sin métricas queda exactamente igual.
+#
+# Contadores:
+#   expandidos       nodos expandidos
+#   generados        sucesores generados (incluidos los que se descartan)
+#   duplicados       sucesores descartados por estar ya visitados (o sin mejorar su costo g)
+#   obsoletos        entradas del heap de A* con un costo g ya superado
+#   reaperturas      estados ya vistos a los que A* les encontró un costo g menor
+#   olvidados        nodos que SMA* descartó por falta de memoria
+#   regenerados      nodos olvidados que SMA* volvió a generar
+#   consultas        lecturas de la tabla de distancias del agente 'tabla' (que no
+#                    expande ni genera nodos)
+#   frontera_maxima  tamaño máximo de la frontera (la cola, el heap o el camino de IDA*)
+#   cerrados_maximo  tamaño máximo de la tabla de visitados o de costos
+#   desbalance_maximo  en HDA*, expansiones del trabajador más ocupado sobre el
+#                    promedio (1 = reparto perfecto; 0 en los demás agentes). Las
+#                    expansiones de cada trabajador quedan en metricas.cargas.
+# Con fases=True también se acumula el tiempo de cada fase (heurística,
+# generación de sucesores y consultas a la tabla de visitados), a costa de una
+# medición por llamada. Con `muestreo` se llama muestreo(metricas) cada `cada`
+# nodos expandidos, por ejemplo para mostrar el progreso (el tamaño actual de la
+# frontera queda en metricas.frontera). Si muestreo lanza BusquedaCancelada, la
+# búsqueda se interrumpe y la excepción llega a quien llamó al agente. Los
+# agentes que no expanden de a un nodo (por capas, en disco o en otros procesos)
+# llaman a revisar() cada tanto para que la cancelación también los detenga.
+import time
+
+from nodos import NO_VISTO
+
+# Fases cuyo tiempo se mide con fases=True
+FASES = ('heuristica', 'sucesores', 'hashing')
+
+
+class BusquedaCancelada(Exception):
+    pass
+
+
+class Metricas:
+    def __init__(self, fases=False, muestreo=None, cada=1000):
+        self.expandidos = 0
+        self.generados = 0
+        self.duplicados = 0
+        self.obsoletos = 0
+        self.reaperturas = 0
+        self.olvidados = 0
+        self.regenerados = 0
+        self.consultas = 0
+        self.frontera_maxima = 0
+        self.cerrados_maximo = 0
+        self.desbalance_maximo = 0
+        self.cargas = []
+        self.frontera = 0
+        self.fases = fases
+        self.tiempos = dict.fromkeys(FASES, 0.0)
+        self.muestreo = muestreo
+        self.cada = cada
+
+    # Registra la expansión de un nodo con la frontera del tamaño indicado
+    def expansion(self, frontera):
+        self.expandidos += 1
+        self.frontera = frontera
+        if frontera > self.frontera_maxima:
+            self.frontera_maxima = frontera
+        if self.muestreo is not None and self.expandidos % self.cada == 0:
+            self.muestreo(self)
+
+    # Registra el tamaño actual de la tabla de visitados o de costos
+    def cerrados(self, tamano):
+        if tamano > self.cerrados_maximo:
+            self.cerrados_maximo = tamano
+
+    # Llama a muestreo sin contar una expansión (punto de cancelación)
+    def revisar(self):
+        if self.muestreo is not None:
+            self.muestreo(self)
+
+    # ---------- Envoltorios de las funciones del bucle de búsqueda ----------
+
+    # Mide el tiempo de `funcion` en la fase indicada (sólo con fases=True)
+    def _cronometrar(self, fase, funcion):
+        if not self.fases:
+            return funcion
+        tiempos = self.tiempos
+        reloj = time.perf_counter
+
+        def cronometrada(*args):
+            inicio = reloj()
+            result = funcion(*args)
+            tiempos[fase] += reloj() - inicio
+            return result
+        return cronometrada
+
+    # Generación de sucesores (tab.sucesores o tab.vecinos): cuenta los generados
+    def sucesores(self, funcion):
+        funcion = self._cronometrar('sucesores', funcion)
+
+        def contada(code):
+            result = funcion(code)
+            self.generados += len(result)
+            return result
+        return contada
+
+    # Actualización incremental de la heurística (heuristica.mover)
+    def heuristica(self, funcion):
+        return self._cronometrar('heuristica', funcion)
+
+    # Alta en la tabla de visitados (visitados.agregar): cuenta los duplicados
+    def visitados(self, funcion):
+        funcion = self._cronometrar('hashing', funcion)
+
+        def contada(code):
+            if funcion(code):
+                return True
+            self.duplicados += 1
+            return False
+        return contada
+
+    # Mejora en la tabla de costos g (costos.mejorar): cuenta los duplicados y las reaperturas
+    def costos(self, tabla):
+        funcion = self._cronometrar('hashing', tabla.mejorar)
+        costo = tabla.costo
+
+        def contada(code, g):
+            anterior = costo(code)
+            if funcion(code, g):
+                if anterior != NO_VISTO:
+                    self.reaperturas += 1
+                return True
+            self.duplicados += 1
+            return False
+        return contada
+
+    # Tabla de distancias (tabla_distancias.abrir_tabla): cuenta cada lectura
+    def tabla_distancias(self, tabla):
+        metricas = self
+
+        class Contada:
+            def __getitem__(self, indice):
+                metricas.consultas += 1
+                return tabla[indice]
+        return Contada()
+
+    # Acumula los valores de otra búsqueda (un diccionario de como_dict, por
+    # ejemplo el que devuelve el servicio local)
+    def sumar(self, valores):
+        for clave, valor in valores.items():
+            if clave.startswith('tiempo_'):
+                self.tiempos[clave[len('tiempo_'):]] += valor
+            elif clave.endswith('_maxima') or clave.endswith('_maximo'):
+                setattr(self, clave, max(getattr(self, clave), valor))
+            else:
+                setattr(self, clave, getattr(self, clave) + valor)
+
+    # Valores como diccionario (para JSON/CSV)
+    def como_dict(self):
+        result = {
+            'expandidos': self.expandidos,
+            'generados': self.generados,
+            'duplicados': self.duplicados,
+            'obsoletos': self.obsoletos,
+            'reaperturas': self.reaperturas,
+            'olvidados': self.olvidados,
+            'regenerados': self.regenerados,
+            'consultas': self.consultas,
+            'frontera_maxima': self.frontera_maxima,
+            'cerrados_maximo': self.cerrados_maximo,
+            'desbalance_maximo': self.desbalance_maximo,
+        }
+        if self.fases:
+            for fase in FASES:
+                result[f"tiempo_{fase}"] = self.tiempos[fase]
+        return result
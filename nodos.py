@@ -0,0 +1,226 @@
+# ---------- Almacén de nodos de búsqueda ----------
+# En lugar de copiar el camino completo en cada entrada de la cola (memoria
+# O(nodos x profundidad)), cada nodo guarda sólo el índice de su padre y el
+# movimiento que lo generó. El camino se reconstruye una única vez al llegar
+# a la meta, recorriendo los padres y repitiendo los movimientos desde el inicio.
+import heapq
+from array import array
+
+from codificacion import tablero
+from permutaciones import rank, nuevo_bitmap, NUM_ESTADOS
+
+# Marca de "estado no visto" en las tablas de costos g. Las búsquedas con peso
+# (ara_star) pueden encontrar caminos mucho más largos que los 31 movimientos de
+# la peor solución óptima del puzzle 8, pero nunca más largos que la cantidad de estados.
+NO_VISTO = 2 ** 32 - 1
+
+
+class AlmacenNodos:
+    def __init__(self, tab=None):
+        self.tablero = tab or tablero(3)
+        # Arreglos compactos: 4 bytes por padre y 1 byte por movimiento
+        self.padres = array('i')
+        self.movimientos = array('b')
+
+    def __len__(self):
+        return len(self.padres)
+
+    # Registra un nodo nuevo y retorna su índice. La raíz usa padre = -1.
+    def agregar(self, padre, movimiento):
+        self.padres.append(padre)
+        self.movimientos.append(movimiento)
+        return len(self.padres) - 1
+
+    # Lista de movimientos desde la raíz hasta el nodo `indice`
+    def camino_movimientos(self, indice):
+        result = []
+        while self.padres[indice] != -1:
+            result.append(self.movimientos[indice])
+            indice = self.padres[indice]
+        result.reverse()
+        return result
+
+    # Lista de estados codificados desde el estado inicial hasta el nodo `indice`
+    def reconstruir(self, start_code, indice):
+        path = [start_code]
+        for movimiento in self.camino_movimientos(indice):
+            path.append(self.tablero.mover(path[-1], movimiento))
+        return path
+
+
+# ---------- Conjuntos de visitados y tablas de costos ----------
+# En el puzzle 8 se indexan por el número de estado (permutaciones.py): un
+# bitmap para BFS y un arreglo de enteros de 4 bytes para los costos g de A*. En tableros
+# mayores el espacio de estados no cabe en un arreglo y se usan set/dict.
+
+class VisitadosPuzzle8:
+    def __init__(self):
+        self.bitmap = nuevo_bitmap()
+
+    # Marca el estado y retorna True si no estaba visitado
+    def agregar(self, code):
+        r = rank(code)
+        bit = 1 << (r & 7)
+        if self.bitmap[r >> 3] & bit:
+            return False
+        self.bitmap[r >> 3] |= bit
+        return True
+
+
+class VisitadosGenerico:
+    def __init__(self):
+        self.estados = set()
+
+    def __len__(self):
+        return len(self.estados)
+
+    def agregar(self, code):
+        if code in self.estados:
+            return False
+        self.estados.add(code)
+        return True
+
+
+class CostosPuzzle8:
+    def __init__(self):
+        self.costos = array('I', [NO_VISTO]) * NUM_ESTADOS
+
+    # Cantidad de estados con costo conocido (recorre el arreglo completo)
+    def __len__(self):
+        return NUM_ESTADOS - self.costos.count(NO_VISTO)
+
+    # Costo g conocido del estado, o NO_VISTO
+    def costo(self, code):
+        return self.costos[rank(code)]
+
+    # Registra el costo g si mejora al conocido y retorna True en ese caso
+    def mejorar(self, code, g):
+        r = rank(code)
+        if g < self.costos[r]:
+            self.costos[r] = g
+            return True
+        return False
+
+
+class CostosGenerico:
+    def __init__(self):
+        self.costos = {}
+
+    def __len__(self):
+        return len(self.costos)
+
+    def costo(self, code):
+        return self.costos.get(code, NO_VISTO)
+
+    def mejorar(self, code, g):
+        anterior = self.costos.get(code)
+        if anterior is None or g < anterior:
+            self.costos[code] = g
+            return True
+        return False
+
+
+# Estructura de visitados adecuada al tamaño del tablero
+def nuevos_visitados(tab):
+    return VisitadosPuzzle8() if tab.n == 3 else VisitadosGenerico()
+
+# Tabla de costos g adecuada al tamaño del tablero
+def nuevos_costos(tab):
+    return CostosPuzzle8() if tab.n == 3 else CostosGenerico()
+
+
+# ---------- Listas de abiertos de A* ----------
+# Los costos f y g son enteros pequeños (f <= 80 en el puzzle 15), así que en
+# lugar de un heap se puede usar un arreglo de cubetas indexado por f: agregar y
+# sacar cuestan O(1) amortizado y nunca se comparan tuplas. Dentro de la cubeta
+# de menor f, el desempate decide qué nodo sale primero:
+#   'g'     el de mayor g (el más cercano a la meta según la heurística) y, entre
+#           iguales, el último agregado. Es el que menos expande en la última capa de f.
+#   'lifo'  el último agregado
+#   'heap'  el de menor g, con heapq (el orden que usaba a_star antes de las cubetas)
+# Las entradas son tuplas que empiezan con (f, g, ...); sacar() devuelve la entrada tal cual.
+DESEMPATES = ('g', 'lifo', 'heap')
+
+
+class ColaCubetas:
+    def __init__(self, desempate='g'):
+        self.por_g = desempate == 'g'
+        # Por f: una pila (lifo) o una lista de pilas indexada por g
+        self.cubetas = []
+        # Por f: mayor g que puede tener entradas (sólo con desempate 'g')
+        self.maximos = []
+        self.minimo = 0
+        self.tamano = 0
+
+    def __len__(self):
+        return self.tamano
+
+    def agregar(self, f, g, entrada):
+        cubetas = self.cubetas
+        while len(cubetas) <= f:
+            cubetas.append([])
+            self.maximos.append(-1)
+        if self.por_g:
+            cubeta = cubetas[f]
+            while len(cubeta) <= g:
+                cubeta.append([])
+            cubeta[g].append(entrada)
+            if g > self.maximos[f]:
+                self.maximos[f] = g
+        else:
+            cubetas[f].append(entrada)
+        # Con una heurística inconsistente f puede bajar
+        if f < self.minimo:
+            self.minimo = f
+        self.tamano += 1
+
+    # f de la próxima entrada que saldrá (la cola no debe estar vacía). Deja `minimo` (y, con
+    # desempate 'g', el mayor g de esa cubeta) apuntando a ella.
+    def menor_f(self):
+        cubetas = self.cubetas
+        f = self.minimo
+        if self.por_g:
+            maximos = self.maximos
+            while True:
+                cubeta = cubetas[f]
+                g = maximos[f]
+                while g >= 0 and not cubeta[g]:
+                    g -= 1
+                maximos[f] = g
+                if g >= 0:
+                    break
+                f += 1
+        else:
+            while not cubetas[f]:
+                f += 1
+        self.minimo = f
+        return f
+
+    # Saca la entrada de menor f según el desempate (la cola no debe estar vacía)
+    def sacar(self):
+        f = self.menor_f()
+        self.tamano -= 1
+        if self.por_g:
+            return self.cubetas[f][self.maximos[f]].pop()
+        return self.cubetas[f].pop()
+
+
+class ColaHeap:
+    def __init__(self):
+        self.heap = []
+
+    def __len__(self):
+        return len(self.heap)
+
+    def agregar(self, f, g, entrada):
+        heapq.heappush(self.heap, entrada)
+
+    def sacar(self):
+        return heapq.heappop(self.heap)
+
+
+# Lista de abiertos con el desempate indicado (ver DESEMPATES)
+def nueva_cola(desempate='g'):
+    if desempate not in DESEMPATES:
+        raise ValueError(f"Desempate desconocido: {desempate}. Opciones: {', '.join(DESEMPATES)}")
+    return ColaHeap() if desempate == 'heap' else ColaCubetas(desempate)
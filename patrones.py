@@ -0,0 +1,183 @@
+# ---------- Bases de datos de patrones aditivas ----------
+# Las fichas se reparten en grupos disjuntos (por ejemplo 5-5-5 en el 4x4).
+# Para cada grupo se calcula, con una búsqueda hacia atrás desde la meta, el
+# número mínimo de movimientos de fichas del grupo necesarios para llevarlas a
+# su sitio (los movimientos de las demás fichas cuestan 0). Como cada
+# movimiento mueve una sola ficha, la suma de los grupos sigue siendo admisible.
+#
+# Cada tabla se indexa por las posiciones de las fichas del grupo empaquetadas
+# en BITS bits cada una, se guarda en disco (1 byte por entrada) y se abre con
+# mmap la primera vez que se necesita.
+#
+# Uso (paso de construcción): python patrones.py [n]
+import mmap
+import os
+import sys
+import time
+
+from codificacion import meta_espiral, tablero
+
+# Valor de las entradas que no corresponden a ninguna colocación del grupo
+DESCONOCIDA = 255
+
+# Directorio donde se guardan las tablas (junto a este archivo)
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+
+# Reparto de fichas por defecto: grupos de fichas consecutivas, que en la meta
+# en espiral ocupan zonas contiguas del tablero
+def particion_por_defecto(n):
+    fichas = list(range(1, n * n))
+    if n == 3:
+        tam = 4
+    elif n == 4:
+        tam = 5
+    else:
+        tam = 4
+    return [fichas[i:i + tam] for i in range(0, len(fichas), tam)]
+
+# Ruta del archivo de la tabla de un grupo
+def ruta_patron(tab, goal_code, fichas):
+    nombre = "-".join(str(value) for value in fichas)
+    return os.path.join(DIRECTORIO, f"patron_{tab.n}x{tab.n}_{goal_code:x}_{nombre}.bin")
+
+# Búsqueda 0-1 por capas sobre los estados abstractos (posición del vacío y de
+# las fichas del grupo). Retorna la tabla ya minimizada sobre la posición del vacío.
+def construir_patron(tab, goal_code, fichas):
+    bits = tab.bits
+    mascara = tab.mascara
+    desplazamientos = [bits * (i + 1) for i in range(len(fichas))]
+    # Máscara de bits de las casillas vecinas de cada casilla
+    adyacentes = [0] * tab.celdas
+    for pos, opciones in enumerate(tab.movimientos):
+        for _, destino in opciones:
+            adyacentes[pos] |= 1 << destino
+
+    goal_positions = {}
+    for pos in range(tab.celdas):
+        goal_positions[tab.ficha(goal_code, pos)] = pos
+    inicio = tab.posicion_vacio(goal_code)
+    for value, shift in zip(fichas, desplazamientos):
+        inicio |= goal_positions[value] << shift
+
+    distancias = bytearray([DESCONOCIDA]) * (1 << (bits * (len(fichas) + 1)))
+    tabla = bytearray([DESCONOCIDA]) * (1 << (bits * len(fichas)))
+    distancias[inicio] = 0
+    tabla[inicio >> bits] = 0
+    capa = [inicio]
+    costo = 0
+    while capa:
+        # Cierre por movimientos gratuitos: el vacío pasa por casillas libres del grupo
+        pila = list(capa)
+        while pila:
+            s = pila.pop()
+            zero = s & mascara
+            ocupadas = 0
+            for shift in desplazamientos:
+                ocupadas |= 1 << ((s >> shift) & mascara)
+            libres = adyacentes[zero] & ~ocupadas
+            for _, destino in tab.movimientos[zero]:
+                if libres >> destino & 1:
+                    ns = s - zero + destino
+                    if distancias[ns] == DESCONOCIDA:
+                        distancias[ns] = costo
+                        capa.append(ns)
+                        pila.append(ns)
+                        if tabla[ns >> bits] == DESCONOCIDA:
+                            tabla[ns >> bits] = costo
+        # Movimientos que cuestan 1: una ficha del grupo entra en el vacío
+        costo += 1
+        siguiente = []
+        for s in capa:
+            zero = s & mascara
+            vecinas = adyacentes[zero]
+            for shift in desplazamientos:
+                pos = (s >> shift) & mascara
+                if vecinas >> pos & 1:
+                    ns = s + ((zero - pos) << shift) - zero + pos
+                    if distancias[ns] == DESCONOCIDA:
+                        distancias[ns] = costo
+                        siguiente.append(ns)
+                        # Se recorre por costo creciente: la primera vez es el mínimo
+                        if tabla[ns >> bits] == DESCONOCIDA:
+                            tabla[ns >> bits] = costo
+        capa = siguiente
+    return tabla
+
+# Abre (con mmap, sólo lectura) la tabla de un grupo; si no existe se construye una vez
+def abrir_patron(tab, goal_code, fichas):
+    ruta = ruta_patron(tab, goal_code, fichas)
+    if not os.path.exists(ruta):
+        tabla = construir_patron(tab, goal_code, fichas)
+        temporal = ruta + ".tmp"
+        with open(temporal, "wb") as f:
+            f.write(tabla)
+        os.replace(temporal, ruta)
+    with open(ruta, "rb") as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+# Heurística de bases de datos de patrones aditivas (misma interfaz que heuristicas.Manhattan)
+# `aux` empaqueta la posición de cada ficha en su grupo, así al mover una ficha
+# sólo hay que corregir su posición y volver a consultar la tabla de su grupo.
+class BasePatrones:
+    nombre = 'patrones'
+    admisible = True
+    descripcion = "Bases de datos de patrones aditivas"
+
+    def __init__(self, tab, goal_code, grupos=None):
+        self.tablero = tab
+        self.goal_code = goal_code
+        self.grupos = grupos or particion_por_defecto(tab.n)
+        self._tablas = None
+        # Para cada ficha: grupo al que pertenece y desplazamiento de su posición en `aux`
+        self.grupo = [0] * tab.celdas
+        self.desplazamiento = [0] * tab.celdas
+        self.bases = []
+        self.mascaras = []
+        base = 0
+        for k, fichas in enumerate(self.grupos):
+            self.bases.append(base)
+            self.mascaras.append((1 << (tab.bits * len(fichas))) - 1)
+            for i, value in enumerate(fichas):
+                self.grupo[value] = k
+                self.desplazamiento[value] = base + tab.bits * i
+            base += tab.bits * len(fichas)
+
+    # Las tablas se cargan (o construyen) recién cuando se usan por primera vez
+    def tablas(self):
+        if self._tablas is None:
+            self._tablas = [abrir_patron(self.tablero, self.goal_code, fichas) for fichas in self.grupos]
+        return self._tablas
+
+    def inicial(self, code):
+        tab = self.tablero
+        aux = 0
+        for pos in range(tab.celdas):
+            value = tab.ficha(code, pos)
+            if value:
+                aux += pos << self.desplazamiento[value]
+        h = 0
+        for tabla, base, mascara in zip(self.tablas(), self.bases, self.mascaras):
+            h += tabla[(aux >> base) & mascara]
+        return h, aux
+
+    def __call__(self, code):
+        return self.inicial(code)[0]
+
+    def mover(self, h, aux, value, zero, destino, hijo):
+        k = self.grupo[value]
+        base = self.bases[k]
+        mascara = self.mascaras[k]
+        tabla = self._tablas[k]
+        nuevo = aux + ((zero - destino) << self.desplazamiento[value])
+        return h - tabla[(aux >> base) & mascara] + tabla[(nuevo >> base) & mascara], nuevo
+
+if __name__ == '__main__':
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    tab = tablero(n)
+    goal_code = tab.encode_state(meta_espiral(n))
+    for fichas in particion_por_defecto(n):
+        inicio = time.perf_counter()
+        tabla = abrir_patron(tab, goal_code, fichas)
+        maxima = max(d for d in tabla[:] if d != DESCONOCIDA)
+        print(f"Grupo {fichas}: {time.perf_counter() - inicio:.1f} s, valor máximo {maxima}")
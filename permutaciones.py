@@ -0,0 +1,123 @@
+# ---------- Ranking perfecto de permutaciones (código de Lehmer) ----------
+# Asigna a cada estado alcanzable del puzzle un número único y denso en
+# [0, NUM_ESTADOS), de modo que los conjuntos de visitados y las tablas de
+# costo puedan ser un bitmap o un arreglo indexado por ese número.
+#
+# rank = posición del vacío * (8! / 2) + (rango de Lehmer de las 8 fichas) / 2
+#
+# En un tablero de ancho impar mover el vacío no cambia la paridad de las
+# inversiones de las fichas, así que todos los estados alcanzables comparten
+# paridad. El último dígito de Lehmer siempre es 0 y el penúltimo queda fijado
+# por esa paridad, por lo que basta dividir el rango entre 2: 9 * 8!/2 = 181.440.
+from array import array
+from itertools import permutations
+from math import factorial
+
+from codificacion import N, BITS, MASCARA, DESPLAZAMIENTOS
+
+FICHAS = N * N - 1
+MITAD = factorial(FICHAS) // 2
+NUM_ESTADOS = N * N * MITAD
+
+# Peso de cada dígito de Lehmer: 7!, 6!, ..., 1!, 0!
+PESOS = tuple(factorial(FICHAS - 1 - i) for i in range(FICHAS))
+
+# Versión directa (un bucle por casilla) del rango de un estado codificado.
+# Sirve como referencia para comprobar la versión con tablas.
+def rank_lento(code):
+    usados = 0
+    lehmer = 0
+    i = 0
+    for shift in DESPLAZAMIENTOS:
+        value = (code >> shift) & MASCARA
+        if value:
+            # Dígito de Lehmer: fichas menores que aún no han aparecido
+            lehmer += (value - 1 - (usados & ((1 << value) - 1)).bit_count()) * PESOS[i]
+            usados |= 1 << value
+            i += 1
+    return (code & MASCARA) * MITAD + (lehmer >> 1)
+
+# ---------- Tablas para el rango rápido ----------
+# Al quitar el nibble del vacío quedan las 8 fichas en 32 bits. El aporte de
+# las 4 primeras al código de Lehmer sólo depende de ellas (las que faltan son
+# el resto), y el de las 4 últimas sólo depende de su propio orden, así que el
+# rango se reduce a dos consultas en tablas de 2^16 entradas.
+MITAD_FICHAS = FICHAS // 2
+BITS_MITAD = BITS * (FICHAS - MITAD_FICHAS)
+MASCARA_MITAD = (1 << BITS_MITAD) - 1
+
+def _empaquetar(valores):
+    clave = 0
+    for value in valores:
+        clave = (clave << BITS) | value
+    return clave
+
+def _construir_tablas():
+    alto = array('I', bytes(4 << (BITS * MITAD_FICHAS)))
+    bajo = array('I', bytes(4 << BITS_MITAD))
+    todas = set(range(1, FICHAS + 1))
+    for prefijo in permutations(todas, MITAD_FICHAS):
+        resto = todas.difference(prefijo)
+        lehmer = 0
+        for i, value in enumerate(prefijo):
+            menores = sum(1 for x in resto if x < value) + sum(1 for x in prefijo[i + 1:] if x < value)
+            lehmer += menores * PESOS[i]
+        # Es múltiplo de (FICHAS - MITAD_FICHAS)!, así que se puede dividir aparte
+        alto[_empaquetar(prefijo)] = lehmer >> 1
+    for sufijo in permutations(todas, FICHAS - MITAD_FICHAS):
+        lehmer = 0
+        for i, value in enumerate(sufijo):
+            lehmer += sum(1 for x in sufijo[i + 1:] if x < value) * PESOS[MITAD_FICHAS + i]
+        bajo[_empaquetar(sufijo)] = lehmer >> 1
+    return alto, bajo
+
+TABLA_ALTA, TABLA_BAJA = _construir_tablas()
+
+# Para cada posición del vacío: (desplazamiento de las fichas anteriores,
+# desplazamiento para unirlas con las posteriores, máscara de las posteriores, base)
+_QUITAR_VACIO = tuple(
+    (BITS * (N * N + 1 - z), BITS * (N * N - 1 - z), (1 << (BITS * (N * N - z))) - 1, z * MITAD)
+    for z in range(N * N)
+)
+
+# Número de estado (0 .. NUM_ESTADOS - 1) de un estado codificado
+def rank(code):
+    antes, union, despues, base = _QUITAR_VACIO[code & MASCARA]
+    seq = ((code >> antes) << union) | ((code & despues) >> BITS)
+    return base + TABLA_ALTA[seq >> BITS_MITAD] + TABLA_BAJA[seq & MASCARA_MITAD]
+
+# Paridad (0 ó 1) de las inversiones de las fichas de un estado codificado
+def paridad(code):
+    usados = 0
+    inversiones = 0
+    for shift in DESPLAZAMIENTOS:
+        value = (code >> shift) & MASCARA
+        if value:
+            inversiones += value - 1 - (usados & ((1 << value) - 1)).bit_count()
+            usados |= 1 << value
+    return inversiones & 1
+
+# Estado codificado correspondiente a un número de estado. `paridad_fichas` es la
+# paridad común de los estados alcanzables (la de la meta).
+def unrank(r, paridad_fichas):
+    zero, resto = divmod(r, MITAD)
+    lehmer = resto << 1
+    digitos = []
+    for peso in PESOS:
+        digito, lehmer = divmod(lehmer, peso)
+        digitos.append(digito)
+    # El penúltimo dígito se perdió al dividir entre 2: se recupera por paridad
+    if sum(digitos) & 1 != paridad_fichas:
+        digitos[-2] += 1
+    disponibles = list(range(1, FICHAS + 1))
+    code = zero
+    i = 0
+    for pos, shift in enumerate(DESPLAZAMIENTOS):
+        if pos != zero:
+            code |= disponibles.pop(digitos[i]) << shift
+            i += 1
+    return code
+
+# Bitmap de NUM_ESTADOS bits para marcar estados visitados
+def nuevo_bitmap():
+    return bytearray((NUM_ESTADOS + 7) >> 3)
@@ -0,0 +1,101 @@
+# ---------- Capa de dibujo con caché para las ventanas de pygame ----------
+# Las ventanas (menú, agente, ingreso manual) redibujaban cada cuadro completo y
+# volvían a llamar a font.render para cada número y cada etiqueta. Aquí:
+#   - los textos, las casillas del tablero y los botones se renderizan una vez y
+#     se guardan como superficies listas para copiar
+#   - Regiones redibuja sólo las zonas de la ventana cuyo contenido cambió y
+#     actualiza la pantalla únicamente en esos rectángulos (dirty rects)
+#   - FPS limita los cuadros por segundo de los bucles que animan algo; las
+#     ventanas sin animación esperan eventos con pygame.event.wait
+# pygame se importa dentro de las funciones, como en Agente.py.
+
+# Cuadros por segundo mientras algo se anima o se busca, y en reposo
+FPS = 30
+FPS_REPOSO = 10
+
+# Cantidad máxima de superficies guardadas (al superarla se vacía la caché)
+LIMITE_CACHE = 1024
+
+_superficies = {}
+
+
+def _guardar(clave, superficie):
+    if len(_superficies) >= LIMITE_CACHE:
+        _superficies.clear()
+    _superficies[clave] = superficie
+    return superficie
+
+# Texto renderizado (la fuente es parte de la clave)
+def texto(font, cadena, color):
+    clave = ('texto', font, cadena, color)
+    superficie = _superficies.get(clave)
+    if superficie is None:
+        superficie = _guardar(clave, font.render(cadena, True, color))
+    return superficie
+
+# Botón completo (fondo, borde y etiqueta centrada) del tamaño indicado
+def boton(font, etiqueta, tamano, radio=8, fondo=(180, 180, 180), borde=(100, 100, 100), color=(0, 0, 0)):
+    clave = ('boton', font, etiqueta, tamano, radio, fondo, borde, color)
+    superficie = _superficies.get(clave)
+    if superficie is None:
+        import pygame
+        superficie = pygame.Surface(tamano, pygame.SRCALPHA)
+        rect = superficie.get_rect()
+        pygame.draw.rect(superficie, fondo, rect, border_radius=radio)
+        pygame.draw.rect(superficie, borde, rect, 2, border_radius=radio)
+        label = texto(font, etiqueta, color)
+        superficie.blit(label, label.get_rect(center=rect.center))
+        superficie = _guardar(clave, superficie)
+    return superficie
+
+# Casilla del tablero con su número (valor None: casilla sin número)
+def casilla(font, valor, tamano, color, fondo=(255, 255, 255), borde=(200, 200, 200), radio=12):
+    clave = ('casilla', font, valor, tamano, color, fondo, borde, radio)
+    superficie = _superficies.get(clave)
+    if superficie is None:
+        import pygame
+        superficie = pygame.Surface((tamano, tamano), pygame.SRCALPHA)
+        rect = superficie.get_rect()
+        pygame.draw.rect(superficie, fondo, rect, border_radius=radio)
+        pygame.draw.rect(superficie, borde, rect, 2, border_radius=radio)
+        if valor is not None:
+            numero = texto(font, str(valor), color)
+            superficie.blit(numero, numero.get_rect(center=rect.center))
+        superficie = _guardar(clave, superficie)
+    return superficie
+
+
+# ---------- Regiones sucias ----------
+# Cada zona de la ventana tiene un nombre, un rectángulo y una "firma": un valor
+# comparable con todo lo que determina su contenido. Si la firma no cambió desde
+# el último cuadro, la zona no se vuelve a dibujar.
+class Regiones:
+    def __init__(self, screen, fondo):
+        self.screen = screen
+        self.fondo = fondo
+        self.firmas = {}
+        self.sucias = []
+
+    # Dibuja la zona con dibujar() sobre el fondo si su firma cambió
+    def dibujar(self, nombre, rect, firma, dibujar):
+        if nombre in self.firmas and self.firmas[nombre] == firma:
+            return
+        self.firmas[nombre] = firma
+        self.screen.fill(self.fondo, rect)
+        dibujar()
+        self.sucias.append(rect)
+
+    # Olvida las firmas: el próximo cuadro dibuja todo (por ejemplo, al reabrir la ventana)
+    def invalidar(self):
+        self.firmas.clear()
+        self.screen.fill(self.fondo)
+        self.sucias.append(self.screen.get_rect())
+
+    # Copia a la pantalla sólo las zonas dibujadas. Retorna True si hubo alguna.
+    def actualizar(self):
+        if not self.sucias:
+            return False
+        import pygame
+        pygame.display.update(self.sucias)
+        self.sucias = []
+        return True
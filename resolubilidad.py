@@ -0,0 +1,71 @@
+# ---------- Resolubilidad de tableros ----------
+# Única comprobación de resolubilidad para todo el proyecto (solucionador, menú,
+# lote y servicio). Un movimiento conserva el invariante de Tablero.invariante:
+# la paridad de las inversiones de las fichas y, en tableros de ancho par,
+# también la de la fila del vacío. Dos tableros del mismo tamaño se alcanzan
+# entre sí si y sólo si tienen el mismo invariante, así que basta una pasada
+# lineal por las fichas, contra cualquier meta.
+#
+# Para generar tableros al azar no hace falta rechazar mezclas: intercambiar
+# dos fichas (no el vacío) cambia la paridad de las inversiones sin mover el
+# vacío, y es una biyección entre los tableros resolubles y los que no lo son.
+# Así una permutación uniforme, corregida con a lo sumo un intercambio, da un
+# tablero resoluble uniforme en O(n²) sin reintentos.
+import random
+
+from codificacion import meta_espiral, tablero
+
+# Invariante de la meta en espiral, por tamaño de tablero
+_invariantes_espiral = {}
+
+
+# Lanza ValueError si la matriz no es un tablero de n x n con los números del 0 al n² - 1
+def validar(state):
+    n = len(state)
+    # Con menos de 2 filas no hay tablero (y la paridad divide por n)
+    if n < 2:
+        raise ValueError("El tablero debe ser de al menos 2 x 2.")
+    if any(len(row) != n for row in state):
+        raise ValueError(f"La matriz debe contener todos los números del 0 al {n * n - 1} sin repetir.")
+    vistos = [False] * (n * n)
+    for row in state:
+        for num in row:
+            if not isinstance(num, int) or not 0 <= num < n * n or vistos[num]:
+                raise ValueError(f"La matriz debe contener todos los números del 0 al {n * n - 1} sin repetir.")
+            vistos[num] = True
+
+# Invariante de la meta (por defecto la espiral del tamaño del tablero)
+def invariante_meta(tab, meta=None):
+    if meta is not None:
+        return tab.invariante(tab.encode_state(meta))
+    result = _invariantes_espiral.get(tab.n)
+    if result is None:
+        result = _invariantes_espiral[tab.n] = tab.invariante(tab.encode_state(meta_espiral(tab.n)))
+    return result
+
+# True si los estados codificados `code` y `goal_code` se alcanzan entre sí (los agentes
+# lo comprueban antes de buscar: sin solución, la búsqueda recorrería medio espacio de estados)
+def alcanzable(tab, code, goal_code):
+    return tab.invariante(code) == tab.invariante(goal_code)
+
+# True si el estado codificado `code` puede llegar a la meta de su tablero
+def codigo_resoluble(tab, code, meta=None):
+    return tab.invariante(code) == invariante_meta(tab, meta)
+
+# True si el tablero (lista de listas) puede llegar a `meta` (por defecto la espiral).
+# Lanza ValueError si la matriz no es válida.
+def es_resoluble(state, meta=None):
+    validar(state)
+    tab = tablero(len(state))
+    return codigo_resoluble(tab, tab.encode_state(state), meta)
+
+# Tablero resoluble de n x n elegido uniformemente entre todos los resolubles
+def estado_resoluble_aleatorio(n=3, meta=None, generador=random):
+    nums = list(range(n * n))
+    generador.shuffle(nums)
+    state = [nums[i:i + n] for i in range(0, n * n, n)]
+    if not es_resoluble(state, meta):
+        # Intercambia dos fichas: entre las tres primeras casillas hay a lo sumo un vacío
+        (i1, j1), (i2, j2) = [divmod(k, n) for k in range(3) if nums[k] != 0][:2]
+        state[i1][j1], state[i2][j2] = state[i2][j2], state[i1][j1]
+    return state
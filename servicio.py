@@ -0,0 +1,323 @@
+# ---------- Servicio local de resolución ----------
+# Un proceso de larga duración que atiende pedidos de resolución, para no pagar
+# en cada partida el arranque del intérprete, la importación de los módulos y la
+# apertura de tablas y bases de patrones. Los solucionadores corren en procesos
+# trabajadores que se crean una vez y conservan sus tablas y su caché de
+# soluciones entre pedidos.
+#
+# Protocolo: una línea JSON por mensaje, sobre TCP local o un socket Unix.
+#   {"op": "resolver", "id": 1, "agente": "a*", "estado": [[...]], "heuristica": null, "cache": true,
+#    "metricas": false}
+#       -> {"id": 1, "solucion": [[[...]], ...] | null, "nodos": N, "tiempo": t}
+#          (con "metricas": true también {"metricas": {...}}, ver metricas.py)
+#       -> {"id": 1, "error": "..."}          (pedido inválido)
+#       -> {"id": 1, "cancelado": true}       (cancelado antes de terminar)
+#   {"op": "cancelar", "id": 1}               (sin respuesta propia: responde el pedido cancelado)
+#   {"op": "estado"} -> {"procesos": N, "en_curso": k, "pendientes": m}
+# Los pedidos de una misma conexión se atienden en paralelo y las respuestas
+# llegan a medida que terminan (se asocian por id). Cancelar un pedido que ya
+# se está resolviendo detiene su proceso trabajador, que se reemplaza por otro.
+#
+# Uso: python servicio.py [--puerto P | --socket RUTA] [--procesos N] [--cache]
+import asyncio
+import json
+import multiprocessing
+import os
+import socket
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from cache_soluciones import CacheSoluciones, RUTA_POR_DEFECTO
+
+# Dirección por defecto: TCP en la interfaz local
+HOST = '127.0.0.1'
+PUERTO = 8765
+DIRECCION_POR_DEFECTO = (HOST, PUERTO)
+
+# Límite de una línea del protocolo (las soluciones de tableros grandes son largas)
+LIMITE_LINEA = 1 << 22
+
+
+# ---------- Procesos trabajadores ----------
+
+# Bucle de un proceso trabajador: recibe pedidos por `conexion` y responde cada uno
+def _bucle_trabajador(conexion, ruta_cache):
+    import solucionador
+    from metricas import Metricas
+    cache = CacheSoluciones(ruta=ruta_cache)
+    # La tabla de distancias se abre una sola vez por proceso
+    solucionador.abrir_tabla(solucionador.GOAL_CODE)
+    while True:
+        try:
+            pedido = conexion.recv()
+        except EOFError:
+            return
+        metricas = Metricas() if pedido.get('metricas') else None
+        conexion.send(_atender_en_trabajador(solucionador, pedido, cache, metricas))
+
+def _atender_en_trabajador(solucionador, pedido, cache, metricas=None):
+    agente = pedido.get('agente', 'bfs')
+    heuristica = pedido.get('heuristica')
+    estado = pedido.get('estado')
+    if not isinstance(agente, str) or agente not in solucionador.AGENTES:
+        return {'error': f"Agente desconocido: {agente}. Opciones: {', '.join(solucionador.AGENTES)}"}
+    if agente in solucionador.AGENTES_CON_PROCESOS:
+        return {'error': solucionador.MENSAJE_CON_PROCESOS}
+    if heuristica is not None and (not isinstance(heuristica, str) or heuristica not in solucionador.REGISTRO):
+        return {'error': f"Heurística desconocida: {heuristica}. Opciones: {', '.join(solucionador.REGISTRO)}"}
+    try:
+        if not solucionador.is_solvable(estado):
+            return {'error': "El estado no es resoluble."}
+        solution, nodos_expandidos, tiempo = solucionador.resolver(
+            agente, estado, heuristica, cache if pedido.get('cache', True) else None, metricas)
+    except (TypeError, ValueError) as e:
+        return {'error': str(e) or "Tablero inválido."}
+    except Exception as e:
+        # Cualquier otra falla del agente se informa y el trabajador sigue atendiendo
+        return {'error': f"{type(e).__name__}: {e}"}
+    respuesta = {'solucion': solution, 'nodos': nodos_expandidos, 'tiempo': tiempo}
+    if metricas is not None:
+        respuesta['metricas'] = metricas.como_dict()
+    return respuesta
+
+
+class Trabajador:
+    def __init__(self, ruta_cache=None):
+        self.conexion, extremo = multiprocessing.Pipe()
+        self.proceso = multiprocessing.Process(target=_bucle_trabajador, args=(extremo, ruta_cache), daemon=True)
+        self.proceso.start()
+        # El otro extremo queda sólo en el hijo: si el hijo muere, recv() recibe EOF
+        extremo.close()
+
+    def cerrar(self):
+        if self.proceso.is_alive():
+            self.proceso.kill()
+        self.proceso.join()
+        self.conexion.close()
+
+
+# ---------- Servidor asyncio ----------
+
+class Servicio:
+    def __init__(self, procesos=None, ruta_cache=None):
+        self.procesos = procesos or os.cpu_count() or 1
+        self.ruta_cache = ruta_cache
+        self.libres = asyncio.Queue()
+        for _ in range(self.procesos):
+            self.libres.put_nowait(Trabajador(ruta_cache))
+        # Pedido en curso (tarea de asyncio) -> trabajador que lo resuelve
+        self.ocupados = {}
+        self.cancelados = set()
+        self.pendientes = 0
+        # Hilos que esperan las respuestas de los trabajadores sin bloquear el bucle de eventos
+        self.hilos = ThreadPoolExecutor(max_workers=self.procesos)
+
+    def cerrar(self):
+        while not self.libres.empty():
+            self.libres.get_nowait().cerrar()
+        for trabajador in self.ocupados.values():
+            trabajador.cerrar()
+        self.hilos.shutdown(wait=False)
+
+    # Resuelve un pedido en el primer trabajador libre
+    async def resolver(self, pedido):
+        self.pendientes += 1
+        try:
+            trabajador = await self.libres.get()
+        finally:
+            self.pendientes -= 1
+        tarea = asyncio.current_task()
+        self.ocupados[tarea] = trabajador
+        termino = False
+        try:
+            trabajador.conexion.send(pedido)
+            return await asyncio.get_running_loop().run_in_executor(self.hilos, trabajador.conexion.recv)
+        except (EOFError, OSError):
+            # El trabajador terminó: se lo detuvo para cancelar el pedido o falló
+            termino = True
+            if tarea in self.cancelados:
+                raise asyncio.CancelledError
+            return {'error': "El proceso trabajador terminó inesperadamente."}
+        finally:
+            # También se reemplaza si se lo detuvo justo después de responder (una
+            # cancelación que llegó tarde) o si murió por otra causa
+            if termino or tarea in self.cancelados or not trabajador.proceso.is_alive():
+                trabajador.cerrar()
+                trabajador = Trabajador(self.ruta_cache)
+            self.cancelados.discard(tarea)
+            del self.ocupados[tarea]
+            self.libres.put_nowait(trabajador)
+
+    # Cancela un pedido: si todavía espera un trabajador se cancela la tarea; si
+    # ya se está resolviendo se detiene su trabajador. Una tarea cancelada antes de
+    # empezar no llega a responder: en ese caso responde atender.
+    def cancelar(self, tarea):
+        trabajador = self.ocupados.get(tarea)
+        if trabajador is None:
+            tarea.cancel()
+        else:
+            self.cancelados.add(tarea)
+            trabajador.proceso.kill()
+
+    # Atiende una conexión: cada pedido "resolver" es una tarea independiente
+    async def atender(self, reader, writer):
+        tareas = {}
+
+        async def responder(mensaje):
+            writer.write(json.dumps(mensaje).encode() + b'\n')
+            await writer.drain()
+
+        async def atender_pedido(identificador, pedido):
+            try:
+                respuesta = await self.resolver(pedido)
+            except asyncio.CancelledError:
+                if tareas.get(identificador) is not asyncio.current_task():
+                    # Ya se respondió al cancelarlo
+                    return
+                respuesta = {'cancelado': True}
+            respuesta['id'] = identificador
+            tareas.pop(identificador, None)
+            try:
+                await responder(respuesta)
+            except (ConnectionError, OSError):
+                pass
+
+        try:
+            while True:
+                linea = await reader.readline()
+                if not linea:
+                    break
+                try:
+                    pedido = json.loads(linea)
+                except json.JSONDecodeError:
+                    await responder({'error': "Mensaje JSON inválido."})
+                    continue
+                if not isinstance(pedido, dict):
+                    await responder({'error': "El mensaje debe ser un objeto JSON."})
+                    continue
+                op = pedido.get('op')
+                identificador = pedido.get('id')
+                if isinstance(identificador, (list, dict)):
+                    await responder({'error': "El id debe ser un número o un texto."})
+                    continue
+                if op == 'resolver':
+                    if identificador in tareas:
+                        await responder({'id': identificador, 'error': "Ya hay un pedido en curso con ese id."})
+                    else:
+                        tareas[identificador] = asyncio.create_task(atender_pedido(identificador, pedido))
+                elif op == 'cancelar':
+                    tarea = tareas.get(identificador)
+                    if tarea is None:
+                        pass
+                    elif tarea in self.ocupados:
+                        self.cancelar(tarea)
+                    else:
+                        # Todavía espera un trabajador (o ni empezó): se responde aquí
+                        del tareas[identificador]
+                        self.cancelar(tarea)
+                        await responder({'id': identificador, 'cancelado': True})
+                elif op == 'estado':
+                    await responder({'procesos': self.procesos, 'en_curso': len(self.ocupados),
+                                     'pendientes': self.pendientes})
+                else:
+                    await responder({'id': identificador, 'error': f"Operación desconocida: {op}"})
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            # Si el cliente se desconecta, sus pedidos ya no tienen a quién responder
+            for tarea in list(tareas.values()):
+                self.cancelar(tarea)
+            writer.close()
+
+# Inicia el servicio en `direccion` ((host, puerto) o ruta de un socket Unix) y atiende hasta que se interrumpa
+async def servir(direccion=DIRECCION_POR_DEFECTO, procesos=None, ruta_cache=None):
+    servicio = Servicio(procesos, ruta_cache)
+    if isinstance(direccion, str):
+        servidor = await asyncio.start_unix_server(servicio.atender, path=direccion, limit=LIMITE_LINEA)
+    else:
+        servidor = await asyncio.start_server(servicio.atender, *direccion, limit=LIMITE_LINEA)
+    try:
+        async with servidor:
+            print(f"Servicio escuchando en {direccion} con {servicio.procesos} procesos", file=sys.stderr)
+            await servidor.serve_forever()
+    finally:
+        servicio.cerrar()
+
+
+# ---------- Cliente ----------
+
+# Abre una conexión con el servicio. Lanza OSError (por ejemplo ConnectionRefusedError) si no está corriendo.
+def conectar(direccion=DIRECCION_POR_DEFECTO, timeout=None):
+    if isinstance(direccion, str):
+        conexion = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        conexion.settimeout(timeout)
+        try:
+            conexion.connect(direccion)
+        except OSError:
+            conexion.close()
+            raise
+        return conexion
+    return socket.create_connection(direccion, timeout=timeout)
+
+# Intervalo con el que se revisa `cancelado` mientras se espera la respuesta
+INTERVALO_CANCELACION = 0.1
+
+# Resuelve un estado con el servicio. Retorna (solución, nodos expandidos, tiempo)
+# como los agentes de solucionador.py; lanza OSError si el servicio no está disponible
+# y ValueError si rechaza el pedido. Con `metricas` se acumulan en él las del servicio.
+# `cancelado` es un threading.Event opcional: si se activa mientras se espera la
+# respuesta, se cancela el pedido en el servicio y se lanza BusquedaCancelada.
+def resolver_remoto(algoritmo, start_state, heuristica=None, usar_cache=True,
+                    direccion=DIRECCION_POR_DEFECTO, timeout=None, metricas=None, cancelado=None):
+    pedido = {'op': 'resolver', 'id': 0, 'agente': algoritmo, 'estado': start_state,
+              'heuristica': heuristica, 'cache': usar_cache, 'metricas': metricas is not None}
+    with conectar(direccion, timeout) as conexion:
+        conexion.sendall(json.dumps(pedido).encode() + b'\n')
+        if cancelado is None:
+            with conexion.makefile('rb') as f:
+                linea = f.readline()
+        else:
+            linea = _recibir_cancelable(conexion, cancelado)
+    if not linea:
+        raise ConnectionError("El servicio cerró la conexión.")
+    respuesta = json.loads(linea)
+    if 'error' in respuesta:
+        raise ValueError(respuesta['error'])
+    if metricas is not None and 'metricas' in respuesta:
+        metricas.sumar(respuesta['metricas'])
+    return respuesta['solucion'], respuesta['nodos'], respuesta['tiempo']
+
+# Lee una línea de respuesta revisando `cancelado` cada INTERVALO_CANCELACION segundos
+def _recibir_cancelable(conexion, cancelado):
+    from metricas import BusquedaCancelada
+    conexion.settimeout(INTERVALO_CANCELACION)
+    partes = []
+    while True:
+        if cancelado.is_set():
+            # Al cerrar la conexión el servicio también cancela el pedido; se avisa igual por si tarda
+            conexion.sendall(json.dumps({'op': 'cancelar', 'id': 0}).encode() + b'\n')
+            raise BusquedaCancelada
+        try:
+            parte = conexion.recv(1 << 16)
+        except socket.timeout:
+            continue
+        if not parte:
+            return b''.join(partes)
+        partes.append(parte)
+        if parte.endswith(b'\n'):
+            return b''.join(partes)
+
+if __name__ == '__main__':
+    direccion = DIRECCION_POR_DEFECTO
+    if '--puerto' in sys.argv:
+        direccion = (HOST, int(sys.argv[sys.argv.index('--puerto') + 1]))
+    if '--socket' in sys.argv:
+        direccion = sys.argv[sys.argv.index('--socket') + 1]
+    procesos = None
+    if '--procesos' in sys.argv:
+        procesos = int(sys.argv[sys.argv.index('--procesos') + 1])
+    ruta_cache = RUTA_POR_DEFECTO if '--cache' in sys.argv else None
+    try:
+        asyncio.run(servir(direccion, procesos, ruta_cache))
+    except KeyboardInterrupt:
+        pass
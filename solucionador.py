@@ -0,0 +1,703 @@
+# ---------- Solucionadores del puzzle (sin interfaz gráfica) ----------
+# Agentes de búsqueda y funciones auxiliares sin ninguna dependencia de pygame,
+# para poder usarlos desde herramientas por lotes, el servicio local o
+# servidores sin pantalla. La visualización está en Agente.py, que importa
+# pygame recién cuando se abre una ventana.
+#
+# Las dependencias pesadas (NumPy para la BFS vectorizada, asyncio para el
+# cliente del servicio) también se importan recién al usarlas, así importar
+# este módulo es barato. Para comprobar el presupuesto de importación:
+#   python solucionador.py
+import time
+import heapq
+import importlib.util
+from collections import deque
+
+from codificacion import encode_state, decode_state, posicion_vacio, vecinos, meta_espiral, tablero, tablero_de
+from nodos import AlmacenNodos, nuevos_visitados, nuevos_costos, nueva_cola
+from heuristicas import REGISTRO, obtener_heuristica, nombre_por_defecto
+from tabla_distancias import abrir_tabla, camino_con_tabla
+from resolubilidad import alcanzable, es_resoluble
+from memoria_acotada import sma_estrella, LIMITE_POR_DEFECTO
+
+# ---------- Lógica del Puzzle ----------
+# Estado meta del puzzle 8 (la espiral de meta_espiral(3))
+goal_state = [[1, 2, 3],
+              [8, 0, 4],
+              [7, 6, 5]]
+
+# Los algoritmos trabajan sobre estados codificados como enteros (ver codificacion.py)
+GOAL_CODE = encode_state(goal_state)
+
+# Metas codificadas ya calculadas, por tamaño de tablero
+_metas = {3: GOAL_CODE}
+
+# Meta en espiral codificada para el tablero indicado
+def meta_codificada(tab):
+    goal_code = _metas.get(tab.n)
+    if goal_code is None:
+        goal_code = _metas[tab.n] = tab.encode_state(meta_espiral(tab.n))
+    return goal_code
+
+# Heurística del tablero: por nombre (ver heuristicas.REGISTRO), ya construida, o la
+# de por defecto (Manhattan en 3x3, patrones aditivos en tableros mayores)
+def heuristica_para(tab, heuristica=None):
+    if heuristica is None:
+        heuristica = nombre_por_defecto(tab.n)
+    if isinstance(heuristica, str):
+        heuristica = obtener_heuristica(heuristica, tab, meta_codificada(tab))
+    return heuristica
+
+# Convierte una matriz (lista de listas) en una tupla de tuplas. Útil para usar como clave en sets o diccionarios.
+# Los agentes ya no la usan: el entero de encode_state sirve directamente como clave.
+def to_tuple(matrix):
+    return tuple(tuple(row) for row in matrix)
+
+# Busca la posición (i, j) del cero (espacio vacío) en el estado del puzzle
+# En un estado codificado (puzzle 8) el índice del vacío ya está guardado en el propio entero
+def find_zero(state):
+    if isinstance(state, int):
+        return divmod(posicion_vacio(state), 3)
+    n = len(state)
+    for i in range(n):
+        for j in range(n):
+            if state[i][j] == 0:
+                return i, j
+
+# Genera todos los estados vecinos posibles moviendo el cero en las 4 direcciones
+# Acepta tanto un estado codificado del puzzle 8 (devuelve enteros) como una lista de listas de cualquier tamaño
+def get_neighbors(state):
+    if isinstance(state, int):
+        return vecinos(state)
+    tab = tablero_de(state)
+    return [tab.decode_state(code) for code in tab.vecinos(tab.encode_state(state))]
+
+# ---------- Agente No Informado: BFS ----------
+# Algoritmo de búsqueda en anchura (BFS) para resolver el puzzle de n x n
+# Todos los agentes aceptan un objeto `metricas` opcional (ver metricas.py).
+# Retorna la solución (lista de estados), nodos expandidos y tiempo de ejecución
+def bfs(start_state, metricas=None):
+    tab = tablero_de(start_state)
+    goal_code = meta_codificada(tab)
+    start_code = tab.encode_state(start_state)
+    # Sin solución se rechaza antes de buscar (ver resolubilidad.py)
+    if not alcanzable(tab, start_code, goal_code):
+        return None, 0, 0.0
+    nodos = AlmacenNodos(tab)
+    # En el puzzle 8 es un bitmap indexado por el número de estado (ver nodos.py)
+    visited = nuevos_visitados(tab)
+    queue = deque([(start_code, nodos.agregar(-1, -1))])
+    visited.agregar(start_code)
+    sucesores = tab.sucesores
+    agregar = visited.agregar
+    if metricas is not None:
+        sucesores = metricas.sucesores(sucesores)
+        agregar = metricas.visitados(agregar)
+    nodos_expandidos = 0
+    start = time.time()
+    while queue:
+        current, indice = queue.popleft()
+        nodos_expandidos += 1
+        if metricas is not None:
+            metricas.expansion(len(queue) + 1)
+        if current == goal_code:
+            path = nodos.reconstruir(start_code, indice)
+            end = time.time()
+            if metricas is not None:
+                metricas.cerrados(len(nodos))
+            return [tab.decode_state(code) for code in path], nodos_expandidos, end - start
+        for movimiento, neighbor in sucesores(current):
+            if agregar(neighbor):
+                queue.append((neighbor, nodos.agregar(indice, movimiento)))
+    end = time.time()
+    if metricas is not None:
+        metricas.cerrados(len(nodos))
+    return None, nodos_expandidos, end - start
+
+# ---------- Agente No Informado: BFS bidireccional ----------
+# Búsqueda en anchura simultánea desde el estado inicial y desde la meta. En cada
+# paso se expande una capa completa del lado con la frontera más pequeña; al
+# terminar la capa en la que ambos lados se tocan, el camino es óptimo.
+# Retorna la solución (lista de estados), nodos expandidos y tiempo de ejecución
+def bfs_bidireccional(start_state, metricas=None):
+    tab = tablero_de(start_state)
+    goal_code = meta_codificada(tab)
+    start_code = tab.encode_state(start_state)
+    nodos_expandidos = 0
+    start = time.time()
+    if not alcanzable(tab, start_code, goal_code):
+        end = time.time()
+        return None, nodos_expandidos, end - start
+    # Para cada lado: estado -> estado desde el que se generó
+    padres_inicio = {start_code: None}
+    padres_meta = {goal_code: None}
+    frontera_inicio = [start_code]
+    frontera_meta = [goal_code]
+    encuentro = start_code if start_code == goal_code else None
+    vecinos_de = tab.vecinos
+    if metricas is not None:
+        vecinos_de = metricas.sucesores(vecinos_de)
+        generados_antes = metricas.generados
+    while encuentro is None and frontera_inicio and frontera_meta:
+        desde_inicio = len(frontera_inicio) <= len(frontera_meta)
+        if desde_inicio:
+            frontera, padres, otros = frontera_inicio, padres_inicio, padres_meta
+        else:
+            frontera, padres, otros = frontera_meta, padres_meta, padres_inicio
+        siguiente = []
+        if metricas is not None:
+            # La frontera de la búsqueda son las dos capas abiertas
+            frontera_total = len(frontera_inicio) + len(frontera_meta)
+        for current in frontera:
+            nodos_expandidos += 1
+            if metricas is not None:
+                metricas.expansion(frontera_total + len(siguiente))
+            for neighbor in vecinos_de(current):
+                if neighbor not in padres:
+                    padres[neighbor] = current
+                    siguiente.append(neighbor)
+                    if encuentro is None and neighbor in otros:
+                        encuentro = neighbor
+        if desde_inicio:
+            frontera_inicio = siguiente
+        else:
+            frontera_meta = siguiente
+    end = time.time()
+    if metricas is not None:
+        # Todo sucesor que no se agregó a una de las dos tablas ya estaba en ella
+        cerrados = len(padres_inicio) + len(padres_meta)
+        metricas.duplicados += metricas.generados - generados_antes - (cerrados - 2)
+        metricas.cerrados(cerrados)
+    if encuentro is None:
+        return None, nodos_expandidos, end - start
+    # Une las dos mitades: inicio -> encuentro y encuentro -> meta
+    path = []
+    code = encuentro
+    while code is not None:
+        path.append(code)
+        code = padres_inicio[code]
+    path.reverse()
+    code = padres_meta[encuentro]
+    while code is not None:
+        path.append(code)
+        code = padres_meta[code]
+    end = time.time()
+    return [tab.decode_state(code) for code in path], nodos_expandidos, end - start
+
+# ---------- Agente Informado: A* ----------
+# Calcula la suma de las distancias de Manhattan de cada ficha a su posición objetivo
+# Acepta un estado codificado del puzzle 8 o una lista de listas de cualquier tamaño
+def manhattan_distance(state):
+    if isinstance(state, int):
+        tab = tablero(3)
+    else:
+        tab = tablero_de(state)
+        state = tab.encode_state(state)
+    return heuristica_para(tab, 'manhattan')(state)
+
+# Algoritmo A* para resolver el puzzle de n x n. `heuristica` es un nombre del
+# registro de heuristicas.py; por defecto Manhattan en el puzzle 8 y bases de
+# datos de patrones aditivas en tableros mayores.
+# La heurística se calcula completa sólo para el estado inicial; en cada movimiento
+# únicamente cambia de casilla una ficha, así que h se actualiza en O(1).
+# La lista de abiertos es un arreglo de cubetas indexado por f (ver nodos.py);
+# `desempate` elige qué nodo sale primero entre los de igual f: 'g' (mayor g, por
+# defecto), 'lifo' o 'heap' (menor g, con heapq).
+# Retorna la solución (lista de estados), nodos expandidos y tiempo de ejecución
+def a_star(start_state, heuristica=None, metricas=None, desempate='g'):
+    tab = tablero_de(start_state)
+    goal_code = meta_codificada(tab)
+    heuristica = heuristica_para(tab, heuristica)
+    start_code = tab.encode_state(start_state)
+    # Sin solución se rechaza antes de buscar (ver resolubilidad.py)
+    if not alcanzable(tab, start_code, goal_code):
+        return None, 0, 0.0
+    # Mejor costo g conocido; en el puzzle 8 es un arreglo indexado por número de estado
+    visited = nuevos_costos(tab)
+    abiertos = nueva_cola(desempate)
+    nodos = AlmacenNodos(tab)
+    h, aux = heuristica.inicial(start_code)
+    abiertos.agregar(h, 0, (h, 0, start_code, nodos.agregar(-1, -1), aux))
+    visited.mejorar(start_code, 0)
+    agregar = abiertos.agregar
+    sacar = abiertos.sacar
+    sucesores = tab.sucesores
+    ficha = tab.ficha
+    mascara = tab.mascara
+    mover = heuristica.mover
+    mejorar = visited.mejorar
+    if metricas is not None:
+        sucesores = metricas.sucesores(sucesores)
+        mover = metricas.heuristica(mover)
+        mejorar = metricas.costos(visited)
+    nodos_expandidos = 0
+    start = time.time()
+    while abiertos:
+        f, g, current, indice, aux = sacar()
+        nodos_expandidos += 1
+        if metricas is not None:
+            metricas.expansion(len(abiertos) + 1)
+            # La entrada quedó en la cola después de encontrarse un camino más corto al estado
+            if visited.costo(current) < g:
+                metricas.obsoletos += 1
+        if current == goal_code:
+            path = nodos.reconstruir(start_code, indice)
+            end = time.time()
+            if metricas is not None:
+                metricas.cerrados(len(visited))
+            return [tab.decode_state(code) for code in path], nodos_expandidos, end - start
+        h = f - g
+        zero = current & mascara
+        for movimiento, neighbor in sucesores(current):
+            new_g = g + 1
+            if mejorar(neighbor, new_g):
+                # La ficha que estaba en la casilla destino pasa a la casilla del vacío
+                destino = neighbor & mascara
+                new_h, new_aux = mover(h, aux, ficha(current, destino), zero, destino, neighbor)
+                new_f = new_g + new_h
+                agregar(new_f, new_g, (new_f, new_g, neighbor, nodos.agregar(indice, movimiento), new_aux))
+    end = time.time()
+    if metricas is not None:
+        metricas.cerrados(len(visited))
+    return None, nodos_expandidos, end - start
+
+# ---------- Agente Informado: A* anytime con pesos decrecientes (ARA*) ----------
+# Pesos de la heurística en cada pasada de ARA*: la primera solución sale de una
+# búsqueda muy voraz y las siguientes la mejoran hasta la óptima (peso 1)
+PESOS_ARA = (5, 3, 2, 1.5, 1.2, 1)
+
+# ARA* (Likhachev, Gordon y Thrun, 2003) con el mismo motor que a_star (tabla de costos g,
+# almacén de nodos y heurística incremental), ordenando por g + w·h. Cada pasada
+# reutiliza la anterior: al bajar w no se empieza de nuevo, sólo se reordena la lista de
+# abiertos con el nuevo peso y se le suman los estados cerrados cuyo g mejoró durante la
+# pasada (los "inconsistentes"); ningún estado se expande dos veces en la misma pasada.
+# Es un generador: por cada solución mejorada produce (solución, cota, nodos expandidos,
+# tiempo), donde la solución mide a lo sumo `cota` veces la óptima. Quien lo usa puede
+# dejar de pedir soluciones cuando quiera; con `limite_tiempo` (segundos) la búsqueda
+# misma termina al vencer el plazo, aunque esté a mitad de una pasada.
+def ara_estrella(start_state, heuristica=None, pesos=PESOS_ARA, metricas=None, limite_tiempo=None):
+    tab = tablero_de(start_state)
+    goal_code = meta_codificada(tab)
+    heuristica = heuristica_para(tab, heuristica)
+    start_code = tab.encode_state(start_state)
+    # Sin solución se rechaza antes de buscar (ver resolubilidad.py)
+    if not alcanzable(tab, start_code, goal_code):
+        return
+    costos = nuevos_costos(tab)
+    nodos = AlmacenNodos(tab)
+    h, aux = heuristica.inicial(start_code)
+    # Abiertos e inconsistentes: estado -> (h, aux, índice en el almacén de nodos); el g está en `costos`
+    abiertos = {start_code: (h, aux, nodos.agregar(-1, -1))}
+    inconsistentes = {}
+    cerrados = set()
+    costos.mejorar(start_code, 0)
+    indice_meta = abiertos[start_code][2] if start_code == goal_code else None
+    sucesores = tab.sucesores
+    ficha = tab.ficha
+    mascara = tab.mascara
+    mover = heuristica.mover
+    costo = costos.costo
+    mejorar = costos.mejorar
+    if metricas is not None:
+        sucesores = metricas.sucesores(sucesores)
+        mover = metricas.heuristica(mover)
+        mejorar = metricas.costos(costos)
+    nodos_expandidos = 0
+    start = time.time()
+    fin = None if limite_tiempo is None else start + limite_tiempo
+    cota = float('inf')
+    for w in pesos:
+        # La cota de la solución actual ya es al menos tan buena como la que daría este peso
+        if w >= cota:
+            continue
+        # Los inconsistentes vuelven a abiertos y todas las prioridades se recalculan con el nuevo peso
+        abiertos.update(inconsistentes)
+        inconsistentes.clear()
+        cerrados.clear()
+        heap = [(costo(code) + w * entrada[0], -costo(code), code) for code, entrada in abiertos.items()]
+        heapq.heapify(heap)
+        while heap:
+            prioridad, menos_g, current = heap[0]
+            entrada = abiertos.get(current)
+            # Entrada vieja: el estado ya se expandió o se encontró un camino más corto
+            if entrada is None or -menos_g != costo(current):
+                heapq.heappop(heap)
+                continue
+            # Ningún estado abierto puede mejorar la solución con este peso
+            if indice_meta is not None and costo(goal_code) <= prioridad:
+                break
+            if fin is not None and time.time() > fin:
+                return
+            heapq.heappop(heap)
+            del abiertos[current]
+            cerrados.add(current)
+            nodos_expandidos += 1
+            if metricas is not None:
+                metricas.expansion(len(abiertos) + 1)
+            h, aux, indice = entrada
+            new_g = -menos_g + 1
+            zero = current & mascara
+            for movimiento, neighbor in sucesores(current):
+                if mejorar(neighbor, new_g):
+                    destino = neighbor & mascara
+                    new_h, new_aux = mover(h, aux, ficha(current, destino), zero, destino, neighbor)
+                    nuevo_indice = nodos.agregar(indice, movimiento)
+                    if neighbor == goal_code:
+                        indice_meta = nuevo_indice
+                    if neighbor in cerrados:
+                        inconsistentes[neighbor] = (new_h, new_aux, nuevo_indice)
+                    else:
+                        abiertos[neighbor] = (new_h, new_aux, nuevo_indice)
+                        heapq.heappush(heap, (new_g + w * new_h, -new_g, neighbor))
+        if indice_meta is None:
+            # Se agotaron los abiertos sin llegar a la meta
+            return
+        # Cota: g de la solución sobre el menor g + h de los estados todavía sin expandir
+        pendientes = [costo(code) + entrada[0] for code, entrada in abiertos.items()]
+        pendientes += [costo(code) + entrada[0] for code, entrada in inconsistentes.items()]
+        inferior = min(pendientes, default=costo(goal_code))
+        cota = max(1, min(w, costo(goal_code) / inferior)) if inferior else 1
+        if metricas is not None:
+            metricas.cerrados(len(costos))
+        path = nodos.reconstruir(start_code, indice_meta)
+        yield [tab.decode_state(code) for code in path], cota, nodos_expandidos, time.time() - start
+        if cota == 1:
+            return
+
+# Agente ARA*: se queda con la última (la mejor) solución de ara_estrella. Con
+# `al_mejorar` se llama al_mejorar(solución, cota) con cada solución apenas se
+# encuentra; con `limite_tiempo` se devuelve la mejor encontrada dentro del plazo.
+# Retorna la solución (lista de estados), nodos expandidos y tiempo de ejecución
+def ara_star(start_state, heuristica=None, metricas=None, limite_tiempo=None, al_mejorar=None):
+    result = None, 0, 0.0
+    for solution, cota, nodos_expandidos, tiempo in ara_estrella(start_state, heuristica, metricas=metricas,
+                                                                 limite_tiempo=limite_tiempo):
+        if al_mejorar is not None:
+            al_mejorar(solution, cota)
+        result = solution, nodos_expandidos, tiempo
+    return result
+
+# ---------- Agente Informado: A* con memoria acotada (SMA*) ----------
+# Como a_star, pero sin guardar más de `limite` nodos (ver memoria_acotada.py):
+# al llenarse la memoria olvida las peores hojas y recuerda su f en el padre.
+# Con métricas también se cuentan los nodos olvidados y los regenerados.
+# Retorna la solución (lista de estados), nodos expandidos y tiempo de ejecución
+def sma_star(start_state, heuristica=None, metricas=None, limite=LIMITE_POR_DEFECTO):
+    tab = tablero_de(start_state)
+    goal_code = meta_codificada(tab)
+    heuristica = heuristica_para(tab, heuristica)
+    start_code = tab.encode_state(start_state)
+    # Sin solución se rechaza antes de buscar (ver resolubilidad.py)
+    if not alcanzable(tab, start_code, goal_code):
+        return None, 0, 0.0
+    start = time.time()
+    path, nodos_expandidos = sma_estrella(tab, start_code, goal_code, heuristica, limite, metricas)
+    end = time.time()
+    if path is None:
+        return None, nodos_expandidos, end - start
+    return [tab.decode_state(code) for code in path], nodos_expandidos, end - start
+
+# ---------- Agente Informado: A* paralelo (HDA*) ----------
+# Reparte la búsqueda entre `procesos` procesos (por defecto uno por núcleo) según
+# un hash del estado (ver busqueda_paralela.py). La heurística se indica por nombre:
+# cada proceso abre la suya. Con métricas, los contadores suman los de todos los
+# trabajadores y metricas.cargas tiene las expansiones de cada uno.
+# Retorna la solución (lista de estados), nodos expandidos y tiempo de ejecución
+def hda_star(start_state, heuristica=None, metricas=None, procesos=None):
+    import multiprocessing
+    from busqueda_paralela import hda_estrella, desbalance
+    if multiprocessing.current_process().daemon:
+        raise ValueError(MENSAJE_CON_PROCESOS)
+    tab = tablero_de(start_state)
+    goal_code = meta_codificada(tab)
+    start_code = tab.encode_state(start_state)
+    # Sin solución se rechaza antes de buscar (ver resolubilidad.py)
+    if not alcanzable(tab, start_code, goal_code):
+        return None, 0, 0.0
+    path, estadisticas, tiempo = hda_estrella(tab, start_code, goal_code, heuristica or nombre_por_defecto(tab.n),
+                                              procesos, metricas.revisar if metricas is not None else None)
+    nodos_expandidos = sum(valores['expandidos'] for valores in estadisticas)
+    if metricas is not None:
+        for valores in estadisticas:
+            metricas.sumar(valores)
+        metricas.cargas = [valores['expandidos'] for valores in estadisticas]
+        metricas.desbalance_maximo = max(metricas.desbalance_maximo, desbalance(estadisticas))
+    if path is None:
+        return None, nodos_expandidos, tiempo
+    return [tab.decode_state(code) for code in path], nodos_expandidos, tiempo
+
+# ---------- Agente Informado: IDA* ----------
+# Resultado interno de la búsqueda en profundidad cuando se alcanza la meta
+ENCONTRADO = -1
+
+# A* de profundización iterativa: búsquedas en profundidad acotadas por f = g + h,
+# subiendo la cota al menor f que la superó. Sólo guarda el camino actual, así que
+# la memoria es proporcional a la profundidad de la solución. Usa la misma
+# heurística incremental que a_star y nunca deshace el movimiento anterior.
+# Retorna la solución (lista de estados), nodos expandidos y tiempo de ejecución
+def ida_star(start_state, heuristica=None, metricas=None):
+    tab = tablero_de(start_state)
+    goal_code = meta_codificada(tab)
+    heuristica = heuristica_para(tab, heuristica)
+    start_code = tab.encode_state(start_state)
+    nodos_expandidos = 0
+    start = time.time()
+    # Si el invariante difiere del de la meta el estado no tiene solución y la búsqueda no terminaría
+    if not alcanzable(tab, start_code, goal_code):
+        end = time.time()
+        return None, nodos_expandidos, end - start
+    path = [start_code]
+    sucesores = tab.sucesores
+    ficha = tab.ficha
+    mascara = tab.mascara
+    mover = heuristica.mover
+    if metricas is not None:
+        sucesores = metricas.sucesores(sucesores)
+        mover = metricas.heuristica(mover)
+
+    def buscar(g, h, aux, limite, anterior):
+        nonlocal nodos_expandidos
+        f = g + h
+        if f > limite:
+            return f
+        current = path[-1]
+        nodos_expandidos += 1
+        if metricas is not None:
+            # La frontera de IDA* es el camino actual
+            metricas.expansion(len(path))
+        if current == goal_code:
+            return ENCONTRADO
+        minimo = None
+        zero = current & mascara
+        if metricas is not None and anterior >= 0:
+            # El sucesor que deshace el movimiento anterior se genera pero se descarta
+            metricas.duplicados += 1
+        for movimiento, neighbor in sucesores(current):
+            # Las direcciones opuestas difieren sólo en el último bit (arriba/abajo, izquierda/derecha)
+            if movimiento == anterior ^ 1:
+                continue
+            destino = neighbor & mascara
+            new_h, new_aux = mover(h, aux, ficha(current, destino), zero, destino, neighbor)
+            path.append(neighbor)
+            t = buscar(g + 1, new_h, new_aux, limite, movimiento)
+            if t == ENCONTRADO:
+                return ENCONTRADO
+            path.pop()
+            if minimo is None or t < minimo:
+                minimo = t
+        return minimo
+
+    h, aux = heuristica.inicial(start_code)
+    limite = h
+    while True:
+        t = buscar(0, h, aux, limite, -2)
+        if t == ENCONTRADO:
+            end = time.time()
+            return [tab.decode_state(code) for code in path], nodos_expandidos, end - start
+        if t is None:
+            end = time.time()
+            return None, nodos_expandidos, end - start
+        limite = t
+
+# ---------- Agente por tabla de distancias ----------
+# Consulta la tabla precalculada (tabla_distancias.py) y camina hacia la meta
+# eligiendo siempre un vecino a distancia una unidad menor: O(profundidad) consultas.
+# La tabla sólo existe para el puzzle 8.
+# Retorna la solución (lista de estados), nodos expandidos (siempre 0: las lecturas
+# de la tabla se cuentan en metricas.consultas) y tiempo de ejecución
+def resolver_con_tabla(start_state, metricas=None):
+    if len(start_state) != 3:
+        raise ValueError("La tabla de distancias sólo está disponible para el puzzle 8 (3x3).")
+    tabla = abrir_tabla(GOAL_CODE)
+    if metricas is not None:
+        # Abrir la tabla puede construirla; la consulta en sí son unas pocas lecturas.
+        # No se expanden ni se generan nodos: sólo se cuentan las lecturas de la tabla.
+        metricas.revisar()
+        tabla = metricas.tabla_distancias(tabla)
+    start = time.time()
+    path = camino_con_tabla(encode_state(start_state), GOAL_CODE, tabla)
+    end = time.time()
+    if path is None:
+        return None, 0, end - start
+    return [decode_state(code) for code in path], 0, end - start
+
+# ---------- Agente No Informado: BFS vectorizada ----------
+# Misma búsqueda que bfs, pero expandiendo capas completas con NumPy (ver
+# bfs_vectorizada.py). Devuelve la misma solución y los mismos nodos expandidos.
+# Sólo para el puzzle 8: los estados de tableros mayores no caben en 64 bits.
+# Retorna la solución (lista de estados), nodos expandidos y tiempo de ejecución
+def bfs_numpy(start_state, metricas=None):
+    if len(start_state) != 3:
+        raise ValueError("La BFS vectorizada sólo está disponible para el puzzle 8 (3x3).")
+    from bfs_vectorizada import bfs_vectorizada
+    start_code = encode_state(start_state)
+    # Sin solución se rechaza antes de buscar (ver resolubilidad.py)
+    if not alcanzable(tablero(3), start_code, GOAL_CODE):
+        return None, 0, 0.0
+    start = time.time()
+    path, nodos_expandidos, tamanos = bfs_vectorizada(start_code, GOAL_CODE,
+                                                      metricas.revisar if metricas is not None else None)
+    end = time.time()
+    if metricas is not None:
+        # Se expande por capas: la frontera es la capa más grande. Los vecinos
+        # repetidos se descartan dentro de NumPy, así que sólo se cuentan como
+        # generados los estados nuevos.
+        metricas.expandidos += nodos_expandidos
+        metricas.generados += sum(tamanos) - 1
+        metricas.frontera_maxima = max(metricas.frontera_maxima, max(tamanos))
+        metricas.cerrados(sum(tamanos))
+    if path is None:
+        return None, nodos_expandidos, end - start
+    return [decode_state(code) for code in path], nodos_expandidos, end - start
+
+# ---------- Agente No Informado: BFS en disco ----------
+# BFS por capas guardadas en disco (ver bfs_externa.py): la memoria no depende de
+# cuántos estados se visitan. Cada búsqueda usa un directorio temporal que se
+# borra al terminar; el camino se reconstruye bajando de capa en capa.
+# Retorna la solución (lista de estados), nodos expandidos y tiempo de ejecución
+def bfs_en_disco(start_state, metricas=None):
+    import tempfile
+    from bfs_externa import barrido_externo, TablaExterna
+    tab = tablero_de(start_state)
+    goal_code = meta_codificada(tab)
+    start_code = tab.encode_state(start_state)
+    # Sin solución se rechaza antes de buscar (ver resolubilidad.py)
+    if not alcanzable(tab, start_code, goal_code):
+        return None, 0, 0.0
+    start = time.time()
+    with tempfile.TemporaryDirectory(prefix='bfs_disco_') as directorio:
+        conteos = barrido_externo(tab.n, directorio, raiz=start_code, meta=goal_code, metricas=metricas)
+        path = TablaExterna(directorio).camino(goal_code)
+    end = time.time()
+    # Se expanden todas las capas anteriores a la de la meta
+    nodos_expandidos = sum(conteos[:-1])
+    return [tab.decode_state(code) for code in path], nodos_expandidos, end - start
+
+# Agentes disponibles por nombre (el mismo que se pasa por línea de comandos)
+AGENTES = {
+    'bfs': bfs,
+    'bfs2': bfs_bidireccional,
+    'a*': a_star,
+    'ida*': ida_star,
+    'sma*': sma_star,
+    'ara*': ara_star,
+    'hda*': hda_star,
+    'tabla': resolver_con_tabla,
+    'bfsd': bfs_en_disco,
+}
+# Sin NumPy el agente 'bfsv' no está disponible
+if importlib.util.find_spec('numpy') is not None:
+    AGENTES['bfsv'] = bfs_numpy
+
+# Agentes que lanzan sus propios procesos: no se pueden usar dentro de procesos
+# daemon, como los de lote.py y los trabajadores del servicio
+AGENTES_CON_PROCESOS = {'hda*'}
+MENSAJE_CON_PROCESOS = ("HDA* lanza sus propios procesos y no se puede usar en lote.py ni en el servicio; "
+                        "usa a* o resuélvelo con Agente.py o comparacion.py.")
+
+# Agentes que aceptan una heurística
+INFORMADOS = {'a*', 'ida*', 'sma*', 'ara*', 'hda*'}
+
+# Agentes que siempre devuelven una solución óptima (A*, HDA*, IDA*, SMA* y ARA* sólo con heurísticas
+# admisibles; SMA* además con un límite de nodos mayor que la longitud de la solución y
+# ARA* sin límite de tiempo y con una heurística consistente)
+OPTIMOS = {'bfs', 'bfs2', 'bfsv', 'bfsd', 'a*', 'hda*', 'ida*', 'sma*', 'ara*', 'tabla'}
+
+def es_optimo(algoritmo, heuristica=None):
+    if algoritmo in INFORMADOS:
+        return REGISTRO[heuristica or 'manhattan'].admisible
+    return algoritmo in OPTIMOS
+
+# Ejecuta el agente indicado; la heurística sólo se pasa a los agentes informados.
+# Con una CacheSoluciones (cache_soluciones.py) los agentes óptimos consultan
+# primero la caché (un acierto reporta 0 nodos expandidos) y registran en ella
+# las soluciones nuevas.
+def resolver(algoritmo, start_state, heuristica=None, cache=None, metricas=None):
+    usar_cache = cache is not None and es_optimo(algoritmo, heuristica)
+    if usar_cache:
+        tab = tablero_de(start_state)
+        start = time.time()
+        path = cache.buscar(tab, tab.encode_state(start_state))
+        if path is not None:
+            end = time.time()
+            return [tab.decode_state(code) for code in path], 0, end - start
+    if heuristica is not None and algoritmo in INFORMADOS:
+        result = AGENTES[algoritmo](start_state, heuristica, metricas=metricas)
+    else:
+        result = AGENTES[algoritmo](start_state, metricas=metricas)
+    if usar_cache and result[0] is not None:
+        cache.guardar(tab, [tab.encode_state(state) for state in result[0]])
+    return result
+
+# Igual que resolver (sin caché), pero registrando las métricas de la búsqueda. Se
+# usa desde otros procesos (comparacion.py): las métricas vuelven como diccionario.
+# `muestreo` se pasa a Metricas (por ejemplo, para cancelar la búsqueda).
+# Retorna (solución, nodos expandidos, tiempo, métricas)
+def resolver_con_metricas(algoritmo, start_state, heuristica=None, muestreo=None):
+    from metricas import Metricas
+    metricas = Metricas(muestreo=muestreo)
+    solution, nodos_expandidos, tiempo = resolver(algoritmo, start_state, heuristica, metricas=metricas)
+    return solution, nodos_expandidos, tiempo, metricas.como_dict()
+
+# Igual que resolver, pero pidiendo la solución al servicio local (servicio.py),
+# que ya tiene las tablas y la caché cargadas. Si el servicio no está corriendo
+# se resuelve en este mismo proceso. `cancelado` (un threading.Event) permite
+# abandonar la espera del servicio; en el propio proceso se cancela con la
+# función de muestreo de `metricas` (ver metricas.BusquedaCancelada).
+def resolver_con_servicio(algoritmo, start_state, heuristica=None, cache=None, metricas=None, cancelado=None):
+    from servicio import resolver_remoto
+    try:
+        return resolver_remoto(algoritmo, start_state, heuristica, usar_cache=cache is not None, metricas=metricas,
+                               cancelado=cancelado)
+    except OSError:
+        return resolver(algoritmo, start_state, heuristica, cache, metricas)
+
+# Ejecuta un agente midiendo con tracemalloc el pico de memoria de la búsqueda
+# Retorna (solución, nodos expandidos, tiempo, pico de memoria en bytes)
+def medir_pico_memoria(algoritmo, start_state, heuristica=None, metricas=None):
+    import tracemalloc
+    tracemalloc.start()
+    try:
+        solution, nodos_expandidos, tiempo = resolver(algoritmo, start_state, heuristica, metricas=metricas)
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return solution, nodos_expandidos, tiempo, pico
+
+# Verifica si un estado del puzzle es resoluble comparando su invariante de paridad con el de la meta
+# (la comprobación está en resolubilidad.py; se conserva este nombre para los módulos que ya lo usan)
+def is_solvable(state):
+    """
+    Verifica si un estado del puzzle de n x n es resoluble respecto a la meta en espiral.
+    Retorna True si es resoluble, False si no lo es.
+    Lanza ValueError si la matriz no es válida.
+    """
+    return es_resoluble(state)
+
+# Presupuesto para importar este módulo en frío (en segundos)
+PRESUPUESTO_IMPORTACION = 0.1
+
+# Mide el tiempo de importar este módulo en un intérprete nuevo (el mejor de
+# `repeticiones`) y comprueba que no cargue pygame. Retorna (segundos, carga pygame).
+def medir_importacion(repeticiones=5):
+    import os
+    import subprocess
+    import sys
+    codigo = ("import sys, time; t = time.perf_counter(); import solucionador; "
+              "print(time.perf_counter() - t, 'pygame' in sys.modules)")
+    mejor = None
+    for _ in range(repeticiones):
+        salida = subprocess.run([sys.executable, '-c', codigo], capture_output=True, text=True, check=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.split()
+        tiempo, carga_pygame = float(salida[0]), salida[1] == 'True'
+        mejor = tiempo if mejor is None else min(mejor, tiempo)
+    return mejor, carga_pygame
+
+if __name__ == '__main__':
+    import sys
+    tiempo, carga_pygame = medir_importacion()
+    print(f"Importar solucionador: {tiempo * 1000:.1f} ms (presupuesto {PRESUPUESTO_IMPORTACION * 1000:.0f} ms)")
+    if carga_pygame:
+        print("Error: importar solucionador carga pygame.")
+    if carga_pygame or tiempo > PRESUPUESTO_IMPORTACION:
+        sys.exit(1)
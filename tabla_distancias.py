@@ -0,0 +1,105 @@
+# ---------- Tabla completa de distancias a la meta ----------
+# Una única BFS retrógrada desde la meta da la distancia óptima de los 181.440
+# estados alcanzables. La tabla se guarda en disco (1 byte por estado, indexado
+# por el número de estado de permutaciones.py) y se abre con mmap, de modo que
+# cargarla no recalcula nada y cada consulta es una lectura de un byte.
+#
+# Uso (paso de construcción): python tabla_distancias.py
+import mmap
+import os
+
+from codificacion import encode_state, vecinos
+from permutaciones import rank, paridad, NUM_ESTADOS
+
+# Valor guardado para los estados que no alcanzan la meta
+DESCONOCIDA = 255
+
+# Directorio donde se guardan las tablas (junto a este archivo)
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+
+# Tablas ya abiertas en este proceso, por estado meta
+_tablas_abiertas = {}
+
+# Ruta del archivo de la tabla. Incluye la meta para no mezclar tablas de metas distintas.
+def ruta_tabla(goal_code):
+    return os.path.join(DIRECTORIO, f"distancias_{goal_code:x}.bin")
+
+# BFS retrógrada por capas desde la meta. Retorna un bytearray indexado por número de estado.
+def calcular_distancias(goal_code):
+    distancias = bytearray([DESCONOCIDA]) * NUM_ESTADOS
+    distancias[rank(goal_code)] = 0
+    capa = [goal_code]
+    profundidad = 0
+    while capa:
+        profundidad += 1
+        siguiente = []
+        for current in capa:
+            for neighbor in vecinos(current):
+                r = rank(neighbor)
+                if distancias[r] == DESCONOCIDA:
+                    distancias[r] = profundidad
+                    siguiente.append(neighbor)
+        capa = siguiente
+    return distancias
+
+# Construye la tabla y la guarda en disco. Se escribe en un archivo temporal y
+# luego se renombra, para que otro proceso nunca abra una tabla a medio escribir.
+def construir_tabla(goal_code):
+    # Con NumPy la BFS se hace por capas vectorizadas (bfs_vectorizada.py); sin él, con bucles de Python
+    try:
+        from bfs_vectorizada import calcular_distancias_vectorizada
+    except ImportError:
+        distancias = calcular_distancias(goal_code)
+    else:
+        distancias = calcular_distancias_vectorizada(goal_code)
+    ruta = ruta_tabla(goal_code)
+    temporal = ruta + ".tmp"
+    with open(temporal, "wb") as f:
+        f.write(distancias)
+    os.replace(temporal, ruta)
+    return ruta
+
+# Abre (con mmap, sólo lectura) la tabla de la meta indicada. Si todavía no
+# existe en disco se construye una vez.
+def abrir_tabla(goal_code):
+    tabla = _tablas_abiertas.get(goal_code)
+    if tabla is not None:
+        return tabla
+    ruta = ruta_tabla(goal_code)
+    if not os.path.exists(ruta) or os.path.getsize(ruta) != NUM_ESTADOS:
+        construir_tabla(goal_code)
+    with open(ruta, "rb") as f:
+        tabla = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    _tablas_abiertas[goal_code] = tabla
+    return tabla
+
+# Camina hacia la meta eligiendo en cada paso un vecino con distancia una unidad
+# menor. Retorna la lista de estados codificados, o None si no hay solución.
+def camino_con_tabla(start_code, goal_code, tabla):
+    # Con otra paridad el estado no es alcanzable y su número de estado no es válido
+    if paridad(start_code) != paridad(goal_code):
+        return None
+    distancia = tabla[rank(start_code)]
+    if distancia == DESCONOCIDA:
+        return None
+    path = [start_code]
+    current = start_code
+    while distancia > 0:
+        distancia -= 1
+        for neighbor in vecinos(current):
+            if tabla[rank(neighbor)] == distancia:
+                current = neighbor
+                break
+        path.append(current)
+    return path
+
+if __name__ == '__main__':
+    # Estado meta del puzzle 8 (debe ser igual al de solucionador.py)
+    goal_state = [[1, 2, 3],
+                  [8, 0, 4],
+                  [7, 6, 5]]
+    goal_code = encode_state(goal_state)
+    ruta = construir_tabla(goal_code)
+    tabla = abrir_tabla(goal_code)
+    maxima = max(d for d in tabla[:] if d != DESCONOCIDA)
+    print(f"Tabla guardada en {ruta} ({NUM_ESTADOS} estados, distancia máxima {maxima})")
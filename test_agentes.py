@@ -0,0 +1,35 @@
+import random
+import pytest
+from solucionador import AGENTES, OPTIMOS, GOAL_CODE, resolver
+from resolubilidad import estado_resoluble_aleatorio
+from permutaciones import NUM_ESTADOS, rank, unrank, paridad
+
+# ---------- Pruebas de los agentes óptimos ----------
+# Cada agente óptimo debe encontrar una solución tan corta como la de la tabla de
+# distancias en un conjunto fijo de tableros 3x3 (semillas 0 a 4).
+# Uso: python -m pytest -q
+
+SEMILLAS = range(5)
+
+TABLEROS = [estado_resoluble_aleatorio(3, generador=random.Random(semilla)) for semilla in SEMILLAS]
+
+# Largo de la solución óptima de cada tablero según la tabla de distancias
+@pytest.fixture(scope='module')
+def largos_optimos():
+    return [len(resolver('tabla', tablero)[0]) for tablero in TABLEROS]
+
+# 'bfsv' sólo está en AGENTES si NumPy está instalado
+@pytest.mark.parametrize('algoritmo', sorted(OPTIMOS & AGENTES.keys()))
+def test_agente_optimo_coincide_con_tabla(algoritmo, largos_optimos):
+    for tablero, largo in zip(TABLEROS, largos_optimos):
+        solucion = resolver(algoritmo, tablero)[0]
+        assert solucion is not None
+        assert len(solucion) == largo
+
+# ---------- Pruebas de la numeración de estados ----------
+
+# unrank es la inversa de rank en todos los estados alcanzables desde la meta
+def test_rank_unrank_todos_los_estados():
+    paridad_meta = paridad(GOAL_CODE)
+    for r in range(NUM_ESTADOS):
+        assert rank(unrank(r, paridad_meta)) == r